@@ -1,15 +1,32 @@
-from flask import Flask, request, jsonify
+from flask import Flask, g, request, jsonify
+from flask.json.provider import DefaultJSONProvider
+from contextlib import nullcontext
 from flask_cors import CORS
 from datetime import datetime
 import os
+import threading
 from strategies import get_strategy, list_strategies
-from cache import cache_key, cache_get_plan, cache_set_plan, scale_plan
-from performance import compute_and_store_for_strategy, performance_get_metrics
+from cache import (
+    cache_key,
+    cache_get_plan,
+    cache_get_plans,
+    cache_get_stale_plan,
+    cache_set_plan,
+    record_plan_request,
+    scale_plan,
+)
+# Data-heavy modules (pandas, market data sources, backtests) are loaded on first use,
+# so /api/health, /api/strategies and cache hits stay cheap on a Lambda cold start.
+import market_data
+import performance
+from singleflight import SingleFlight
+from tracing import finish_trace, log_trace, server_timing_enabled, span, start_trace, trace_log_enabled
 
 # Flask backend API for the React frontend.
 # Provides:
 # - GET  /api/strategies : list available strategies + UI parameters
 # - POST /api/calculate  : run a strategy calculation
+# - POST /api/calculate/batch : run many calculations sharing one price download
 # - GET  /api/history    : returns empty (no persistence for Lambda deployment)
 # - GET  /api/health     : simple health check
 app = Flask(__name__)
@@ -24,6 +41,79 @@ if not os.getenv("AWS_LAMBDA_FUNCTION_NAME"):
     allowed = [o.strip() for o in allowed if o.strip()]
     CORS(app, resources={r"/api/*": {"origins": allowed}})
 
+_plan_flights = SingleFlight()
+
+
+class _TracedJSONProvider(DefaultJSONProvider):
+    """Flask's JSON provider with response serialization timed as the `serialize` span."""
+
+    def dumps(self, obj, **kwargs):
+        with span('serialize'):
+            return super().dumps(obj, **kwargs)
+
+
+app.json = _TracedJSONProvider(app)
+
+
+# Stage timing: with TRACING_ENABLED responses carry a Server-Timing header, with
+# TRACING_LOG_JSON each request is logged as one JSON line (see tracing.py).
+@app.before_request
+def _start_request_trace():
+    if server_timing_enabled() or trace_log_enabled():
+        g.trace_token = start_trace()
+
+
+@app.after_request
+def _emit_request_trace(response):
+    token = g.pop('trace_token', None)
+    if token is None:
+        return response
+    trace = finish_trace(token)
+    if trace is not None:
+        if server_timing_enabled():
+            response.headers['Server-Timing'] = trace.server_timing()
+        if trace_log_enabled():
+            log_trace(trace, method=request.method, path=request.path, status=response.status_code)
+    return response
+
+
+@app.teardown_request
+def _discard_request_trace(_error=None):
+    # after_request does not run when a view raises; drop the trace here instead.
+    token = g.pop('trace_token', None)
+    if token is not None:
+        finish_trace(token)
+
+
+def _compute_and_cache_plan(strategy, ck, parameters):
+    """Compute a plan and store it in the plan cache when it is valid."""
+    plan = strategy.calculate_plan(**parameters)
+    if isinstance(plan, dict) and 'error' not in plan:
+        cache_set_plan(ck, plan)
+    return plan
+
+
+def _revalidate_in_background(strategy, ck, parameters):
+    """
+    Recompute a plan on a daemon thread unless one is already in flight for the key.
+
+    In Lambda the container is frozen after the response, so the thread may only
+    finish during a later invocation; the stale plan keeps being served until then.
+    """
+    call, leader = _plan_flights.claim(ck)
+    if not leader:
+        return
+
+    def run():
+        try:
+            plan = _compute_and_cache_plan(strategy, ck, parameters)
+        except BaseException as error:
+            _plan_flights.finish(ck, call, error=error)
+            return
+        _plan_flights.finish(ck, call, result=plan)
+
+    threading.Thread(target=run, name=f"revalidate-{strategy.name}", daemon=True).start()
+
 
 @app.route('/api/strategies', methods=['GET'])
 def get_strategies():
@@ -74,17 +164,42 @@ def calculate_allocation():
 
         ck = cache_key(strategy_id, parameters)
         if ck:
+            # Request counts per parameter set drive the scheduled pre-warm of popular plans.
+            record_plan_request(ck)
             cached_plan = cache_get_plan(ck)
             if cached_plan:
-                result = scale_plan(cached_plan, total_money, strategy.name)
+                with span('scale'):
+                    result = scale_plan(cached_plan, total_money, strategy.name)
+                if "error" not in result:
+                    return jsonify({
+                        'success': True,
+                        'result': result,
+                        'cached': True,
+                        'cache_status': 'cached',
+                    })
+
+            # Stale-while-revalidate: serve the latest plan for these inputs right away
+            # and recompute the current one in the background.
+            stale = cache_get_stale_plan(ck)
+            if stale:
+                stale_plan, age_seconds = stale
+                with span('scale'):
+                    result = scale_plan(stale_plan, total_money, strategy.name)
                 if "error" not in result:
+                    _revalidate_in_background(strategy, ck, parameters)
                     return jsonify({
                         'success': True,
                         'result': result,
                         'cached': True,
+                        'cache_status': 'stale',
+                        'stale_age_seconds': age_seconds,
                     })
 
-        plan = strategy.calculate_plan(**parameters)
+        if ck:
+            # Concurrent requests for the same key share one computation (threaded WSGI).
+            plan, _ = _plan_flights.do(ck, lambda: _compute_and_cache_plan(strategy, ck, parameters))
+        else:
+            plan = strategy.calculate_plan(**parameters)
         if not isinstance(plan, dict):
             return jsonify({
                 'success': False,
@@ -97,9 +212,8 @@ def calculate_allocation():
                 'error': plan['error']
             }), 500
 
-        if ck:
-            cache_set_plan(ck, plan)
-        result = scale_plan(plan, total_money, strategy.name)
+        with span('scale'):
+            result = scale_plan(plan, total_money, strategy.name)
 
         # Check for errors in result
         if 'error' in result:
@@ -112,6 +226,137 @@ def calculate_allocation():
             'success': True,
             'result': result,
             'cached': False,
+            'cache_status': 'fresh',
+        })
+
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+def _batch_max_items() -> int:
+    """Return the largest number of items accepted by /api/calculate/batch."""
+    try:
+        return max(1, int(os.getenv('CALCULATE_BATCH_MAX_ITEMS', '50')))
+    except ValueError:
+        return 50
+
+
+def _prefetch_union_prices(jobs):
+    """
+    Download the union of tickers needed by (strategy, parameters) jobs in one call.
+
+    Returns (prices, failed, start, end), or None when no job downloads prices or the
+    download fails (plans then fetch their own data).
+    """
+    tickers, starts, ends = [], [], []
+    for strategy, parameters in jobs:
+        try:
+            window = strategy.price_window(**parameters)
+        except Exception:
+            window = None
+        if window:
+            window_tickers, start_date, end_date = window
+            tickers.extend(window_tickers)
+            starts.append(start_date)
+            ends.append(end_date)
+    if not tickers:
+        return None
+
+    start_date, end_date = min(starts), max(ends)
+    try:
+        with span('prices'):
+            prices, failed = market_data.download_close_prices(list(dict.fromkeys(tickers)), start_date, end_date)
+    except Exception:
+        return None
+    return prices, failed, start_date, end_date
+
+
+@app.route('/api/calculate/batch', methods=['POST'])
+def calculate_allocation_batch():
+    """
+    Calculate allocations for many {strategy_id, total_money, parameters} items.
+
+    Identical inputs share one cache key and computation, cached plans are read with
+    one multi-key lookup, and the remaining plans are computed from a single download
+    of the union of their tickers. Results keep the request order; an invalid item
+    fails on its own without failing the batch.
+    """
+    try:
+        data = request.json or {}
+        items = data.get('items') if isinstance(data, dict) else data
+        if not isinstance(items, list) or not items:
+            return jsonify({
+                'success': False,
+                'error': 'items must be a non-empty list'
+            }), 400
+
+        if len(items) > _batch_max_items():
+            return jsonify({
+                'success': False,
+                'error': f'At most {_batch_max_items()} items per batch'
+            }), 400
+
+        results = [None] * len(items)
+        pending = []  # (index, strategy, total_money, cache key)
+        jobs = {}  # cache key -> (strategy, parameters); first occurrence wins
+        for index, item in enumerate(items):
+            if not isinstance(item, dict):
+                results[index] = {'success': False, 'error': 'Item must be an object'}
+                continue
+            strategy_id = item.get('strategy_id')
+            parameters = item.get('parameters') or {}
+            try:
+                total_money = float(item.get('total_money', 0))
+            except (TypeError, ValueError):
+                total_money = 0
+            strategy = get_strategy(strategy_id) if strategy_id else None
+            if not strategy_id:
+                results[index] = {'success': False, 'error': 'Strategy ID is required'}
+            elif total_money <= 0:
+                results[index] = {'success': False, 'error': 'Total money must be greater than 0'}
+            elif not strategy:
+                results[index] = {'success': False, 'error': f'Strategy {strategy_id} not found'}
+            else:
+                ck = cache_key(strategy_id, parameters) or f'uncached|{index}'
+                record_plan_request(ck)
+                jobs.setdefault(ck, (strategy, parameters))
+                pending.append((index, strategy, total_money, ck))
+
+        cached = cache_get_plans([ck for ck in jobs if not ck.startswith('uncached|')])
+        plans = dict(cached)
+        missing = [ck for ck in jobs if ck not in plans]
+        if missing:
+            prefetched = _prefetch_union_prices([jobs[ck] for ck in missing])
+            with market_data.shared_price_panel(*prefetched) if prefetched else nullcontext():
+                for ck in missing:
+                    strategy, parameters = jobs[ck]
+                    try:
+                        plans[ck], _ = _plan_flights.do(ck, lambda: _compute_and_cache_plan(strategy, ck, parameters))
+                    except Exception as e:
+                        plans[ck] = {'error': str(e)}
+
+        for index, strategy, total_money, ck in pending:
+            plan = plans.get(ck)
+            if not isinstance(plan, dict):
+                results[index] = {'success': False, 'error': 'Strategy returned invalid plan'}
+                continue
+            with span('scale'):
+                result = plan if 'error' in plan else scale_plan(plan, total_money, strategy.name)
+            if 'error' in result:
+                results[index] = {'success': False, 'error': result['error']}
+                continue
+            results[index] = {
+                'success': True,
+                'result': result,
+                'cached': ck in cached,
+                'cache_status': 'cached' if ck in cached else 'fresh',
+            }
+
+        return jsonify({
+            'success': True,
+            'results': results
         })
 
     except Exception as e:
@@ -153,29 +398,35 @@ def get_performance():
 
     refresh = (request.args.get('refresh') or '').strip().lower() in {'1', 'true', 'yes'}
     if refresh:
-        result = compute_and_store_for_strategy(strategy_id)
+        with span('backtest'):
+            result = performance.compute_and_store_for_strategy(strategy_id)
         if not result.get('ok'):
             return jsonify({
                 'success': False,
                 'error': result.get('error', 'Failed to compute performance metrics')
             }), 500
 
-    payload = performance_get_metrics(strategy_id)
+    with span('performance_get'):
+        payload = performance.performance_get_metrics(strategy_id)
     if not payload:
         # Best-effort warmup for first run / empty table
-        result = compute_and_store_for_strategy(strategy_id)
+        with span('backtest'):
+            result = performance.compute_and_store_for_strategy(strategy_id)
         if not result.get('ok'):
             return jsonify({
                 'success': False,
                 'error': result.get('error', 'No cached performance metrics available')
             }), 404
-        payload = performance_get_metrics(strategy_id)
+        with span('performance_get'):
+            payload = performance.performance_get_metrics(strategy_id)
         if not payload:
             return jsonify({
                 'success': False,
                 'error': 'Performance metrics were computed but could not be persisted. Check DynamoDB table, IAM, and PERFORMANCE_* env vars.'
             }), 503
 
+    # Snapshots written before the backtest state had its own key still embed it.
+    payload.pop('backtest_state', None)
     return jsonify({
         'success': True,
         'performance': payload
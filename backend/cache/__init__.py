@@ -1,10 +1,17 @@
 from .keys import cache_key
 from .plan import scale_plan
-from .store import cache_get_plan, cache_set_plan
+from .popularity import flush_plan_popularity, popular_parameter_sets, record_plan_request
+from .store import cache_get_plan, cache_get_plans, cache_get_stale_plan, cache_l1_clear, cache_set_plan
 
 __all__ = [
     "cache_key",
     "cache_get_plan",
+    "cache_get_plans",
+    "cache_get_stale_plan",
+    "cache_l1_clear",
     "cache_set_plan",
+    "flush_plan_popularity",
+    "popular_parameter_sets",
+    "record_plan_request",
     "scale_plan",
 ]
@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+import time
+
+from ddb import ddb_batch_get, ddb_table
+
+from .config import cache_sqlite_path
+
+# Key-value backends shared by the plan cache and the performance store.
+# Items are plain dicts such as {"value": ..., "expires_at": int, "updated_at": int};
+# each backend maps them to its own storage. Failures are reported as misses (get)
+# or False (put), matching the best-effort semantics of the stores.
+
+
+class CacheBackend:
+    def get(self, key: str) -> dict | None:
+        raise NotImplementedError
+
+    def put(self, key: str, item: dict) -> bool:
+        raise NotImplementedError
+
+    def get_many(self, keys: list) -> dict:
+        """Return {key: item} for the keys found; backends override this with one round trip."""
+        found = {}
+        for key in keys:
+            item = self.get(key)
+            if item:
+                found[key] = item
+        return found
+
+
+class DynamoDBBackend(CacheBackend):
+    """One DynamoDB table whose partition key attribute is `key_name`."""
+
+    def __init__(self, table_name: str, key_name: str):
+        self.table_name = table_name
+        self.key_name = key_name
+
+    def get(self, key: str) -> dict | None:
+        table = ddb_table(self.table_name)
+        if table is None:
+            return None
+        try:
+            response = table.get_item(Key={self.key_name: key})
+        except Exception:
+            return None
+        item = response.get("Item")
+        return dict(item) if item else None
+
+    def get_many(self, keys: list) -> dict:
+        try:
+            items = ddb_batch_get(self.table_name, self.key_name, keys)
+        except Exception:
+            return {}
+        if items is None:
+            return super().get_many(keys)
+        return {key: dict(item) for key, item in items.items()}
+
+    def put(self, key: str, item: dict) -> bool:
+        table = ddb_table(self.table_name)
+        if table is None:
+            return False
+        try:
+            table.put_item(Item={self.key_name: key, **item})
+            return True
+        except Exception:
+            return False
+
+
+class SQLiteBackend(CacheBackend):
+    """One table in a local SQLite file in WAL mode, for self-hosted deployments."""
+
+    def __init__(self, path: str, table: str):
+        self.path = path
+        self.table = table
+        self._local = threading.local()
+
+    def _connection(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.table} "
+                "(key TEXT PRIMARY KEY, expires_at INTEGER, updated_at INTEGER, value BLOB)"
+            )
+            self._local.connection = connection
+        return connection
+
+    def get(self, key: str) -> dict | None:
+        try:
+            row = self._connection().execute(
+                f"SELECT expires_at, updated_at, value FROM {self.table} WHERE key = ?",
+                (key,),
+            ).fetchone()
+        except Exception:
+            return None
+        if row is None:
+            return None
+        item = {"expires_at": row[0], "value": row[2]}
+        if row[1] is not None:
+            item["updated_at"] = row[1]
+        return item
+
+    def get_many(self, keys: list) -> dict:
+        found = {}
+        unique = list(dict.fromkeys(keys))
+        try:
+            for offset in range(0, len(unique), 500):
+                chunk = unique[offset:offset + 500]
+                rows = self._connection().execute(
+                    f"SELECT key, expires_at, updated_at, value FROM {self.table} "
+                    f"WHERE key IN ({','.join('?' * len(chunk))})",
+                    chunk,
+                ).fetchall()
+                for key, expires_at, updated_at, value in rows:
+                    item = {"expires_at": expires_at, "value": value}
+                    if updated_at is not None:
+                        item["updated_at"] = updated_at
+                    found[key] = item
+        except Exception:
+            return {}
+        return found
+
+    def put(self, key: str, item: dict) -> bool:
+        value = item.get("value")
+        if isinstance(value, (bytes, bytearray)):
+            value = sqlite3.Binary(value)
+        try:
+            connection = self._connection()
+            connection.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, expires_at, updated_at, value) VALUES (?, ?, ?, ?)",
+                (key, item.get("expires_at"), item.get("updated_at"), value),
+            )
+            # Opportunistic cleanup keeps the file bounded without a background job.
+            connection.execute(
+                f"DELETE FROM {self.table} WHERE expires_at IS NOT NULL AND expires_at < ?",
+                (int(time.time()) - 86400,),
+            )
+            return True
+        except Exception:
+            return False
+
+
+class MemoryBackend(CacheBackend):
+    """Process-local dict; useful for tests, load runs and single-process servers."""
+
+    # Expired items are swept on `put` at most this often, so plan keys from past
+    # sessions do not accumulate in a long-running process.
+    SWEEP_INTERVAL_SECONDS = 60
+
+    def __init__(self):
+        self._items = {}
+        self._lock = threading.Lock()
+        self._next_sweep = 0
+
+    def get(self, key: str) -> dict | None:
+        with self._lock:
+            item = self._items.get(key)
+            return dict(item) if item is not None else None
+
+    def put(self, key: str, item: dict) -> bool:
+        now = int(time.time())
+        with self._lock:
+            self._items[key] = dict(item)
+            if now >= self._next_sweep:
+                self._next_sweep = now + self.SWEEP_INTERVAL_SECONDS
+                expired = [
+                    stored_key
+                    for stored_key, stored in self._items.items()
+                    if _expired(stored.get("expires_at"), now)
+                ]
+                for stored_key in expired:
+                    del self._items[stored_key]
+        return True
+
+    def __len__(self):
+        with self._lock:
+            return len(self._items)
+
+
+def _expired(expires_at, now: int) -> bool:
+    try:
+        return expires_at is not None and int(expires_at) <= now
+    except (TypeError, ValueError):
+        return False
+
+
+_backends = {}
+_backends_lock = threading.Lock()
+
+
+def get_backend(namespace: str, name: str, table_name: str, key_name: str) -> CacheBackend:
+    """
+    Return the backend for a namespace ("plan_cache", "performance"), built once per process.
+
+    `name` is "dynamodb", "sqlite" or "memory"; `table_name`/`key_name` describe the
+    DynamoDB table and are ignored by the local backends.
+    """
+    cache_id = (namespace, name, table_name)
+    backend = _backends.get(cache_id)
+    if backend is not None:
+        return backend
+
+    with _backends_lock:
+        backend = _backends.get(cache_id)
+        if backend is None:
+            if name == "sqlite":
+                backend = SQLiteBackend(cache_sqlite_path(), namespace)
+            elif name == "memory":
+                backend = MemoryBackend()
+            else:
+                backend = DynamoDBBackend(table_name, key_name)
+            _backends[cache_id] = backend
+        return backend
+
+
+def reset_backends():
+    """Forget every constructed backend (tests switch env vars between runs)."""
+    with _backends_lock:
+        _backends.clear()
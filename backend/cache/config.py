@@ -1,4 +1,14 @@
 import os
+import tempfile
+
+
+BACKEND_NAMES = ("dynamodb", "sqlite", "memory")
+
+
+def cache_backend_name() -> str:
+    """Return the plan cache backend: dynamodb (default), sqlite or memory."""
+    value = os.getenv("CACHE_BACKEND", "").strip().lower()
+    return value if value in BACKEND_NAMES else "dynamodb"
 
 
 def cache_enabled() -> bool:
@@ -8,7 +18,8 @@ def cache_enabled() -> bool:
         return True
     if value in {"0", "false", "no", "off"}:
         return False
-    return bool(os.getenv("AWS_LAMBDA_FUNCTION_NAME"))
+    # Local backends work anywhere; DynamoDB defaults to Lambda only.
+    return cache_backend_name() != "dynamodb" or bool(os.getenv("AWS_LAMBDA_FUNCTION_NAME"))
 
 
 def cache_table_name() -> str:
@@ -22,3 +33,83 @@ def cache_ttl_seconds() -> int:
         return int(os.getenv("CACHE_TTL_SECONDS", "7200"))  # 2 hours
     except ValueError:
         return 7200
+
+
+def cache_l1_max_items() -> int:
+    """Return how many plans the in-process L1 tier keeps (0 disables it)."""
+    try:
+        return max(0, int(os.getenv("CACHE_L1_MAX_ITEMS", "256")))
+    except ValueError:
+        return 256
+
+
+def cache_sqlite_path() -> str:
+    """Return the SQLite file used when CACHE_BACKEND/PERFORMANCE_BACKEND is sqlite."""
+    value = os.getenv("CACHE_SQLITE_PATH", "").strip()
+    return value or os.path.join(tempfile.gettempdir(), "jay-asset-cache.sqlite3")
+
+
+def cache_value_encoding() -> str:
+    """Return how cached values are written: zlib (default), msgpack (if installed) or json."""
+    value = os.getenv("CACHE_VALUE_ENCODING", "zlib").strip().lower()
+    return value if value in {"zlib", "msgpack", "json"} else "zlib"
+
+
+def cache_stale_enabled() -> bool:
+    """Return whether expired/rolled-over plans may be served while a recompute runs."""
+    value = os.getenv("CACHE_STALE_WHILE_REVALIDATE", "").strip().lower()
+    return value not in {"0", "false", "no", "off"}
+
+
+def cache_max_stale_seconds() -> int:
+    """Return the maximum age of a plan served as stale."""
+    try:
+        return int(os.getenv("CACHE_MAX_STALE_SECONDS", "259200"))  # 3 days (covers weekends)
+    except ValueError:
+        return 259200
+
+
+def cache_popularity_enabled() -> bool:
+    """Return whether request counts per parameter set are tracked for pre-warming (default: on)."""
+    value = os.getenv("CACHE_POPULARITY_ENABLED", "").strip().lower()
+    return value not in {"0", "false", "no", "off"}
+
+
+def cache_popularity_flush_seconds() -> int:
+    """Return how often in-process request counts are merged into the cache backend."""
+    try:
+        return max(0, int(os.getenv("CACHE_POPULARITY_FLUSH_SECONDS", "60")))
+    except ValueError:
+        return 60
+
+
+def cache_popularity_max_tracked() -> int:
+    """Return how many parameter sets per strategy keep a stored request count."""
+    try:
+        return max(1, int(os.getenv("CACHE_POPULARITY_MAX_TRACKED", "200")))
+    except ValueError:
+        return 200
+
+
+def cache_popularity_half_life_days() -> float:
+    """Return the half-life applied to stored request counts so old favourites fade out."""
+    try:
+        return max(0.0, float(os.getenv("CACHE_POPULARITY_HALF_LIFE_DAYS", "7")))
+    except ValueError:
+        return 7.0
+
+
+def plan_prewarm_deadline_margin_seconds() -> float:
+    """Return the Lambda time reserve below which the pre-warm job starts no new plan."""
+    try:
+        return max(0.0, float(os.getenv("PLAN_PREWARM_DEADLINE_MARGIN_SECONDS", "15")))
+    except ValueError:
+        return 15.0
+
+
+def plan_prewarm_top_n() -> int:
+    """Return how many of the most requested parameter sets are pre-warmed per strategy."""
+    try:
+        return max(0, int(os.getenv("PLAN_PREWARM_TOP_N", "10")))
+    except ValueError:
+        return 10
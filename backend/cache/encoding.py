@@ -0,0 +1,45 @@
+import json
+import zlib
+
+from .config import cache_value_encoding
+
+try:
+    import msgpack  # Optional: smaller/faster than JSON when available
+except Exception:  # pragma: no cover - optional dependency
+    msgpack = None
+
+# Binary values start with a format tag so the encoding can evolve without breaking
+# existing items. Plain strings are the legacy JSON format and are still readable.
+TAG_JSON_ZLIB = b"JZ1"
+TAG_MSGPACK_ZLIB = b"MZ1"
+
+
+def encode_value(obj):
+    """Encode a JSON-compatible object for the `value` attribute (bytes, or str for json)."""
+    encoding = cache_value_encoding()
+    if encoding == "msgpack" and msgpack is not None:
+        return TAG_MSGPACK_ZLIB + zlib.compress(msgpack.packb(obj, use_bin_type=True), 6)
+    raw = json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+    if encoding == "json":
+        return raw
+    return TAG_JSON_ZLIB + zlib.compress(raw.encode("utf-8"), 6)
+
+
+def decode_value(value):
+    """Decode a stored `value` (tagged bytes or legacy JSON string); None if unreadable."""
+    # boto3 returns DynamoDB binary attributes wrapped in boto3.dynamodb.types.Binary.
+    if hasattr(value, "value") and isinstance(getattr(value, "value"), (bytes, bytearray)):
+        value = value.value
+    try:
+        if isinstance(value, str):
+            return json.loads(value) if value else None
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            value = bytes(value)
+            tag, body = value[:3], value[3:]
+            if tag == TAG_JSON_ZLIB:
+                return json.loads(zlib.decompress(body).decode("utf-8"))
+            if tag == TAG_MSGPACK_ZLIB and msgpack is not None:
+                return msgpack.unpackb(zlib.decompress(body), raw=False)
+    except Exception:
+        return None
+    return None
@@ -1,10 +1,21 @@
 import json
-from datetime import datetime, timezone
 
+from market_data.trading_calendar import latest_session_date, next_session_rotation_utc
 
-def _today_bucket_utc() -> str:
-    """Return today's UTC date bucket so cache keys rotate daily."""
-    return datetime.now(timezone.utc).strftime("%Y-%m-%d")
+
+def _market_data_bucket() -> str:
+    """
+    Return the trading date of the newest bar that can exist now.
+
+    Keys rotate once per trading session (after the close plus the publish delay)
+    instead of at UTC midnight, so plans stay cached over nights, weekends and holidays.
+    """
+    return latest_session_date().strftime("%Y-%m-%d")
+
+
+def cache_key_rotation_at() -> int:
+    """Return the epoch second at which keys built now stop being used (the next session bucket)."""
+    return int(next_session_rotation_utc().timestamp())
 
 
 def _normalize_tickers(value):
@@ -45,7 +56,7 @@ def _canonical_parameters(strategy_id: str, parameters: dict) -> dict:
 
 
 def cache_key(strategy_id: str, parameters: dict) -> str | None:
-    """Build a stable key from date bucket, strategy id, and canonical parameters."""
+    """Build a stable key from market-data bucket, strategy id, and canonical parameters."""
     try:
         params_json = json.dumps(
             _canonical_parameters(strategy_id, parameters),
@@ -55,4 +66,23 @@ def cache_key(strategy_id: str, parameters: dict) -> str | None:
     except Exception:
         return None
 
-    return f"{_today_bucket_utc()}|{strategy_id}|{params_json}"
+    return f"{_market_data_bucket()}|{strategy_id}|{params_json}"
+
+
+def stale_cache_key(key: str) -> str | None:
+    """Return the bucket-less key holding the most recent plan for the same inputs."""
+    if not key or "|" not in key:
+        return None
+    return f"latest|{key.split('|', 1)[1]}"
+
+
+def cache_key_parameters(key: str) -> tuple | None:
+    """Return (strategy_id, canonical parameters) encoded in a cache key, or None if malformed."""
+    try:
+        _, strategy_id, params_json = key.split("|", 2)
+        parameters = json.loads(params_json)
+    except Exception:
+        return None
+    if not isinstance(parameters, dict):
+        return None
+    return strategy_id, parameters
@@ -0,0 +1,152 @@
+import json
+import threading
+import time
+from collections import Counter
+
+from .config import (
+    cache_enabled,
+    cache_popularity_enabled,
+    cache_popularity_flush_seconds,
+    cache_popularity_half_life_days,
+    cache_popularity_max_tracked,
+    cache_max_stale_seconds,
+)
+from .encoding import decode_value, encode_value
+from .keys import cache_key_parameters
+from .store import _backend
+
+# Request counts per (strategy_id, canonical parameters), used to pre-warm popular plans.
+# Counts are buffered in-process and merged into one `popularity|<strategy_id>` item on
+# the plan cache backend at most every CACHE_POPULARITY_FLUSH_SECONDS. The merge is a
+# read-modify-write, so concurrent flushes from other containers can drop a few counts;
+# that is fine for ranking. Requests only buffer counts: a due flush runs on a daemon
+# thread (the pre-warm job flushes too), so backend latency or errors never reach them.
+_lock = threading.Lock()
+_pending = {}
+_last_flush = time.monotonic()
+_flush_running = False
+
+
+def _popularity_key(strategy_id: str) -> str:
+    return f"popularity|{strategy_id}"
+
+
+def record_plan_request(cache_key: str):
+    """Count one request for the parameter set behind `cache_key` (best-effort, never raises)."""
+    global _last_flush, _flush_running
+    try:
+        if not cache_enabled() or not cache_popularity_enabled() or not cache_key:
+            return
+
+        parsed = cache_key_parameters(cache_key)
+        if parsed is None:
+            return
+        strategy_id, parameters = parsed
+        params_json = json.dumps(parameters, sort_keys=True, separators=(",", ":"))
+
+        with _lock:
+            _pending.setdefault(strategy_id, Counter())[params_json] += 1
+            due = not _flush_running and time.monotonic() - _last_flush >= cache_popularity_flush_seconds()
+            if due:
+                _last_flush = time.monotonic()
+                _flush_running = True
+        if due:
+            _flush_in_background()
+    except Exception:
+        pass
+
+
+def _flush_in_background():
+    """
+    Run `flush_plan_popularity` on a daemon thread, one at a time.
+
+    In Lambda the container is frozen after the response, so the flush may only finish
+    during a later invocation; counts stay buffered until then.
+    """
+    global _flush_running
+
+    def run():
+        global _flush_running
+        try:
+            flush_plan_popularity()
+        except Exception:
+            pass
+        finally:
+            with _lock:
+                _flush_running = False
+
+    try:
+        threading.Thread(target=run, name="popularity-flush", daemon=True).start()
+    except Exception:
+        with _lock:
+            _flush_running = False
+
+
+def _load_counts(strategy_id: str) -> dict:
+    """Return stored counts for a strategy, decayed to now by the configured half-life."""
+    item = _backend().get(_popularity_key(strategy_id))
+    if not item:
+        return {}
+    counts = decode_value(item.get("value"))
+    if not isinstance(counts, dict):
+        return {}
+
+    half_life = cache_popularity_half_life_days() * 86400
+    try:
+        elapsed = max(0, int(time.time()) - int(item.get("updated_at")))
+    except Exception:
+        elapsed = 0
+    factor = 0.5 ** (elapsed / half_life) if half_life > 0 else 1.0
+
+    decayed = {}
+    for params_json, count in counts.items():
+        try:
+            decayed[params_json] = float(count) * factor
+        except Exception:
+            continue
+    return decayed
+
+
+def flush_plan_popularity() -> bool:
+    """Merge buffered request counts into the cache backend; returns False if any write failed."""
+    with _lock:
+        pending = dict(_pending)
+        _pending.clear()
+
+    ok = True
+    for strategy_id, counter in pending.items():
+        counts = _load_counts(strategy_id)
+        for params_json, count in counter.items():
+            counts[params_json] = counts.get(params_json, 0.0) + count
+        ranked = sorted(counts.items(), key=lambda kv: kv[1], reverse=True)
+        counts = {params_json: round(count, 3) for params_json, count in ranked[: cache_popularity_max_tracked()]}
+
+        now = int(time.time())
+        try:
+            value = encode_value(counts)
+        except Exception:
+            ok = False
+            continue
+        ok = _backend().put(
+            _popularity_key(strategy_id),
+            {"expires_at": now + max(cache_max_stale_seconds(), 30 * 86400), "updated_at": now, "value": value},
+        ) and ok
+    return ok
+
+
+def popular_parameter_sets(strategy_id: str, top_n: int) -> list:
+    """Return up to `top_n` canonical parameter dicts for a strategy, most requested first."""
+    if top_n <= 0 or not cache_enabled() or not cache_popularity_enabled():
+        return []
+
+    flush_plan_popularity()
+    ranked = sorted(_load_counts(strategy_id).items(), key=lambda kv: kv[1], reverse=True)
+    parameter_sets = []
+    for params_json, _ in ranked[:top_n]:
+        try:
+            parameters = json.loads(params_json)
+        except Exception:
+            continue
+        if isinstance(parameters, dict):
+            parameter_sets.append(parameters)
+    return parameter_sets
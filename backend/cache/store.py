@@ -1,20 +1,62 @@
-import json
+import threading
 import time
+from collections import OrderedDict
+
+from tracing import span
+
+from .backends import get_backend
+from .config import (
+    cache_backend_name,
+    cache_enabled,
+    cache_l1_max_items,
+    cache_max_stale_seconds,
+    cache_stale_enabled,
+    cache_table_name,
+    cache_ttl_seconds,
+)
+from .encoding import decode_value, encode_value
+from .keys import cache_key_rotation_at, stale_cache_key
+
+# L1 tier: per-process LRU of {cache_key: (expires_at, plan)} checked before DynamoDB.
+_l1_lock = threading.Lock()
+_l1_plans = OrderedDict()
+
+
+def _l1_get(cache_key: str):
+    """Return a plan from the in-process tier, dropping it once `expires_at` has passed."""
+    with _l1_lock:
+        entry = _l1_plans.get(cache_key)
+        if entry is None:
+            return None
+        expires_at, plan = entry
+        if expires_at <= int(time.time()):
+            del _l1_plans[cache_key]
+            return None
+        _l1_plans.move_to_end(cache_key)
+        return dict(plan)
 
-from .config import cache_enabled, cache_table_name, cache_ttl_seconds
 
-try:
-    import boto3  # Available by default in AWS Lambda Python runtimes
-except Exception:  # pragma: no cover - best effort for local envs without boto3
-    boto3 = None
+def _l1_put(cache_key: str, plan: dict, expires_at: int):
+    """Store a plan in the in-process tier, evicting least-recently-used keys past the limit."""
+    max_items = cache_l1_max_items()
+    if max_items <= 0:
+        return
+    with _l1_lock:
+        _l1_plans[cache_key] = (int(expires_at), dict(plan))
+        _l1_plans.move_to_end(cache_key)
+        while len(_l1_plans) > max_items:
+            _l1_plans.popitem(last=False)
 
 
-def _ddb_table():
-    """Return the configured DynamoDB table handle, or None when unavailable."""
-    if boto3 is None:
-        return None
-    dynamodb = boto3.resource("dynamodb")
-    return dynamodb.Table(cache_table_name())
+def cache_l1_clear():
+    """Drop every plan held in the in-process tier."""
+    with _l1_lock:
+        _l1_plans.clear()
+
+
+def _backend():
+    """Return the configured plan cache backend (DynamoDB, SQLite or in-memory)."""
+    return get_backend("plan_cache", cache_backend_name(), cache_table_name(), "cache_key")
 
 
 def cache_get_plan(cache_key: str):
@@ -22,16 +64,16 @@ def cache_get_plan(cache_key: str):
     if not cache_enabled():
         return None
 
-    table = _ddb_table()
-    if table is None:
-        return None
+    with span("cache_get"):
+        plan = _l1_get(cache_key)
+        if plan is not None:
+            return plan
+        item = _backend().get(cache_key)
+    return _plan_from_item(cache_key, item)
 
-    try:
-        response = table.get_item(Key={"cache_key": cache_key})
-    except Exception:
-        return None
 
-    item = response.get("Item")
+def _plan_from_item(cache_key: str, item):
+    """Decode a backend item into a plan (filling L1), or None when missing, expired or unreadable."""
     if not item:
         return None
 
@@ -40,37 +82,108 @@ def cache_get_plan(cache_key: str):
         if expires_at is not None and int(expires_at) <= int(time.time()):
             return None
     except Exception:
-        pass
+        expires_at = None
 
-    value = item.get("value")
-    if not isinstance(value, str) or not value:
+    plan = decode_value(item.get("value"))
+    if not isinstance(plan, dict):
         return None
 
+    if expires_at is None:
+        expires_at = int(time.time()) + cache_ttl_seconds()
+    _l1_put(cache_key, plan, int(expires_at))
+    return plan
+
+
+def cache_get_plans(cache_keys: list) -> dict:
+    """Read many plans at once (L1, then one multi-key backend read); returns {cache_key: plan} for hits."""
+    if not cache_enabled():
+        return {}
+
+    plans = {}
+    missing = []
+    for key in dict.fromkeys(cache_keys):
+        plan = _l1_get(key)
+        if plan is not None:
+            plans[key] = plan
+        else:
+            missing.append(key)
+
+    if missing:
+        with span("cache_get"):
+            items = _backend().get_many(missing)
+        for key in missing:
+            plan = _plan_from_item(key, items.get(key))
+            if plan is not None:
+                plans[key] = plan
+    return plans
+
+
+def _plan_expires_at() -> int:
+    """
+    Keep a plan until its session-keyed cache key rotates, and at least CACHE_TTL_SECONDS.
+
+    Keys only change when a new session's bar can exist, so a plain TTL would expire
+    still-valid plans overnight and over weekends and holidays.
+    """
+    now = int(time.time())
     try:
-        plan = json.loads(value)
+        rotation_at = cache_key_rotation_at()
     except Exception:
-        return None
-
-    return plan if isinstance(plan, dict) else None
+        rotation_at = 0
+    return max(now + cache_ttl_seconds(), rotation_at)
 
 
 def cache_set_plan(cache_key: str, plan: dict):
-    """Persist a plan in cache with TTL; failures are intentionally ignored."""
+    """Persist a plan in cache until its key rotates; failures are intentionally ignored."""
     if not cache_enabled():
         return
 
-    table = _ddb_table()
-    if table is None:
-        return
+    expires_at = _plan_expires_at()
+    _l1_put(cache_key, plan, expires_at)
 
     try:
-        table.put_item(
-            Item={
-                "cache_key": cache_key,
-                "expires_at": int(time.time()) + cache_ttl_seconds(),
-                "value": json.dumps(plan, separators=(",", ":"), ensure_ascii=False),
-            }
-        )
+        value = encode_value(plan)
     except Exception:
-        # Best-effort cache
         return
+
+    # Best-effort cache: backends swallow their own errors.
+    with span("cache_put"):
+        _backend().put(cache_key, {"expires_at": expires_at, "value": value})
+
+        latest_key = stale_cache_key(cache_key)
+        if cache_stale_enabled() and latest_key:
+            now = int(time.time())
+            _backend().put(
+                latest_key,
+                {"expires_at": now + cache_max_stale_seconds(), "updated_at": now, "value": value},
+            )
+
+
+def cache_get_stale_plan(cache_key: str):
+    """
+    Return (plan, age_seconds) for the most recent plan computed for the same inputs,
+    regardless of TTL or date bucket, or None when absent or older than the max staleness.
+    """
+    if not cache_enabled() or not cache_stale_enabled():
+        return None
+
+    latest_key = stale_cache_key(cache_key)
+    if not latest_key:
+        return None
+
+    with span("cache_stale_get"):
+        item = _backend().get(latest_key)
+    if not item:
+        return None
+
+    try:
+        age = max(0, int(time.time()) - int(item.get("updated_at")))
+    except Exception:
+        return None
+    if age > cache_max_stale_seconds():
+        return None
+
+    plan = decode_value(item.get("value"))
+    if not isinstance(plan, dict):
+        return None
+    return plan, age
@@ -0,0 +1,106 @@
+"""
+Import-time report for the Lambda entry point (cold-start budget).
+
+    python -m coldstart                      # breakdown for `import lambda_handler`
+    python -m coldstart app --top 40
+    python -m coldstart --budget-ms 400      # exit 1 when the import takes longer
+
+Each module is imported in a fresh interpreter with `-X importtime`. The report lists
+the slowest modules by cumulative time and fails (exit code 1) when the budget is
+exceeded or a data library in --forbid is loaded by the import.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import subprocess
+import sys
+
+# Libraries that must only load on first use, never while importing the entry point.
+DEFAULT_FORBIDDEN = ("pandas", "numpy", "yfinance", "pandas_datareader")
+
+
+def measure_imports(module: str) -> list[dict]:
+    """Return one {"module", "self_us", "cumulative_us", "depth"} row per imported module, in import order."""
+    backend_dir = os.path.dirname(os.path.abspath(__file__))
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [backend_dir, env.get("PYTHONPATH")]))
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=backend_dir,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else "import failed")
+
+    rows = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+            rows.append({
+                "module": name.strip(),
+                "self_us": int(self_us),
+                "cumulative_us": int(cumulative_us),
+                "depth": (len(name) - len(name.lstrip()) - 1) // 2,
+            })
+        except ValueError:
+            continue
+
+    # Rows are in completion order; keep the subtree of `module` (interpreter startup
+    # imports such as `site` come before it at depth 0).
+    end = next((i for i, row in enumerate(rows) if row["depth"] == 0 and row["module"] == module), len(rows) - 1)
+    start = max((i + 1 for i, row in enumerate(rows[:end]) if row["depth"] == 0), default=0)
+    return rows[start:end + 1]
+
+
+def import_report(module: str = "lambda_handler", top: int = 25, forbidden=DEFAULT_FORBIDDEN) -> dict:
+    """Summarize `measure_imports(module)`: total time, slowest modules and forbidden libraries loaded."""
+    rows = measure_imports(module)
+    total = next((row["cumulative_us"] for row in rows if row["module"] == module), 0)
+    loaded = {row["module"] for row in rows}
+    return {
+        "module": module,
+        "total_ms": round(total / 1000.0, 1),
+        "modules_imported": len(rows),
+        "forbidden_loaded": sorted(name for name in forbidden if name in loaded),
+        "slowest": sorted(rows, key=lambda row: row["cumulative_us"], reverse=True)[:top],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report per-module import time of a backend entry point.")
+    parser.add_argument("module", nargs="?", default="lambda_handler")
+    parser.add_argument("--top", type=int, default=25, help="number of slowest modules to list")
+    parser.add_argument("--budget-ms", type=float, default=None, help="fail when the import takes longer")
+    parser.add_argument(
+        "--forbid",
+        default=",".join(DEFAULT_FORBIDDEN),
+        help="comma-separated modules that must not be imported (empty to disable)",
+    )
+    args = parser.parse_args(argv)
+
+    forbidden = [name.strip() for name in args.forbid.split(",") if name.strip()]
+    report = import_report(args.module, args.top, forbidden)
+
+    print(f"import {report['module']}: {report['total_ms']:.1f} ms, {report['modules_imported']} modules")
+    print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    for row in report["slowest"]:
+        print(f"{row['cumulative_us'] / 1000.0:>14.1f} {row['self_us'] / 1000.0:>9.1f}  {'  ' * row['depth']}{row['module']}")
+
+    failures = []
+    if report["forbidden_loaded"]:
+        failures.append(f"loaded at import time: {', '.join(report['forbidden_loaded'])}")
+    if args.budget_ms is not None and report["total_ms"] > args.budget_ms:
+        failures.append(f"{report['total_ms']:.1f} ms exceeds the {args.budget_ms:.1f} ms budget")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import copy
+import os
+import threading
+
+# Shared DynamoDB access for the plan cache and the performance store.
+# The resource (session, credentials, connection pool) is built once per process
+# and reused across requests in a warm Lambda container / Flask worker.
+_lock = threading.Lock()
+_resource = None
+_tables = {}
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+def _build_resource():
+    """Create the boto3 DynamoDB resource with pooled connections, short timeouts and retries."""
+    try:
+        # Imported on first table access so cold starts that never read DynamoDB skip boto3.
+        import boto3  # Available by default in AWS Lambda Python runtimes
+        from botocore.config import Config
+    except Exception:  # pragma: no cover - best effort for local envs without boto3
+        return None
+    config = Config(
+        max_pool_connections=_env_int("DDB_MAX_POOL_CONNECTIONS", 10),
+        connect_timeout=_env_float("DDB_CONNECT_TIMEOUT", 1.0),
+        read_timeout=_env_float("DDB_READ_TIMEOUT", 2.0),
+        retries={"max_attempts": _env_int("DDB_MAX_ATTEMPTS", 3), "mode": "standard"},
+        tcp_keepalive=True,
+    )
+    # DDB_ENDPOINT_URL points at DynamoDB Local (e.g. http://localhost:8000) for tests.
+    endpoint_url = os.getenv("DDB_ENDPOINT_URL", "").strip() or None
+    return boto3.resource("dynamodb", config=config, endpoint_url=endpoint_url)
+
+
+def ddb_table(name: str):
+    """Return a cached table handle, or None when DynamoDB is unavailable."""
+    global _resource
+    table = _tables.get(name)
+    if table is not None:
+        return table
+
+    with _lock:
+        table = _tables.get(name)
+        if table is not None:
+            return table
+        if _resource is None:
+            try:
+                _resource = _build_resource()
+            except Exception:
+                return None
+        if _resource is None:
+            return None
+        table = _resource.Table(name)
+        _tables[name] = table
+        return table
+
+
+def ddb_batch_get(table_name: str, key_name: str, keys: list) -> dict | None:
+    """
+    Read many items from one table with BatchGetItem (100 keys per call).
+
+    Returns {key: item} for the keys found, or None when DynamoDB is unavailable or the
+    resource has no batch API (callers then fall back to single reads). Unprocessed keys
+    are retried a few times and otherwise reported as misses.
+    """
+    if ddb_table(table_name) is None:
+        return None
+    batch_get_item = getattr(_resource, "batch_get_item", None)
+    if batch_get_item is None:
+        return None
+
+    found = {}
+    unique = list(dict.fromkeys(keys))
+    for offset in range(0, len(unique), 100):
+        request = {table_name: {"Keys": [{key_name: key} for key in unique[offset:offset + 100]]}}
+        for _ in range(3):
+            response = batch_get_item(RequestItems=request)
+            for item in response.get("Responses", {}).get(table_name, []):
+                found[item[key_name]] = item
+            request = response.get("UnprocessedKeys") or {}
+            if not request:
+                break
+    return found
+
+
+def set_ddb_resource(resource):
+    """
+    Replace the shared DynamoDB resource (anything with `.Table(name)`), e.g. InMemoryDynamoDB.
+
+    Passing None resets to the default boto3 resource on next use.
+    """
+    global _resource
+    with _lock:
+        _resource = resource
+        _tables.clear()
+
+
+class InMemoryTable:
+    """Minimal stand-in for a boto3 Table (get_item / put_item / delete_item) for tests and load runs."""
+
+    def __init__(self, key_name: str | None = None):
+        self.key_name = key_name
+        self._items = {}
+        self._lock = threading.Lock()
+
+    def _key(self, key: dict):
+        return tuple(sorted(key.items()))
+
+    def get_item(self, Key: dict, **_):
+        with self._lock:
+            item = self._items.get(self._key(Key))
+        return {"Item": copy.deepcopy(item)} if item is not None else {}
+
+    def put_item(self, Item: dict, **_):
+        # Without an explicit key name, use the first "*_key" attribute (cache_key / metric_key).
+        name = self.key_name or next((attr for attr in Item if attr.endswith("_key")), next(iter(Item)))
+        with self._lock:
+            self._items[self._key({name: Item[name]})] = copy.deepcopy(Item)
+        return {}
+
+    def delete_item(self, Key: dict, **_):
+        with self._lock:
+            self._items.pop(self._key(Key), None)
+        return {}
+
+
+class InMemoryDynamoDB:
+    """Resource-like container of InMemoryTable objects, keyed by table name."""
+
+    def __init__(self, key_names: dict | None = None):
+        self._key_names = dict(key_names or {})
+        self._tables = {}
+        self._lock = threading.Lock()
+
+    def Table(self, name: str) -> InMemoryTable:
+        with self._lock:
+            if name not in self._tables:
+                self._tables[name] = InMemoryTable(self._key_names.get(name))
+            return self._tables[name]
+
+    def batch_get_item(self, RequestItems: dict, **_):
+        responses = {}
+        for name, request in RequestItems.items():
+            table = self.Table(name)
+            items = [table.get_item(Key=key).get("Item") for key in request.get("Keys", [])]
+            responses[name] = [item for item in items if item is not None]
+        return {"Responses": responses, "UnprocessedKeys": {}}
@@ -0,0 +1,11 @@
+from __future__ import annotations
+
+# Lambda deadline checks shared by the scheduled jobs (performance refresh, plan pre-warm).
+
+
+def remaining_seconds(context) -> float | None:
+    """Return Lambda time left in seconds, or None outside Lambda (no usable context)."""
+    try:
+        return float(context.get_remaining_time_in_millis()) / 1000.0
+    except Exception:
+        return None
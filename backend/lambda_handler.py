@@ -1,7 +1,8 @@
 import awsgi
 import json
 from app import app
-from performance import run_monthly_performance_refresh
+import performance
+from prewarm import run_plan_prewarm
 from urllib.parse import parse_qs
 
 
@@ -56,10 +57,40 @@ def _normalize_event(event: dict) -> dict:
     return event
 
 
+SCHEDULED_JOBS = {"performance_refresh", "prewarm_plans"}
+
+
+def _scheduled_job(event) -> str | None:
+    """
+    Return the scheduled job an event asks for, or None for HTTP events.
+
+    EventBridge/Scheduler events select a job with {"detail": {"job": ...}} or a top-level
+    "job" and default to the performance refresh. A rule with constant JSON input such as
+    {"job": "prewarm_plans"} is recognized without a `source`.
+    """
+    if not isinstance(event, dict):
+        return None
+    detail = event.get("detail") if isinstance(event.get("detail"), dict) else {}
+    job = detail.get("job") or event.get("job")
+    if event.get("source") in {"aws.events", "aws.scheduler"}:
+        return job or "performance_refresh"
+    return job if job in SCHEDULED_JOBS else None
+
+
 def handler(event, context):
     """AWS Lambda handler that translates API Gateway events to Flask"""
-    if isinstance(event, dict) and event.get("source") in {"aws.events", "aws.scheduler"}:
-        summary = run_monthly_performance_refresh()
+    job = _scheduled_job(event)
+    if job:
+        # A follow-up invocation can resume strategies skipped on the deadline by sending
+        # {"detail": {"strategy_ids": [...]}} (or a top-level "strategy_ids").
+        detail = event.get("detail") if isinstance(event.get("detail"), dict) else {}
+        strategy_ids = detail.get("strategy_ids") or event.get("strategy_ids")
+        if job == "prewarm_plans":
+            summary = run_plan_prewarm(context, strategy_ids, detail.get("top_n", event.get("top_n")))
+        elif job == "performance_refresh":
+            summary = performance.run_monthly_performance_refresh(context, strategy_ids)
+        else:
+            summary = {"ok": False, "error": f"Unknown scheduled job '{job}'"}
         return {
             "statusCode": 200,
             "headers": {"Content-Type": "application/json"},
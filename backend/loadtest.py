@@ -0,0 +1,448 @@
+"""
+Load harness for the API with local stand-ins for DynamoDB and market data.
+
+    python -m loadtest                                    # Flask server, 8 threads, 400 requests
+    python -m loadtest --target lambda-v2 --hit-ratio 0.5 --latency-ms 300
+    python -m loadtest --mix calculate=1 --requests 2000 --concurrency 32 --json
+
+Targets:
+- flask: the app on a local threaded WSGI server, driven over HTTP with keep-alive sessions
+- lambda-v1 / lambda-v2: `lambda_handler.handler` called in-process with API Gateway REST
+  (payload 1.0) or HTTP API (payload 2.0) events
+
+The plan cache and performance store run on `ddb.InMemoryDynamoDB` (or the `memory`/`sqlite`
+cache backends with --cache-backend) and prices come from `market_data.SyntheticProvider`
+behind an injectable per-download latency. Cache hits replay parameter sets computed in a
+warm-up phase; misses use parameter sets never seen before. The report gives latency
+percentiles and histograms per endpoint, throughput, and the calculate cache-hit ratio.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode
+
+from market_data import PriceProvider, SyntheticProvider, set_price_provider
+
+TARGETS = ("flask", "lambda-v1", "lambda-v2")
+ENDPOINTS = ("calculate", "performance", "strategies")
+# Histogram bucket upper bounds in milliseconds.
+HISTOGRAM_BOUNDS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+# Symbols drawn for cache-miss parameter sets; the synthetic provider serves any ticker.
+_MISS_POOL = [f"L{index:03d}" for index in range(40)]
+
+
+class LatencyProvider(PriceProvider):
+    """Wrap a provider and sleep `latency_ms` (+/- `jitter_ms`) per fetch, like a remote source."""
+
+    def __init__(self, inner: PriceProvider, latency_ms: float = 0.0, jitter_ms: float = 0.0, seed: int = 0):
+        self.inner = inner
+        self.latency_ms = max(0.0, float(latency_ms))
+        self.jitter_ms = max(0.0, float(jitter_ms))
+        self.fetches = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def fetch(self, tickers, start_date, end_date):
+        with self._lock:
+            self.fetches += 1
+            delay = self.latency_ms + self._random.uniform(-self.jitter_ms, self.jitter_ms)
+        if delay > 0:
+            time.sleep(delay / 1000.0)
+        return self.inner.fetch(tickers, start_date, end_date)
+
+
+class _LambdaContext:
+    function_name = "jay-asset-loadtest"
+    memory_limit_in_mb = 1024
+    aws_request_id = "loadtest"
+
+    def get_remaining_time_in_millis(self):
+        return 900000
+
+
+def configure_stand_ins(cache_backend: str = "dynamodb", latency_ms: float = 0.0, jitter_ms: float = 0.0,
+                        price_cache: bool = True, seed: int = 0) -> LatencyProvider:
+    """Point caches and market data at local stand-ins for this process; returns the price provider."""
+    os.environ["CACHE_BACKEND"] = cache_backend
+    os.environ["CACHE_ENABLED"] = "true"
+    os.environ["PERFORMANCE_ENABLED"] = "true"
+    os.environ.pop("PERFORMANCE_BACKEND", None)
+    if not price_cache:
+        os.environ["PRICE_CACHE_ENABLED"] = "false"
+    # Synthetic prices never go to the local price store, but keep the store out of the way anyway.
+    os.environ["PRICE_STORE_ENABLED"] = "false"
+
+    if cache_backend == "dynamodb":
+        import ddb
+        from cache.config import cache_table_name
+        from performance.config import performance_table_name
+
+        ddb.set_ddb_resource(ddb.InMemoryDynamoDB({cache_table_name(): "cache_key", performance_table_name(): "metric_key"}))
+
+    provider = LatencyProvider(SyntheticProvider(seed=seed, years=5), latency_ms, jitter_ms, seed)
+    set_price_provider(provider)
+    return provider
+
+
+def _calculate_body(parameters: dict, strategy_id: str = "paa") -> dict:
+    return {"strategy_id": strategy_id, "total_money": 10000, "parameters": parameters}
+
+
+def _miss_parameters(rng: random.Random) -> dict:
+    """Return a PAA parameter set that is (almost surely) not in the cache yet."""
+    etfs = rng.sample(_MISS_POOL, rng.randint(6, 12))
+    return {"etfs": etfs, "top_n": rng.randint(1, 6), "lookback_months": 12}
+
+
+def _hit_parameters() -> list[tuple[str, dict]]:
+    """Parameter sets computed during warm-up and replayed as cache hits."""
+    return [
+        ("paa", {}),
+        ("vaa", {}),
+        ("paa", {"etfs": ["SPY", "QQQ", "IWM", "EFA"], "top_n": 2, "lookback_months": 12}),
+        ("paa", {"etfs": ["SPY", "QQQ", "IWM", "VGK", "EWJ", "EEM"], "top_n": 3, "lookback_months": 12}),
+    ]
+
+
+def build_requests(count: int, mix: dict, hit_ratio: float, seed: int = 0) -> list[dict]:
+    """Return `count` request specs {"endpoint", "method", "path", "query", "body", "expect"}."""
+    rng = random.Random(seed)
+    endpoints = [name for name in ENDPOINTS if mix.get(name, 0) > 0]
+    weights = [mix[name] for name in endpoints]
+    hits = _hit_parameters()
+
+    requests_ = []
+    for _ in range(count):
+        endpoint = rng.choices(endpoints, weights)[0]
+        if endpoint == "calculate":
+            if rng.random() < hit_ratio:
+                strategy_id, parameters = rng.choice(hits)
+                expect = "hit"
+            else:
+                strategy_id, parameters = "paa", _miss_parameters(rng)
+                expect = "miss"
+            requests_.append({
+                "endpoint": endpoint,
+                "method": "POST",
+                "path": "/api/calculate",
+                "query": None,
+                "body": _calculate_body(parameters, strategy_id),
+                "expect": expect,
+            })
+        elif endpoint == "performance":
+            requests_.append({
+                "endpoint": endpoint,
+                "method": "GET",
+                "path": "/api/performance",
+                "query": {"strategy_id": rng.choice(["paa", "vaa"])},
+                "body": None,
+                "expect": "hit",
+            })
+        else:
+            requests_.append({
+                "endpoint": endpoint,
+                "method": "GET",
+                "path": "/api/strategies",
+                "query": None,
+                "body": None,
+                "expect": None,
+            })
+    return requests_
+
+
+def api_gateway_event(spec: dict, version: str) -> dict:
+    """Return an API Gateway REST (`"1.0"`) or HTTP API (`"2.0"`) proxy event for a request spec."""
+    body = json.dumps(spec["body"]) if spec["body"] is not None else None
+    headers = {"content-type": "application/json", "host": "loadtest.local"}
+    if version == "2.0":
+        return {
+            "version": "2.0",
+            "routeKey": "$default",
+            "rawPath": spec["path"],
+            "rawQueryString": urlencode(spec["query"] or {}),
+            "headers": headers,
+            "queryStringParameters": spec["query"],
+            "requestContext": {
+                "http": {"method": spec["method"], "path": spec["path"], "protocol": "HTTP/1.1", "sourceIp": "127.0.0.1"},
+                "stage": "$default",
+            },
+            "body": body,
+            "isBase64Encoded": False,
+        }
+    return {
+        "resource": "/{proxy+}",
+        "path": spec["path"],
+        "httpMethod": spec["method"],
+        "headers": headers,
+        "queryStringParameters": spec["query"],
+        "requestContext": {"stage": "prod", "identity": {"sourceIp": "127.0.0.1"}},
+        "body": body,
+        "isBase64Encoded": False,
+    }
+
+
+class _FlaskClient:
+    """Serve the app on an ephemeral local port and send requests over HTTP."""
+
+    def __init__(self):
+        from werkzeug.serving import make_server
+
+        from app import app
+
+        # Per-request access lines would dominate the output and the timing.
+        logging.getLogger("werkzeug").setLevel(logging.WARNING)
+        self._server = make_server("127.0.0.1", 0, app, threaded=True)
+        self._base = f"http://127.0.0.1:{self._server.server_port}"
+        self._thread = threading.Thread(target=self._server.serve_forever, name="loadtest-server", daemon=True)
+        self._thread.start()
+        self._sessions = threading.local()
+
+    def send(self, spec: dict):
+        import requests
+
+        session = getattr(self._sessions, "session", None)
+        if session is None:
+            session = self._sessions.session = requests.Session()
+        response = session.request(spec["method"], self._base + spec["path"], params=spec["query"], json=spec["body"])
+        return response.status_code, response.text
+
+    def close(self):
+        self._server.shutdown()
+
+
+class _LambdaClient:
+    """Call `lambda_handler.handler` in-process with API Gateway events."""
+
+    def __init__(self, version: str):
+        import lambda_handler
+
+        self._handler = lambda_handler.handler
+        self._version = version
+        self._context = _LambdaContext()
+
+    def send(self, spec: dict):
+        response = self._handler(api_gateway_event(spec, self._version), self._context)
+        return int(response.get("statusCode", 500)), response.get("body") or ""
+
+    def close(self):
+        pass
+
+
+def _client(target: str):
+    if target == "flask":
+        return _FlaskClient()
+    return _LambdaClient("2.0" if target == "lambda-v2" else "1.0")
+
+
+def _percentile(sorted_values: list[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+def _histogram(latencies_ms: list[float]) -> list[dict]:
+    counts = [0] * (len(HISTOGRAM_BOUNDS_MS) + 1)
+    for value in latencies_ms:
+        bucket = next((i for i, bound in enumerate(HISTOGRAM_BOUNDS_MS) if value <= bound), len(HISTOGRAM_BOUNDS_MS))
+        counts[bucket] += 1
+    labels = [f"<={bound}ms" for bound in HISTOGRAM_BOUNDS_MS] + [f">{HISTOGRAM_BOUNDS_MS[-1]}ms"]
+    return [{"bucket": label, "count": count} for label, count in zip(labels, counts)]
+
+
+def summarize(samples: list[dict], elapsed_seconds: float) -> dict:
+    """Aggregate per-request samples into latency percentiles, histograms and cache statistics."""
+    endpoints = {}
+    for endpoint in ENDPOINTS:
+        rows = [sample for sample in samples if sample["endpoint"] == endpoint]
+        if not rows:
+            continue
+        latencies = sorted(sample["latency_ms"] for sample in rows)
+        endpoints[endpoint] = {
+            "requests": len(rows),
+            "errors": sum(1 for sample in rows if sample["status"] >= 400),
+            "mean_ms": round(sum(latencies) / len(latencies), 2),
+            "p50_ms": round(_percentile(latencies, 0.50), 2),
+            "p90_ms": round(_percentile(latencies, 0.90), 2),
+            "p99_ms": round(_percentile(latencies, 0.99), 2),
+            "max_ms": round(latencies[-1], 2),
+            "histogram": _histogram(latencies),
+        }
+
+    calculate = [sample for sample in samples if sample["endpoint"] == "calculate" and sample["status"] < 400]
+    statuses = {}
+    for sample in calculate:
+        statuses[sample["cache_status"] or "unknown"] = statuses.get(sample["cache_status"] or "unknown", 0) + 1
+    served_from_cache = statuses.get("cached", 0) + statuses.get("stale", 0)
+    return {
+        "requests": len(samples),
+        "elapsed_seconds": round(elapsed_seconds, 3),
+        "throughput_rps": round(len(samples) / elapsed_seconds, 1) if elapsed_seconds > 0 else 0.0,
+        "endpoints": endpoints,
+        "cache": {
+            "statuses": statuses,
+            "hit_ratio": round(served_from_cache / len(calculate), 3) if calculate else None,
+            "planned_hit_ratio": round(
+                sum(1 for sample in samples if sample["endpoint"] == "calculate" and sample["expect"] == "hit")
+                / max(1, sum(1 for sample in samples if sample["endpoint"] == "calculate")),
+                3,
+            ),
+        },
+    }
+
+
+def _send(client, spec: dict) -> dict:
+    started = time.perf_counter()
+    try:
+        status, body = client.send(spec)
+    except Exception as e:
+        status, body = 599, json.dumps({"error": str(e)})
+    latency_ms = (time.perf_counter() - started) * 1000.0
+    cache_status = None
+    if spec["endpoint"] == "calculate":
+        try:
+            cache_status = json.loads(body).get("cache_status")
+        except Exception:
+            cache_status = None
+    return {
+        "endpoint": spec["endpoint"],
+        "expect": spec["expect"],
+        "status": status,
+        "latency_ms": latency_ms,
+        "cache_status": cache_status,
+    }
+
+
+def run_load(
+    target: str = "flask",
+    requests: int = 400,
+    concurrency: int = 8,
+    mix: dict | None = None,
+    hit_ratio: float = 0.8,
+    latency_ms: float = 50.0,
+    jitter_ms: float = 0.0,
+    cache_backend: str = "dynamodb",
+    price_cache: bool = True,
+    seed: int = 0,
+) -> dict:
+    """Warm the hit set, send `requests` requests from `concurrency` threads and summarize them."""
+    mix = mix or {"calculate": 8, "performance": 1, "strategies": 1}
+    provider = configure_stand_ins(cache_backend, latency_ms, jitter_ms, price_cache, seed)
+    client = _client(target)
+    try:
+        warmup = [
+            {"endpoint": "calculate", "method": "POST", "path": "/api/calculate", "query": None,
+             "body": _calculate_body(parameters, strategy_id), "expect": "hit"}
+            for strategy_id, parameters in _hit_parameters()
+        ] + [
+            {"endpoint": "performance", "method": "GET", "path": "/api/performance",
+             "query": {"strategy_id": strategy_id}, "body": None, "expect": "hit"}
+            for strategy_id in ("paa", "vaa")
+        ]
+        warmup_samples = [_send(client, spec) for spec in warmup]
+        fetches_before = provider.fetches
+
+        plan = build_requests(requests, mix, hit_ratio, seed)
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+            samples = list(pool.map(lambda spec: _send(client, spec), plan))
+        elapsed = time.perf_counter() - started
+    finally:
+        client.close()
+
+    report = summarize(samples, elapsed)
+    report.update({
+        "target": target,
+        "concurrency": concurrency,
+        "mix": mix,
+        "market_data": {"latency_ms": latency_ms, "jitter_ms": jitter_ms, "fetches": provider.fetches - fetches_before},
+        "cache_backend": cache_backend,
+        "warmup_errors": sum(1 for sample in warmup_samples if sample["status"] >= 400),
+    })
+    return report
+
+
+def _parse_mix(raw: str) -> dict:
+    mix = {}
+    for part in raw.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in ENDPOINTS:
+            raise argparse.ArgumentTypeError(f"unknown endpoint '{name}' (expected one of {', '.join(ENDPOINTS)})")
+        try:
+            mix[name] = float(weight or 1)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"invalid weight for '{name}': {weight}")
+    if not any(weight > 0 for weight in mix.values()):
+        raise argparse.ArgumentTypeError("mix needs at least one positive weight")
+    return mix
+
+
+def _print_report(report: dict):
+    print(
+        f"{report['target']}: {report['requests']} requests, concurrency {report['concurrency']}, "
+        f"{report['elapsed_seconds']:.2f} s, {report['throughput_rps']:.1f} req/s"
+    )
+    cache = report["cache"]
+    if cache["hit_ratio"] is not None:
+        print(f"calculate cache hit ratio: {cache['hit_ratio']:.3f} (planned {cache['planned_hit_ratio']:.3f}) {cache['statuses']}")
+    print(f"market data fetches: {report['market_data']['fetches']} at {report['market_data']['latency_ms']:.0f} ms")
+    for endpoint, stats in report["endpoints"].items():
+        print(
+            f"\n{endpoint}: n={stats['requests']} errors={stats['errors']} mean={stats['mean_ms']:.1f} "
+            f"p50={stats['p50_ms']:.1f} p90={stats['p90_ms']:.1f} p99={stats['p99_ms']:.1f} max={stats['max_ms']:.1f} ms"
+        )
+        peak = max(bucket["count"] for bucket in stats["histogram"]) or 1
+        for bucket in stats["histogram"]:
+            if bucket["count"]:
+                print(f"  {bucket['bucket']:>9} {bucket['count']:>6} {'#' * max(1, round(40 * bucket['count'] / peak))}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Drive the API under concurrent load with local stand-ins.")
+    parser.add_argument("--target", choices=TARGETS, default="flask")
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--mix", type=_parse_mix, default=None, help="endpoint weights, e.g. calculate=8,performance=1,strategies=1")
+    parser.add_argument("--hit-ratio", type=float, default=0.8, help="share of calculate requests for warmed parameter sets")
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="market data stub latency per download")
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--cache-backend", choices=("dynamodb", "memory", "sqlite"), default="dynamodb",
+                        help="dynamodb uses the in-memory DynamoDB fake")
+    parser.add_argument("--no-price-cache", action="store_true", help="disable the in-process price cache")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args(argv)
+
+    report = run_load(
+        target=args.target,
+        requests=args.requests,
+        concurrency=args.concurrency,
+        mix=args.mix,
+        hit_ratio=min(1.0, max(0.0, args.hit_ratio)),
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        cache_backend=args.cache_backend,
+        price_cache=not args.no_price_cache,
+        seed=args.seed,
+    )
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        _print_report(report)
+    errors = report["warmup_errors"] + sum(stats["errors"] for stats in report["endpoints"].values())
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
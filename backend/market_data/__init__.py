@@ -0,0 +1,34 @@
+from importlib import import_module
+
+# Public names are re-exported lazily (PEP 562) so importing `market_data` or its light
+# submodules (`config`, `trading_calendar`) does not load pandas, requests or the data
+# source libraries; they are imported on first use of the name.
+_EXPORTS = {
+    "download_close_prices": ".download",
+    "NetworkProvider": ".providers",
+    "PriceProvider": ".providers",
+    "ReplayProvider": ".providers",
+    "SyntheticProvider": ".providers",
+    "get_http_session": ".session",
+    "get_price_provider": ".providers",
+    "price_cache_clear": ".memory",
+    "price_cache_stats": ".memory",
+    "set_http_session": ".session",
+    "set_price_provider": ".providers",
+    "shared_price_panel": ".download",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
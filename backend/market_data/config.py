@@ -0,0 +1,156 @@
+import os
+import tempfile
+
+
+def price_store_enabled() -> bool:
+    """Return whether downloaded prices should be persisted to the local price store."""
+    value = os.getenv("PRICE_STORE_ENABLED", "").strip().lower()
+    if value in {"1", "true", "yes", "on"}:
+        return True
+    if value in {"0", "false", "no", "off"}:
+        return False
+    return bool(os.getenv("AWS_LAMBDA_FUNCTION_NAME") or os.getenv("PRICE_STORE_DIR"))
+
+
+def price_store_dir() -> str:
+    """Return the directory holding one price file per ticker (Lambda: under /tmp)."""
+    value = os.getenv("PRICE_STORE_DIR", "").strip()
+    if value:
+        return value
+    return os.path.join(tempfile.gettempdir(), "jay-asset-prices")
+
+
+def price_store_refresh_seconds() -> int:
+    """Return how long a stored ticker is trusted before its latest bars are re-checked."""
+    try:
+        return int(os.getenv("PRICE_STORE_REFRESH_SECONDS", "3600"))  # 1 hour
+    except ValueError:
+        return 3600
+
+
+def market_data_max_workers() -> int:
+    """Return how many per-ticker downloads may run concurrently (1 = sequential)."""
+    try:
+        return max(1, int(os.getenv("MARKET_DATA_MAX_WORKERS", "4")))
+    except ValueError:
+        return 4
+
+
+def market_data_rate_limit(source: str) -> float:
+    """Return the request cap per second for a source (e.g. STOOQ_RATE_LIMIT), 0 disables it."""
+    defaults = {"stooq": "8", "yahoo": "2"}
+    try:
+        return max(0.0, float(os.getenv(f"{source.upper()}_RATE_LIMIT", defaults.get(source, "0"))))
+    except ValueError:
+        return float(defaults.get(source, "0"))
+
+
+def market_data_timeouts() -> tuple:
+    """Return (connect, read) HTTP timeouts in seconds for market-data requests."""
+    try:
+        connect = float(os.getenv("MARKET_DATA_CONNECT_TIMEOUT", "3.05"))
+        read = float(os.getenv("MARKET_DATA_READ_TIMEOUT", "20"))
+    except ValueError:
+        return (3.05, 20.0)
+    return (connect, read)
+
+
+def market_data_retries() -> int:
+    """Return how many times a failed market-data HTTP request is retried."""
+    try:
+        return max(0, int(os.getenv("MARKET_DATA_RETRIES", "2")))
+    except ValueError:
+        return 2
+
+
+def market_data_backoff_seconds() -> float:
+    """Return the exponential backoff factor between market-data retries."""
+    try:
+        return max(0.0, float(os.getenv("MARKET_DATA_BACKOFF_SECONDS", "0.5")))
+    except ValueError:
+        return 0.5
+
+
+def price_cache_enabled() -> bool:
+    """Return whether the in-process price cache sits in front of downloads (default: on)."""
+    value = os.getenv("PRICE_CACHE_ENABLED", "").strip().lower()
+    return value not in {"0", "false", "no", "off"}
+
+
+def price_cache_max_bytes() -> int:
+    """Return the memory budget for cached price series in this process."""
+    try:
+        return max(0, int(os.getenv("PRICE_CACHE_MAX_BYTES", str(64 * 1024 * 1024))))
+    except ValueError:
+        return 64 * 1024 * 1024
+
+
+def price_cache_ttl_seconds() -> int:
+    """Return how long cached series that reach the latest day are served before a re-fetch."""
+    try:
+        return int(os.getenv("PRICE_CACHE_TTL_SECONDS", "900"))  # 15 minutes
+    except ValueError:
+        return 900
+
+
+def market_data_publish_delay_minutes() -> float:
+    """Return how long after the exchange close daily bars are assumed to be downloadable."""
+    try:
+        return max(0.0, float(os.getenv("MARKET_DATA_PUBLISH_DELAY_MINUTES", "90")))
+    except ValueError:
+        return 90.0
+
+
+def market_data_window_pad_days() -> int:
+    """Return extra trading days fetched beyond a computed minimum (unmodeled closures, missing bars)."""
+    try:
+        return max(0, int(os.getenv("MARKET_DATA_WINDOW_PAD_DAYS", "5")))
+    except ValueError:
+        return 5
+
+
+def market_data_provider_name() -> str:
+    """Return the price provider: network (default), replay, record or synthetic."""
+    value = os.getenv("MARKET_DATA_PROVIDER", "").strip().lower()
+    return value if value in {"network", "replay", "record", "synthetic"} else "network"
+
+
+def market_data_fixtures_dir() -> str:
+    """Return the directory of per-ticker fixture files used by the replay/record providers."""
+    value = os.getenv("MARKET_DATA_FIXTURES_DIR", "").strip()
+    return value or os.path.join(tempfile.gettempdir(), "jay-asset-fixtures")
+
+
+def market_data_fixtures_format() -> str:
+    """Return the format new fixtures are recorded in: csv (default) or parquet."""
+    value = os.getenv("MARKET_DATA_FIXTURES_FORMAT", "csv").strip().lower()
+    return value if value in {"csv", "parquet"} else "csv"
+
+
+def market_data_synthetic_seed() -> int:
+    """Return the seed of the synthetic price generator."""
+    try:
+        return int(os.getenv("MARKET_DATA_SYNTHETIC_SEED", "0"))
+    except ValueError:
+        return 0
+
+
+def market_data_synthetic_years() -> float:
+    """Return how many years of synthetic history exist before the latest session."""
+    try:
+        return max(0.1, float(os.getenv("MARKET_DATA_SYNTHETIC_YEARS", "10")))
+    except ValueError:
+        return 10.0
+
+
+def market_data_synthetic_gap_probability() -> float:
+    """Return the probability that a synthetic bar is missing (0 = no gaps)."""
+    try:
+        return min(0.9, max(0.0, float(os.getenv("MARKET_DATA_SYNTHETIC_GAP_PROBABILITY", "0"))))
+    except ValueError:
+        return 0.0
+
+
+def market_data_synthetic_end() -> str:
+    """Return the last synthetic session as YYYY-MM-DD, or "" for the latest published session."""
+    return os.getenv("MARKET_DATA_SYNTHETIC_END", "").strip()
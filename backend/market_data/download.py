@@ -0,0 +1,284 @@
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import replace
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+from singleflight import SingleFlight
+from tracing import span
+
+from .config import price_cache_enabled, price_store_enabled, price_store_refresh_seconds
+from .memory import price_cache
+from .providers import get_price_provider
+from .store import StoredPrices, price_store_load, price_store_save
+from .trading_calendar import latest_session_date, session_published_utc
+
+_DOWNLOAD_FLIGHTS = SingleFlight()
+_PANELS = threading.local()
+
+
+@contextmanager
+def shared_price_panel(prices: pd.DataFrame, failed: Iterable[str], start_date: datetime, end_date: datetime):
+    """
+    Serve `download_close_prices` calls on this thread from an already downloaded panel.
+
+    Used when many plans are computed from one union download: requests whose tickers
+    and window are covered by the panel are sliced from it, anything else falls through
+    to the normal download path.
+    """
+    previous = getattr(_PANELS, "panel", None)
+    if prices is not None and not prices.empty and not prices.index.is_monotonic_increasing:
+        # A union download over unaligned calendars is not sorted; sort once for every slice.
+        prices = prices.sort_index()
+    _PANELS.panel = (prices, set(failed or []), _day(start_date), _day(end_date))
+    try:
+        yield
+    finally:
+        _PANELS.panel = previous
+
+
+def _from_shared_panel(tickers: List[str], start_date: datetime, end_date: datetime):
+    """Return (price_data, failed) sliced from the active panel, or None if it does not cover the request."""
+    panel = getattr(_PANELS, "panel", None)
+    if panel is None:
+        return None
+    prices, panel_failed, panel_start, panel_end = panel
+    start = _day(start_date)
+    end = _day(end_date)
+    if start < panel_start or end > panel_end:
+        return None
+
+    unique = list(dict.fromkeys(tickers))
+    columns = [ticker for ticker in unique if ticker in prices.columns]
+    failed = [ticker for ticker in unique if ticker not in prices.columns]
+    if any(ticker not in panel_failed for ticker in failed):
+        return None
+    if not columns:
+        return pd.DataFrame(), failed
+    index = prices.index
+    # Drop dates only other tickers in the union have, as a download of these tickers would.
+    return prices.loc[(index >= start) & (index <= end), columns].dropna(how="all"), failed
+
+
+def download_close_prices(
+    tickers: Iterable[str],
+    start_date: datetime,
+    end_date: datetime,
+) -> Tuple[pd.DataFrame, List[str]]:
+    """
+    Download daily close prices for tickers.
+
+    Lookups go through the in-process price cache first (slicing any cached superset
+    range), then the local price store, which only fetches the date ranges not yet
+    covered from the configured price provider (by default the network: Stooq first,
+    Yahoo fallback; see `providers.py` for replay and synthetic data).
+
+    Returns:
+      - price_data: DataFrame indexed by date, columns are ticker symbols, values are closes
+      - failed: list of tickers that could not be downloaded from either source
+    """
+    tickers_list = list(tickers)
+    shared = _from_shared_panel(tickers_list, start_date, end_date)
+    if shared is not None:
+        return shared
+    if not price_cache_enabled():
+        return _download_uncached(tickers_list, start_date, end_date)
+
+    unique = list(dict.fromkeys(tickers_list))
+    start = _day(start_date)
+    end = _day(end_date)
+    today = _day(datetime.utcnow())
+    latest = pd.Timestamp(latest_session_date())
+    cache = price_cache()
+
+    series_by_ticker, missing = cache.lookup(unique, start, end, today, latest)
+    failed: List[str] = []
+
+    # Tickers another thread is already downloading for the same window are waited on
+    # instead of being fetched twice.
+    leading, waiting = [], []
+    for ticker in missing:
+        call, leader = _DOWNLOAD_FLIGHTS.claim((ticker, start, end))
+        (leading if leader else waiting).append((ticker, call))
+
+    if leading:
+        try:
+            frame, failed = _download_uncached([ticker for ticker, _ in leading], start_date, end_date)
+        except BaseException as error:
+            for ticker, call in leading:
+                _DOWNLOAD_FLIGHTS.finish((ticker, start, end), call, error=error)
+            raise
+        if frame is not None and not frame.empty:
+            frame = frame.sort_index()
+
+        for ticker, call in leading:
+            closes = None
+            if frame is not None and ticker in frame.columns:
+                closes = frame[ticker].dropna()
+                if closes.empty:
+                    closes = None
+            if closes is not None:
+                cache.put(ticker, closes, start, end, today, latest)
+                series_by_ticker[ticker] = closes
+            _DOWNLOAD_FLIGHTS.finish((ticker, start, end), call, result=closes)
+
+    for ticker, call in waiting:
+        try:
+            closes = call.wait()
+        except Exception:
+            closes = None
+        if closes is None:
+            failed.append(ticker)
+        else:
+            series_by_ticker[ticker] = closes
+
+    series_list = [series_by_ticker[ticker].rename(ticker) for ticker in unique if ticker in series_by_ticker]
+    if not series_list:
+        return pd.DataFrame(), failed
+
+    return pd.concat(series_list, axis=1).sort_index(), failed
+
+
+def _download_uncached(
+    tickers: List[str],
+    start_date: datetime,
+    end_date: datetime,
+) -> Tuple[pd.DataFrame, List[str]]:
+    provider = get_price_provider()
+    if not price_store_enabled() or not provider.use_price_store:
+        return provider.fetch(tickers, start_date, end_date)
+    return _download_with_store(tickers, start_date, end_date, provider)
+
+
+def _day(value) -> pd.Timestamp:
+    stamp = pd.Timestamp(value)
+    if stamp.tzinfo is not None:
+        stamp = stamp.tz_localize(None)
+    return stamp.normalize()
+
+
+def _missing_ranges(
+    stored: Optional[StoredPrices],
+    start: pd.Timestamp,
+    end: pd.Timestamp,
+    now: int,
+    latest: pd.Timestamp,
+    published_at: int,
+) -> List[Tuple[pd.Timestamp, pd.Timestamp]]:
+    """
+    Return the (start, end) calendar ranges that still have to be fetched for one ticker.
+
+    `latest` is the latest published session and `published_at` the epoch second its
+    bar became available.
+    """
+    if stored is None:
+        return [(start, end)]
+
+    ranges = []
+    if start < stored.covered_start:
+        ranges.append((start, stored.covered_start))
+
+    stale = now - stored.checked_at >= price_store_refresh_seconds()
+    # Checked before the latest session's bar was published and still without it: re-check
+    # right away instead of waiting out the refresh interval.
+    behind = (
+        end >= latest
+        and stored.checked_at < published_at
+        and (stored.closes.empty or stored.closes.index.max() < latest)
+    )
+    if end > stored.covered_end or (end == stored.covered_end and (stale or behind)):
+        # Re-check from the last covered day so a bar published later that day is picked up
+        # and the covered range stays contiguous.
+        ranges.append((stored.covered_end, end))
+    return ranges
+
+
+def _merge(old: Optional[pd.Series], new: Optional[pd.Series], ticker: str) -> pd.Series:
+    parts = [part.dropna() for part in (old, new) if part is not None and not part.empty]
+    if not parts:
+        return pd.Series(dtype="float64", name=ticker)
+    merged = pd.concat(parts)
+    merged.index = pd.DatetimeIndex(merged.index).normalize()
+    merged = merged[~merged.index.duplicated(keep="last")].sort_index()
+    merged.index.name = "Date"
+    return merged.astype("float64").rename(ticker)
+
+
+def _download_with_store(
+    tickers: List[str],
+    start_date: datetime,
+    end_date: datetime,
+    provider,
+) -> Tuple[pd.DataFrame, List[str]]:
+    unique = list(dict.fromkeys(tickers))
+    start = _day(start_date)
+    end = _day(end_date)
+    now = int(time.time())
+    today = _day(datetime.utcnow())
+    latest = pd.Timestamp(latest_session_date())
+    published_at = int(session_published_utc(latest.date()).timestamp())
+
+    with span("price_store"):
+        stored: Dict[str, Optional[StoredPrices]] = {ticker: price_store_load(ticker) for ticker in unique}
+
+    # Group tickers that need the same window so each window is one multi-ticker download.
+    pending: Dict[Tuple[pd.Timestamp, pd.Timestamp], List[str]] = {}
+    for ticker in unique:
+        for window in _missing_ranges(stored[ticker], start, end, now, latest, published_at):
+            pending.setdefault(window, []).append(ticker)
+
+    updated: Dict[str, StoredPrices] = {}
+    for (window_start, window_end), group in pending.items():
+        fetch_end = end_date if window_end == end else window_end.to_pydatetime()
+        frame, _ = provider.fetch(group, window_start.to_pydatetime(), fetch_end)
+        received = frame is not None and not frame.empty
+
+        for ticker in group:
+            fresh = frame[ticker].dropna() if received and ticker in frame.columns else None
+            record = updated.get(ticker) or stored[ticker]
+            if fresh is None or fresh.empty:
+                if record is not None and window_start >= record.covered_end:
+                    # A re-check of the covered end found no new bar (weekend, not published
+                    # yet): wait for the refresh interval again, but keep the covered range.
+                    updated[ticker] = replace(record, checked_at=now)
+                # Otherwise treat it as a transient source failure and leave coverage
+                # untouched so the window is retried on the next call.
+                continue
+            if record is None:
+                record = StoredPrices(
+                    closes=pd.Series(dtype="float64", name=ticker),
+                    covered_start=window_start,
+                    covered_end=min(window_end, today),
+                    checked_at=now,
+                )
+            updated[ticker] = StoredPrices(
+                closes=_merge(record.closes, fresh, ticker),
+                covered_start=min(record.covered_start, window_start),
+                covered_end=max(record.covered_end, min(window_end, today)),
+                checked_at=now if window_end >= record.covered_end else record.checked_at,
+            )
+
+    with span("price_store"):
+        for ticker, record in updated.items():
+            stored[ticker] = record
+            price_store_save(ticker, record)
+
+    series_list = []
+    failed: List[str] = []
+    for ticker in unique:
+        record = stored[ticker]
+        closes = record.closes.loc[start:end] if record is not None else None
+        if closes is None or closes.empty:
+            failed.append(ticker)
+            continue
+        series_list.append(closes.rename(ticker))
+
+    if not series_list:
+        return pd.DataFrame(), failed
+
+    return pd.concat(series_list, axis=1), failed
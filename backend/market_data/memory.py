@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+import pandas as pd
+
+from .config import price_cache_max_bytes, price_cache_ttl_seconds
+
+
+@dataclass
+class _Entry:
+    closes: pd.Series
+    start: pd.Timestamp
+    end: pd.Timestamp
+    loaded_at: float
+    nbytes: int
+    session: pd.Timestamp  # latest published session when the series was downloaded
+
+
+def _between(closes: pd.Series, start: pd.Timestamp, end: pd.Timestamp) -> pd.Series:
+    # Boolean mask rather than `.loc[start:end]`: label slicing raises KeyError when the index
+    # is not monotonic and a bound (e.g. a weekend) is not one of its labels.
+    index = closes.index
+    return closes[(index >= start) & (index <= end)]
+
+
+class PriceCache:
+    """
+    Size-bounded LRU of close-price series, one entry per ticker.
+
+    Each entry remembers the calendar range it was downloaded for, so any request
+    inside that range is served by slicing. Entries that reach the latest day expire
+    after `price_cache_ttl_seconds()`, and as soon as a session newer than the one
+    published at download time falls inside their range, so new bars are picked up.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _is_fresh(self, entry: _Entry, today: pd.Timestamp, now: float) -> bool:
+        if entry.end < today:
+            return True
+        return now - entry.loaded_at < price_cache_ttl_seconds()
+
+    @staticmethod
+    def _behind(entry: _Entry, end: pd.Timestamp, latest: pd.Timestamp) -> bool:
+        """Whether the request needs a session published after the series was downloaded and lacks its bar."""
+        if entry.session >= latest or min(end, entry.end) < latest:
+            return False
+        return entry.closes.empty or entry.closes.index[-1] < latest
+
+    def lookup(
+        self,
+        tickers: List[str],
+        start: pd.Timestamp,
+        end: pd.Timestamp,
+        today: pd.Timestamp,
+        latest: pd.Timestamp,
+    ) -> Tuple[Dict[str, pd.Series], List[str]]:
+        """Return (cached slices by ticker, tickers that must be downloaded); `latest` is the latest published session."""
+        found: Dict[str, pd.Series] = {}
+        missing: List[str] = []
+        now = time.monotonic()
+        with self._lock:
+            for ticker in tickers:
+                entry = self._entries.get(ticker)
+                covered = entry is not None and entry.start <= start and entry.end >= min(end, today)
+                if covered and not self._behind(entry, end, latest) and (end < today or self._is_fresh(entry, today, now)):
+                    self._entries.move_to_end(ticker)
+                    found[ticker] = _between(entry.closes, start, end)
+                    self.hits += 1
+                else:
+                    missing.append(ticker)
+                    self.misses += 1
+        return found, missing
+
+    def put(
+        self,
+        ticker: str,
+        closes: pd.Series,
+        start: pd.Timestamp,
+        end: pd.Timestamp,
+        today: pd.Timestamp,
+        latest: pd.Timestamp,
+    ):
+        if not closes.index.is_monotonic_increasing:
+            # Columns of a multi-ticker concat over unaligned calendars can come out of order.
+            closes = closes.sort_index()
+        now = time.monotonic()
+        with self._lock:
+            previous = self._entries.pop(ticker, None)
+            loaded_at, session = now, latest
+            if previous is not None:
+                self._bytes -= previous.nbytes
+                overlaps = start <= previous.end and end >= previous.start
+                if overlaps and self._is_fresh(previous, today, now):
+                    # Extend the cached range instead of dropping the bars we already hold.
+                    closes = pd.concat([previous.closes, closes])
+                    closes = closes[~closes.index.duplicated(keep="last")].sort_index()
+                    if end < previous.end:
+                        loaded_at, session = previous.loaded_at, previous.session
+                    start, end = min(start, previous.start), max(end, previous.end)
+
+            nbytes = int(closes.memory_usage(index=True, deep=False))
+            if nbytes > price_cache_max_bytes():
+                return
+            self._entries[ticker] = _Entry(closes, start, min(end, today), loaded_at, nbytes, session)
+            self._bytes += nbytes
+            while self._bytes > price_cache_max_bytes() and self._entries:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.nbytes
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": price_cache_max_bytes(),
+            }
+
+
+# One cache per process: shared by strategies, performance specs and requests in a warm container.
+_PRICE_CACHE = PriceCache()
+
+
+def price_cache() -> PriceCache:
+    return _PRICE_CACHE
+
+
+def price_cache_stats() -> dict:
+    """Return hit/miss/eviction counters and memory usage of the in-process price cache."""
+    return _PRICE_CACHE.stats()
+
+
+def price_cache_clear():
+    """Drop every cached series and reset counters."""
+    _PRICE_CACHE.clear()
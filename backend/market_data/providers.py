@@ -0,0 +1,302 @@
+from __future__ import annotations
+
+import importlib.util
+import os
+import re
+import threading
+import zlib
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .config import (
+    market_data_fixtures_dir,
+    market_data_fixtures_format,
+    market_data_provider_name,
+    market_data_synthetic_end,
+    market_data_synthetic_gap_probability,
+    market_data_synthetic_seed,
+    market_data_synthetic_years,
+)
+from .trading_calendar import exchange_holidays, latest_session_date
+
+# Price providers sit under the caches in `download.py`: the network sources for
+# production, fixture replay/record and a seeded synthetic generator for tests and
+# benchmarks that must run without network access.
+
+
+class PriceProvider:
+    """Source of daily closes; `fetch` has the same contract as `download_close_prices`."""
+
+    # Only real market data is persisted to the local price store.
+    use_price_store = False
+
+    def fetch(self, tickers: List[str], start_date: datetime, end_date: datetime) -> Tuple[pd.DataFrame, List[str]]:
+        raise NotImplementedError
+
+
+def _frame(series_by_ticker: Dict[str, pd.Series], tickers: List[str]) -> pd.DataFrame:
+    series_list = [series_by_ticker[ticker].rename(ticker) for ticker in tickers if ticker in series_by_ticker]
+    if not series_list:
+        return pd.DataFrame()
+    return pd.concat(series_list, axis=1)
+
+
+class NetworkProvider(PriceProvider):
+    """Stooq first, Yahoo Finance for the rest (see `sources.py`)."""
+
+    use_price_store = True
+
+    def fetch(self, tickers, start_date, end_date):
+        from .sources import download_from_sources
+
+        return download_from_sources(tickers, start_date, end_date)
+
+
+def _require_parquet_engine():
+    """Raise a clear error when pandas has no Parquet engine (pyarrow is not a dependency)."""
+    if importlib.util.find_spec("pyarrow") is None and importlib.util.find_spec("fastparquet") is None:
+        raise RuntimeError(
+            "Parquet fixtures need pyarrow or fastparquet (pip install pyarrow); "
+            "use MARKET_DATA_FIXTURES_FORMAT=csv instead"
+        )
+
+
+class ReplayProvider(PriceProvider):
+    """
+    Serve closes from per-ticker fixture files (`<TICKER>.csv` with Date,Close columns,
+    or `<TICKER>.parquet` when a Parquet engine is installed). Tickers without a fixture,
+    or with no bars in the window, are reported as failed.
+
+    With `record=True`, every request is first fetched from `upstream` (the network by
+    default) and merged into the fixtures, so a live run can be captured and replayed
+    offline later.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        record: bool = False,
+        upstream: Optional[PriceProvider] = None,
+        file_format: Optional[str] = None,
+    ):
+        self.directory = directory or market_data_fixtures_dir()
+        self.record = record
+        self.upstream = upstream or NetworkProvider()
+        self.file_format = file_format or market_data_fixtures_format()
+        if self.file_format not in {"csv", "parquet"}:
+            raise ValueError(f"Unsupported fixture format '{self.file_format}' (expected csv or parquet)")
+        if self.file_format == "parquet":
+            _require_parquet_engine()
+        self._lock = threading.Lock()
+
+    def _path(self, ticker: str, extension: str) -> str:
+        safe = re.sub(r"[^A-Za-z0-9._-]", "_", str(ticker).upper())
+        return os.path.join(self.directory, f"{safe}.{extension}")
+
+    def load(self, ticker: str) -> Optional[pd.Series]:
+        """Return the full fixture series for a ticker, or None when absent or unreadable."""
+        if os.path.exists(self._path(ticker, "parquet")):
+            _require_parquet_engine()
+        try:
+            if os.path.exists(self._path(ticker, "parquet")):
+                frame = pd.read_parquet(self._path(ticker, "parquet"))
+            elif os.path.exists(self._path(ticker, "csv")):
+                frame = pd.read_csv(self._path(ticker, "csv"), index_col=0, parse_dates=True)
+            else:
+                return None
+        except Exception:
+            return None
+        if frame.empty:
+            return None
+        closes = frame.iloc[:, 0].astype("float64").dropna()
+        closes.index = pd.DatetimeIndex(closes.index).normalize()
+        closes.index.name = "Date"
+        return closes.sort_index().rename(ticker)
+
+    def save(self, ticker: str, closes: pd.Series):
+        """Write a ticker's fixture atomically in the configured format."""
+        os.makedirs(self.directory, exist_ok=True)
+        frame = closes.rename("Close").to_frame()
+        frame.index.name = "Date"
+        extension = "parquet" if self.file_format == "parquet" else "csv"
+        path = self._path(ticker, extension)
+        temp_path = f"{path}.tmp"
+        if extension == "parquet":
+            frame.to_parquet(temp_path)
+        else:
+            frame.to_csv(temp_path)
+        os.replace(temp_path, path)
+
+    def _record(self, tickers: List[str], start_date: datetime, end_date: datetime):
+        frame, _ = self.upstream.fetch(tickers, start_date, end_date)
+        if frame is None or frame.empty:
+            return
+        with self._lock:
+            for ticker in tickers:
+                if ticker not in frame.columns or frame[ticker].dropna().empty:
+                    continue
+                fresh = frame[ticker].dropna().astype("float64")
+                fresh.index = pd.DatetimeIndex(fresh.index).normalize()
+                existing = self.load(ticker)
+                merged = fresh if existing is None else pd.concat([existing, fresh])
+                merged = merged[~merged.index.duplicated(keep="last")].sort_index()
+                self.save(ticker, merged)
+
+    def fetch(self, tickers, start_date, end_date):
+        unique = list(dict.fromkeys(tickers))
+        if self.record:
+            self._record(unique, start_date, end_date)
+
+        start = pd.Timestamp(start_date).normalize()
+        end = pd.Timestamp(end_date).normalize()
+        series_by_ticker: Dict[str, pd.Series] = {}
+        failed: List[str] = []
+        for ticker in unique:
+            closes = self.load(ticker)
+            closes = closes.loc[start:end] if closes is not None else None
+            if closes is None or closes.empty:
+                failed.append(ticker)
+            else:
+                series_by_ticker[ticker] = closes
+        return _frame(series_by_ticker, unique), failed
+
+
+class SyntheticProvider(PriceProvider):
+    """
+    Seeded geometric Brownian motion closes on the exchange calendar.
+
+    Each ticker gets its own drift, volatility and starting price derived from
+    (`seed`, ticker), and its path is generated from a fixed epoch, so a ticker's
+    close on a given date never depends on the requested window. History starts
+    `years` before `end` (default: the latest published session); `gap_probability`
+    drops random bars. With `tickers`, any other symbol is reported as failed.
+    """
+
+    EPOCH = date(1990, 1, 2)
+
+    def __init__(
+        self,
+        seed: Optional[int] = None,
+        years: Optional[float] = None,
+        gap_probability: Optional[float] = None,
+        end: Optional[date] = None,
+        tickers: Optional[Iterable[str]] = None,
+    ):
+        self.seed = market_data_synthetic_seed() if seed is None else int(seed)
+        self.years = market_data_synthetic_years() if years is None else float(years)
+        self.gap_probability = market_data_synthetic_gap_probability() if gap_probability is None else float(gap_probability)
+        self.end = end
+        self.tickers = {str(ticker).upper() for ticker in tickers} if tickers is not None else None
+        self._lock = threading.Lock()
+        self._series: Dict[Tuple[str, date], pd.Series] = {}
+        self._calendars: Dict[date, pd.DatetimeIndex] = {}
+
+    def _end(self) -> date:
+        if self.end is not None:
+            return self.end
+        configured = market_data_synthetic_end()
+        if configured:
+            try:
+                return date.fromisoformat(configured)
+            except ValueError:
+                pass
+        return latest_session_date()
+
+    def _sessions(self, end: date) -> pd.DatetimeIndex:
+        sessions = self._calendars.get(end)
+        if sessions is None:
+            days = pd.bdate_range(self.EPOCH, end)
+            holidays = set()
+            for year in range(self.EPOCH.year, end.year + 1):
+                holidays.update(exchange_holidays(year))
+            sessions = days[~days.isin(pd.DatetimeIndex(sorted(holidays)))]
+            self._calendars[end] = sessions
+        return sessions
+
+    def series(self, ticker: str) -> pd.Series:
+        """Return the ticker's full synthetic history up to the end session."""
+        end = self._end()
+        key = (ticker, end)
+        with self._lock:
+            cached = self._series.get(key)
+        if cached is not None:
+            return cached
+
+        sessions = self._sessions(end)
+        rng = np.random.default_rng([self.seed & 0xFFFFFFFF, zlib.crc32(ticker.encode("utf-8"))])
+        drift = rng.uniform(0.02, 0.12)
+        volatility = rng.uniform(0.08, 0.35)
+        start_price = rng.uniform(20.0, 300.0)
+        shocks = rng.standard_normal(len(sessions))
+        log_returns = (drift - 0.5 * volatility**2) / 252.0 + volatility / np.sqrt(252.0) * shocks
+        closes = start_price * np.exp(np.cumsum(log_returns))
+        if self.gap_probability > 0:
+            closes[rng.random(len(sessions)) < self.gap_probability] = np.nan
+
+        series = pd.Series(closes, index=sessions, name=ticker).dropna()
+        series.index.name = "Date"
+        first = pd.Timestamp(end) - pd.Timedelta(days=int(round(self.years * 365.25)))
+        series = series.loc[first:]
+        with self._lock:
+            self._series[key] = series
+        return series
+
+    def fetch(self, tickers, start_date, end_date):
+        unique = list(dict.fromkeys(tickers))
+        start = pd.Timestamp(start_date).normalize()
+        end = pd.Timestamp(end_date).normalize()
+        series_by_ticker: Dict[str, pd.Series] = {}
+        failed: List[str] = []
+        for ticker in unique:
+            if self.tickers is not None and ticker.upper() not in self.tickers:
+                failed.append(ticker)
+                continue
+            closes = self.series(ticker).loc[start:end]
+            if closes.empty:
+                failed.append(ticker)
+            else:
+                series_by_ticker[ticker] = closes
+        return _frame(series_by_ticker, unique), failed
+
+
+_PROVIDER: Optional[PriceProvider] = None
+_PROVIDER_LOCK = threading.Lock()
+
+
+def _build_provider() -> PriceProvider:
+    name = market_data_provider_name()
+    if name == "replay":
+        return ReplayProvider()
+    if name == "record":
+        return ReplayProvider(record=True)
+    if name == "synthetic":
+        return SyntheticProvider()
+    return NetworkProvider()
+
+
+def get_price_provider() -> PriceProvider:
+    """Return the process-wide provider, chosen by MARKET_DATA_PROVIDER on first use."""
+    global _PROVIDER
+    if _PROVIDER is None:
+        with _PROVIDER_LOCK:
+            if _PROVIDER is None:
+                _PROVIDER = _build_provider()
+    return _PROVIDER
+
+
+def set_price_provider(provider: Optional[PriceProvider]):
+    """
+    Replace the provider (e.g. `SyntheticProvider(seed=1)` in a benchmark).
+
+    The in-process price cache is cleared so series from the previous provider are not
+    served; passing None rebuilds the provider from the environment on next use.
+    """
+    global _PROVIDER
+    from .memory import price_cache_clear
+
+    with _PROVIDER_LOCK:
+        _PROVIDER = provider
+    price_cache_clear()
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import threading
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .config import (
+    market_data_backoff_seconds,
+    market_data_max_workers,
+    market_data_retries,
+    market_data_timeouts,
+)
+
+_SESSION: Optional[requests.Session] = None
+_SESSION_LOCK = threading.Lock()
+
+
+class PooledSession(requests.Session):
+    """
+    Keep-alive session shared by all market-data downloads in this process.
+
+    pandas_datareader closes the session it is given after every read, which would
+    drop the pooled connections (and their TLS handshakes), so `close()` is a no-op
+    here and `shutdown()` releases the pool for real. Requests without a timeout of
+    their own get the configured (connect, read) timeouts.
+    """
+
+    def __init__(self, timeout: tuple | None = None):
+        super().__init__()
+        self.timeout = timeout or market_data_timeouts()
+
+    def request(self, method, url, **kwargs):
+        # Only a default: an explicit timeout from the caller wins, None means unset.
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.timeout
+        return super().request(method, url, **kwargs)
+
+    def close(self):
+        return None
+
+    def shutdown(self):
+        super().close()
+
+
+def _build_session() -> PooledSession:
+    session = PooledSession()
+    retries = Retry(
+        total=market_data_retries(),
+        backoff_factor=market_data_backoff_seconds(),
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset({"GET", "HEAD"}),
+        raise_on_status=False,
+    )
+    pool_size = max(10, market_data_max_workers())
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retries)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_http_session() -> requests.Session:
+    """Return the process-wide market-data session, creating it on first use."""
+    global _SESSION
+    if _SESSION is None:
+        with _SESSION_LOCK:
+            if _SESSION is None:
+                _SESSION = _build_session()
+    return _SESSION
+
+
+def set_http_session(session: Optional[requests.Session]):
+    """
+    Replace the shared session (e.g. one with an adapter mounted for a local stub server).
+
+    Passing None discards the current session so the next download builds a fresh one.
+    """
+    global _SESSION
+    with _SESSION_LOCK:
+        previous = _SESSION
+        _SESSION = session
+    if isinstance(previous, PooledSession) and previous is not session:
+        previous.shutdown()
@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Iterable, List, Tuple
+
+import pandas as pd
+
+from tracing import span
+
+from .config import market_data_max_workers, market_data_rate_limit, market_data_timeouts
+from .session import get_http_session
+
+
+def _pandas_datareader():
+    # Imported on first network fetch: the data source libraries are slow to import and
+    # requests served from the price caches never need them.
+    from pandas_datareader import data
+
+    return data
+
+
+def _yfinance():
+    import yfinance
+
+    return yfinance
+
+
+def download_from_sources(
+    tickers: Iterable[str],
+    start_date: datetime,
+    end_date: datetime,
+) -> Tuple[pd.DataFrame, List[str]]:
+    """
+    Download daily close prices for tickers from the network.
+
+    Tries Stooq first (often more reliable in restricted environments), then
+    falls back to a single Yahoo Finance batch download for missing tickers.
+
+    Returns:
+      - price_data: DataFrame indexed by date, columns are ticker symbols, values are closes
+      - failed: list of tickers that could not be downloaded from either source
+    """
+    tickers_list = list(tickers)
+    with span("stooq"):
+        price_data, failed = _download_stooq(tickers_list, start_date, end_date)
+
+    missing = [t for t in tickers_list if t not in price_data.columns]
+    if missing:
+        with span("yahoo"):
+            yahoo_price, yahoo_failed = _download_yahoo_batch(missing, start_date, end_date)
+        failed.extend(yahoo_failed)
+        if not yahoo_price.empty:
+            price_data = pd.concat([price_data, yahoo_price], axis=1)
+
+    return price_data, failed
+
+
+class _RateLimiter:
+    """Space out request starts for one source across all worker threads."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def wait(self, per_second: float):
+        if per_second <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + 1.0 / per_second
+        if slot > now:
+            time.sleep(slot - now)
+
+
+# Module-level so the cap holds across calls within a warm Lambda container / Flask worker.
+_RATE_LIMITERS = {"stooq": _RateLimiter(), "yahoo": _RateLimiter()}
+
+
+def _fetch_stooq_close(ticker: str, start_date: datetime, end_date: datetime):
+    """Fetch one ticker from Stooq and return its close series, or None on failure."""
+    # Stooq symbols for US ETFs typically use the ".US" suffix (e.g., SPY.US).
+    symbol = ticker if "." in ticker else f"{ticker}.US"
+    _RATE_LIMITERS["stooq"].wait(market_data_rate_limit("stooq"))
+    try:
+        # Retries/backoff are handled by the shared session's adapter.
+        df = _pandas_datareader().DataReader(
+            symbol,
+            "stooq",
+            start=start_date,
+            end=end_date,
+            retry_count=0,
+            session=get_http_session(),
+        )
+    except Exception:
+        return None
+
+    if df is None or df.empty or "Close" not in df.columns:
+        return None
+
+    df = df.sort_index()
+    return df["Close"].rename(ticker)
+
+
+def _download_stooq(
+    tickers: List[str],
+    start_date: datetime,
+    end_date: datetime,
+) -> Tuple[pd.DataFrame, List[str]]:
+    workers = min(market_data_max_workers(), len(tickers))
+    if workers > 1:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(lambda ticker: _fetch_stooq_close(ticker, start_date, end_date), tickers))
+    else:
+        results = [_fetch_stooq_close(ticker, start_date, end_date) for ticker in tickers]
+
+    # Results come back in request order, so columns and failures match the sequential path.
+    series_by_ticker = {}
+    failed: List[str] = []
+    for ticker, series in zip(tickers, results):
+        if series is None:
+            failed.append(ticker)
+            continue
+        series_by_ticker[ticker] = series
+
+    if not series_by_ticker:
+        return pd.DataFrame(), failed
+
+    return pd.concat(series_by_ticker.values(), axis=1), failed
+
+
+def _download_yahoo_batch(
+    tickers: List[str],
+    start_date: datetime,
+    end_date: datetime,
+) -> Tuple[pd.DataFrame, List[str]]:
+    # Yahoo download in one request reduces the chance of partial failures and is faster.
+    failed: List[str] = []
+    _RATE_LIMITERS["yahoo"].wait(market_data_rate_limit("yahoo"))
+
+    batch_data = _yfinance().download(
+        tickers,
+        start=start_date,
+        end=end_date,
+        progress=False,
+        threads=True,
+        ignore_tz=True,
+        timeout=market_data_timeouts()[1],
+        session=get_http_session(),
+    )
+
+    if batch_data is None or batch_data.empty:
+        return pd.DataFrame(), tickers
+
+    if isinstance(batch_data.columns, pd.MultiIndex):
+        if "Close" not in batch_data.columns.levels[0]:
+            return pd.DataFrame(), tickers
+        price_data = batch_data["Close"]
+    else:
+        if "Close" in batch_data.columns:
+            price_data = batch_data[["Close"]]
+            price_data.columns = [tickers[0]]
+        else:
+            price_data = batch_data
+
+    for ticker in tickers:
+        if ticker not in price_data.columns:
+            failed.append(ticker)
+
+    return price_data, failed
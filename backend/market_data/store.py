@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import os
+import re
+import tempfile
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from .config import price_store_dir
+
+
+@dataclass
+class StoredPrices:
+    """
+    Close prices persisted for one ticker.
+
+    `covered_start`/`covered_end` record the calendar range that has already been
+    requested from the network (which may contain weekends/holidays without bars),
+    and `checked_at` is the epoch second of the latest top-up of that range.
+    """
+
+    closes: pd.Series
+    covered_start: pd.Timestamp
+    covered_end: pd.Timestamp
+    checked_at: int
+
+
+def _store_path(ticker: str) -> str:
+    safe = re.sub(r"[^A-Za-z0-9._-]", "_", str(ticker).upper())
+    return os.path.join(price_store_dir(), f"{safe}.npz")
+
+
+def price_store_load(ticker: str) -> Optional[StoredPrices]:
+    """Load a ticker from the local price store; missing or unreadable files are misses."""
+    path = _store_path(ticker)
+    if not os.path.exists(path):
+        return None
+
+    try:
+        with np.load(path, allow_pickle=False) as data:
+            dates = data["dates"]
+            closes = data["closes"]
+            coverage = data["coverage"]
+    except Exception:
+        return None
+
+    if len(coverage) != 3 or len(dates) != len(closes):
+        return None
+
+    index = pd.DatetimeIndex(dates.astype("datetime64[ns]"), name="Date")
+    return StoredPrices(
+        closes=pd.Series(closes.astype("float64"), index=index, name=ticker),
+        covered_start=pd.Timestamp(int(coverage[0])),
+        covered_end=pd.Timestamp(int(coverage[1])),
+        checked_at=int(coverage[2]),
+    )
+
+
+def price_store_save(ticker: str, stored: StoredPrices) -> bool:
+    """Persist a ticker atomically; failures (e.g. read-only disk) are intentionally ignored."""
+    directory = price_store_dir()
+    closes = stored.closes.dropna().sort_index()
+    tmp_path = None
+    try:
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".npz.tmp")
+        with os.fdopen(fd, "wb") as handle:
+            np.savez(
+                handle,
+                dates=closes.index.values.astype("datetime64[ns]").astype("int64"),
+                closes=closes.values.astype("float64"),
+                coverage=np.array(
+                    [stored.covered_start.value, stored.covered_end.value, int(stored.checked_at)],
+                    dtype="int64",
+                ),
+            )
+        os.replace(tmp_path, _store_path(ticker))
+        return True
+    except Exception:
+        if tmp_path:
+            try:
+                os.remove(tmp_path)
+            except Exception:
+                pass
+        return False
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+from datetime import date, datetime, time, timedelta, timezone
+from functools import lru_cache
+
+from .config import market_data_publish_delay_minutes, market_data_window_pad_days
+
+try:
+    from zoneinfo import ZoneInfo
+
+    _EXCHANGE_TZ = ZoneInfo("America/New_York")
+except Exception:  # pragma: no cover - tz database missing
+    _EXCHANGE_TZ = None
+
+# Rule-based NYSE calendar (US ETF universe) using only the standard library, so cache
+# keys can be computed without importing pandas. Covers regular full-day holidays and
+# the 1pm early closes; one-off closures (e.g. national days of mourning) are not modeled.
+
+REGULAR_CLOSE = time(16, 0)
+EARLY_CLOSE = time(13, 0)
+
+
+def _nth_weekday(year: int, month: int, weekday: int, n: int) -> date:
+    first = date(year, month, 1)
+    offset = (weekday - first.weekday()) % 7
+    return first + timedelta(days=offset + 7 * (n - 1))
+
+
+def _last_weekday(year: int, month: int, weekday: int) -> date:
+    last = (date(year, month + 1, 1) if month < 12 else date(year + 1, 1, 1)) - timedelta(days=1)
+    return last - timedelta(days=(last.weekday() - weekday) % 7)
+
+
+def _easter(year: int) -> date:
+    # Anonymous Gregorian algorithm.
+    a = year % 19
+    b, c = divmod(year, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return date(year, month, day + 1)
+
+
+def _observed(day: date) -> date:
+    if day.weekday() == 5:
+        return day - timedelta(days=1)
+    if day.weekday() == 6:
+        return day + timedelta(days=1)
+    return day
+
+
+@lru_cache(maxsize=None)
+def exchange_holidays(year: int) -> frozenset:
+    """Return NYSE full-day holidays for a year."""
+    holidays = set()
+    new_year = date(year, 1, 1)
+    if new_year.weekday() == 6:
+        holidays.add(new_year + timedelta(days=1))
+    elif new_year.weekday() != 5:  # Saturday New Year's Day is not observed on Dec 31
+        holidays.add(new_year)
+    if year >= 1998:
+        holidays.add(_nth_weekday(year, 1, 0, 3))  # Martin Luther King Jr. Day
+    holidays.add(_nth_weekday(year, 2, 0, 3))  # Washington's Birthday
+    holidays.add(_easter(year) - timedelta(days=2))  # Good Friday
+    holidays.add(_last_weekday(year, 5, 0))  # Memorial Day
+    if year >= 2022:
+        holidays.add(_observed(date(year, 6, 19)))  # Juneteenth
+    holidays.add(_observed(date(year, 7, 4)))  # Independence Day
+    holidays.add(_nth_weekday(year, 9, 0, 1))  # Labor Day
+    holidays.add(_nth_weekday(year, 11, 3, 4))  # Thanksgiving
+    holidays.add(_observed(date(year, 12, 25)))  # Christmas
+    return frozenset(holidays)
+
+
+def is_trading_day(day: date) -> bool:
+    return day.weekday() < 5 and day not in exchange_holidays(day.year)
+
+
+def previous_trading_day(day: date) -> date:
+    """Return the last trading day strictly before `day`."""
+    day -= timedelta(days=1)
+    while not is_trading_day(day):
+        day -= timedelta(days=1)
+    return day
+
+
+def next_trading_day(day: date) -> date:
+    """Return the first trading day strictly after `day`."""
+    day += timedelta(days=1)
+    while not is_trading_day(day):
+        day += timedelta(days=1)
+    return day
+
+
+def session_close_time(day: date) -> time:
+    """Return the local (New York) close time of a trading day, including 1pm early closes."""
+    thanksgiving = _nth_weekday(day.year, 11, 3, 4)
+    early = {thanksgiving + timedelta(days=1), date(day.year, 12, 24)}
+    if date(day.year, 7, 4).weekday() in (1, 2, 3, 4):  # July 3 early close only when July 4 is Tue-Fri
+        early.add(date(day.year, 7, 3))
+    return EARLY_CLOSE if day in early else REGULAR_CLOSE
+
+
+def session_close_utc(day: date) -> datetime:
+    local_close = datetime.combine(day, session_close_time(day))
+    if _EXCHANGE_TZ is not None:
+        return local_close.replace(tzinfo=_EXCHANGE_TZ).astimezone(timezone.utc)
+    return (local_close + timedelta(hours=5)).replace(tzinfo=timezone.utc)
+
+
+def session_published_utc(day: date) -> datetime:
+    """Return when a session's daily bar is assumed available: its close plus the publish delay."""
+    return session_close_utc(day) + timedelta(minutes=market_data_publish_delay_minutes())
+
+
+def latest_session_date(now: datetime | None = None) -> date:
+    """
+    Return the trading day of the newest daily bar that can exist at `now` (UTC).
+
+    A session counts once its close plus the publish delay has passed, so the value
+    stays constant over nights, weekends and holidays and changes only when a new
+    bar can actually be downloaded.
+    """
+    now = now or datetime.now(timezone.utc)
+    if now.tzinfo is None:
+        now = now.replace(tzinfo=timezone.utc)
+
+    day = now.astimezone(_EXCHANGE_TZ).date() if _EXCHANGE_TZ is not None else now.date()
+    if not is_trading_day(day):
+        day = previous_trading_day(day)
+    while session_published_utc(day) > now:
+        day = previous_trading_day(day)
+    return day
+
+
+def next_session_rotation_utc(now: datetime | None = None) -> datetime:
+    """Return when `latest_session_date()` next changes: the next session's close plus the publish delay."""
+    return session_published_utc(next_trading_day(latest_session_date(now)))
+
+
+def sessions_back(day: date, count: int) -> date:
+    """Return the earliest day of the shortest range ending at `day` that holds `count` trading sessions."""
+    if not is_trading_day(day):
+        day = previous_trading_day(day)
+    for _ in range(max(1, int(count)) - 1):
+        day = previous_trading_day(day)
+    return day
+
+
+def trading_days_window(trading_days: int, end_date: datetime | None = None, as_of: date | None = None) -> tuple:
+    """
+    Return (start_date, end_date) datetimes whose range holds `trading_days` daily bars.
+
+    Bars are counted back from `as_of` (default: the latest session published by
+    `end_date`, itself defaulting to now in UTC), plus MARKET_DATA_WINDOW_PAD_DAYS so
+    unmodeled closures or a bar missing at the source do not leave the caller short.
+    """
+    end_date = end_date or datetime.utcnow()
+    if as_of is None:
+        as_of = latest_session_date(end_date.replace(tzinfo=timezone.utc) if end_date.tzinfo is None else end_date)
+    start_day = sessions_back(as_of, int(trading_days) + market_data_window_pad_days())
+    return datetime.combine(start_day, time()), end_date
@@ -1,13 +1,26 @@
-from .runner import (
-    compute_and_store_for_strategy,
-    run_daily_performance_refresh,
-    run_monthly_performance_refresh,
-)
-from .store import performance_get_metrics
-
-__all__ = [
-    "compute_and_store_for_strategy",
-    "performance_get_metrics",
-    "run_daily_performance_refresh",
-    "run_monthly_performance_refresh",
-]
+from importlib import import_module
+
+# Re-exported lazily (PEP 562): reading stored snapshots must not load the backtest
+# engine, pandas or the market data sources on a Lambda cold start.
+_EXPORTS = {
+    "compute_and_store_for_strategy": ".runner",
+    "performance_get_metrics": ".store",
+    "run_daily_performance_refresh": ".runner",
+    "run_monthly_performance_refresh": ".runner",
+    "run_parameter_sweep": ".sweep",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
@@ -1,13 +1,15 @@
 from __future__ import annotations
 
+import hashlib
 import math
-from datetime import datetime, timedelta
 
+import numpy as np
 import pandas as pd
 
 from market_data import download_close_prices
+from market_data.trading_calendar import latest_session_date, trading_days_window
 
-from .config import performance_backtest_months, performance_lookback_days
+from .config import performance_backtest_months, performance_engine_mode, performance_lookback_days
 
 
 def _clean_weights(weights: dict) -> dict:
@@ -39,29 +41,209 @@ def _monthly_prices(prices: pd.DataFrame) -> pd.DataFrame:
     return prices.resample("ME").last().dropna(how="all")
 
 
-def run_monthly_walkforward_backtest(spec, parameters: dict | None = None) -> dict:
+def _compute_decisions(spec, prices: pd.DataFrame, rebalance_dates: list, params: dict) -> list:
+    """
+    Return one weight decision per rebalance date.
+
+    Specs with a batch implementation compute all dates in one pass over the price
+    matrix; otherwise (or with PERFORMANCE_ENGINE=loop) fall back to slicing the
+    history and calling `compute_weights` once per month.
+    """
+    if performance_engine_mode() == "vectorized":
+        decisions = spec.compute_weights_batch(prices, rebalance_dates, params)
+        if decisions is not None and len(decisions) == len(rebalance_dates):
+            return list(decisions)
+
+    return [spec.compute_weights(prices.loc[:as_of], params) for as_of in rebalance_dates]
+
+
+def _date_key(value) -> str:
+    return pd.Timestamp(value).strftime("%Y-%m-%d")
+
+
+def _complete_period_dates(periods: list[dict], price_as_of) -> list[str]:
+    """Rebalance dates of periods whose end month had closed in the data they used."""
+    cutoff = _date_key(price_as_of)
+    dates = []
+    for period in periods:
+        if period["next_as_of"] <= cutoff:
+            dates.extend([period["as_of"], period["next_as_of"]])
+    return sorted(set(dates))
+
+
+def _data_fingerprint(monthly: pd.DataFrame, dates: list[str]) -> str:
+    """Hash the month-end prices at `dates`; revised history (e.g. re-adjusted closes) changes it."""
+    frame = monthly.reindex(pd.DatetimeIndex(dates))
+    values = np.nan_to_num(np.round(frame.to_numpy(dtype="float64"), 6), nan=-1.0)
+    digest = hashlib.sha256()
+    digest.update(",".join(map(str, frame.columns)).encode("utf-8"))
+    digest.update(",".join(dates).encode("utf-8"))
+    digest.update(values.tobytes())
+    return digest.hexdigest()[:16]
+
+
+def _reusable_periods(spec, params: dict, previous: dict | None, monthly: pd.DataFrame) -> dict:
+    """Return completed periods from a previous run keyed by `as_of`, or {} when a full recompute is needed."""
+    if not isinstance(previous, dict):
+        return {}
+    if previous.get("strategy_version") != spec.strategy_version or previous.get("parameters") != params:
+        return {}
+
+    periods = previous.get("periods")
+    price_as_of = previous.get("price_as_of")
+    if not isinstance(periods, list) or not price_as_of:
+        return {}
+
+    try:
+        complete = [period for period in periods if period["next_as_of"] <= price_as_of]
+        dates = _complete_period_dates(complete, price_as_of)
+    except (KeyError, TypeError):
+        return {}
+    if not complete or _data_fingerprint(monthly, dates) != previous.get("data_fingerprint"):
+        return {}
+    return {period["as_of"]: period for period in complete}
+
+
+def _simulate_periods(spec, params: dict, prices: pd.DataFrame, monthly: pd.DataFrame, pairs: list, missing: list) -> dict:
+    """Compute weights and returns for (as_of, next_as_of) pairs; returns {"periods": {...}} or an error."""
+    if not pairs:
+        return {"periods": {}}
+
+    decision_dates = [as_of for as_of, _ in pairs]
+    decisions = _compute_decisions(spec, prices, decision_dates, params)
+
+    weights_by_period = []
+    for as_of, decision in zip(decision_dates, decisions):
+        if not isinstance(decision, dict):
+            return {"error": f"{spec.strategy_id} decision is invalid at {as_of.date()}", "missing_tickers": missing}
+        if "error" in decision:
+            return {
+                "error": f"{spec.strategy_id} failed at {as_of.date()}: {decision['error']}",
+                "missing_tickers": missing,
+            }
+
+        raw_weights = _clean_weights(decision.get("allocation_weights"))
+        if not raw_weights:
+            return {
+                "error": f"{spec.strategy_id} returned empty/invalid weights at {as_of.date()}",
+                "missing_tickers": missing,
+            }
+        weights_by_period.append(raw_weights)
+
+    # Period returns as matrix operations: rows are periods, columns are tickers.
+    columns = list(monthly.columns)
+    column_pos = {ticker: pos for pos, ticker in enumerate(columns)}
+    start_matrix = monthly.loc[decision_dates].to_numpy(dtype="float64")
+    end_matrix = monthly.loc[[next_as_of for _, next_as_of in pairs]].to_numpy(dtype="float64")
+    weight_matrix = np.zeros_like(start_matrix)
+    for row, raw_weights in enumerate(weights_by_period):
+        for ticker, weight in raw_weights.items():
+            if ticker in column_pos:
+                weight_matrix[row, column_pos[ticker]] = weight
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        valid_path = ~np.isnan(start_matrix) & ~np.isnan(end_matrix) & (start_matrix > 0)
+        asset_returns = np.where(valid_path, end_matrix / start_matrix - 1.0, 0.0)
+    weight_matrix = np.where(valid_path, weight_matrix, 0.0)
+    weight_totals = weight_matrix.sum(axis=1)
+
+    for row, total in enumerate(weight_totals):
+        if total <= 0:
+            return {
+                "error": f"No valid price path for weighted assets at {decision_dates[row].date()}",
+                "missing_tickers": missing,
+            }
+
+    normalized_matrix = weight_matrix / weight_totals[:, None]
+    period_returns = (normalized_matrix * asset_returns).sum(axis=1)
+    periods = {}
+    for row, ((as_of, next_as_of), raw_weights) in enumerate(zip(pairs, weights_by_period)):
+        periods[_date_key(as_of)] = {
+            "as_of": _date_key(as_of),
+            "next_as_of": _date_key(next_as_of),
+            "period_return": float(period_returns[row]),
+            "weights": {
+                ticker: round(float(normalized_matrix[row, column_pos[ticker]]), 6)
+                for ticker in raw_weights
+                if ticker in column_pos and normalized_matrix[row, column_pos[ticker]] > 0
+            },
+        }
+    return {"periods": periods}
+
+
+def backtest_window(spec, months: int | None = None, parameters: dict | None = None) -> tuple[int, int]:
+    """Return (months, min_lookback_days) used for a spec's walk-forward backtest with `parameters`."""
+    months = max(1, int(months if months is not None else performance_backtest_months()))
+    params = spec.normalize_parameters(parameters or spec.default_parameters())
+    min_lookback_days = max(int(spec.lookback_days(params)), int(performance_lookback_days()))
+    return months, min_lookback_days
+
+
+def download_backtest_prices(universe: list[str], months: int, min_lookback_days: int):
+    """
+    Download the least daily history covering `months` rebalance periods plus the lookback.
+
+    The earliest rebalance is the month-end `months` months before the latest published
+    session; it needs `min_lookback_days` trading days at or before it, and the month
+    before it supplies the extra monthly point.
+    """
+    latest = pd.Timestamp(latest_session_date())
+    first_rebalance = latest + pd.offsets.MonthEnd(0) - pd.offsets.MonthEnd(months)
+    start_date, end_date = trading_days_window(
+        min_lookback_days,
+        as_of=min(first_rebalance, latest).date(),
+    )
+    previous_month_start = (first_rebalance - pd.offsets.MonthBegin(2)).to_pydatetime()
+    return download_close_prices(universe, min(start_date, previous_month_start), end_date)
+
+
+def run_monthly_walkforward_backtest(spec, parameters: dict | None = None, previous: dict | None = None) -> dict:
     """
     Shared monthly walk-forward backtest engine.
 
     For each monthly rebalance date:
     - Use history up to that date to compute weights
     - Apply weights over the next monthly period
+
+    See `run_backtest_on_prices` for how `previous` enables incremental runs.
     """
     params = spec.normalize_parameters(parameters or spec.default_parameters())
     universe = spec.universe(params)
     if not universe:
         return {"error": "Strategy universe is empty"}
 
-    months = max(1, int(performance_backtest_months()))
-    min_lookback_days = max(int(spec.min_lookback_days), int(performance_lookback_days()))
-    fetch_days = min_lookback_days + (months + 2) * 31 + 45
+    months, min_lookback_days = backtest_window(spec, parameters=params)
+    prices, failed = download_backtest_prices(universe, months, min_lookback_days)
+    return run_backtest_on_prices(spec, params, prices, failed, months, min_lookback_days, previous)
 
-    end_date = datetime.utcnow()
-    start_date = end_date - timedelta(days=fetch_days)
-    prices, failed = download_close_prices(universe, start_date, end_date)
+
+def run_backtest_on_prices(
+    spec,
+    params: dict,
+    prices: pd.DataFrame,
+    failed: list[str],
+    months: int,
+    min_lookback_days: int,
+    previous: dict | None = None,
+) -> dict:
+    """
+    Run the walk-forward simulation on already-downloaded prices (no network I/O).
+
+    `prices` may hold more tickers than the spec universe (e.g. a shared sweep or
+    refresh panel); only the universe columns are used.
+
+    `previous` is the `state` of an earlier run. Its completed periods are reused when
+    the strategy version, parameters and a fingerprint of the month-end prices they
+    were computed from still match, so only newly completed months are simulated.
+    """
+    universe = spec.universe(params)
+    if not universe:
+        return {"error": "Strategy universe is empty"}
+    failed = [ticker for ticker in (failed or []) if ticker in universe]
     if prices is None or prices.empty:
         return {"error": "No price data available", "missing_tickers": sorted(set(failed))}
 
+    prices = prices[[ticker for ticker in universe if ticker in prices.columns]]
     prices = prices.sort_index().ffill().dropna(axis=1, how="all")
     available = [ticker for ticker in universe if ticker in prices.columns]
     missing = sorted(set(failed + [ticker for ticker in universe if ticker not in available]))
@@ -76,11 +258,9 @@ def run_monthly_walkforward_backtest(spec, parameters: dict | None = None) -> di
             "missing_tickers": missing,
         }
 
-    eligible_rebalance = []
-    for date in monthly.index:
-        history = prices.loc[:date]
-        if len(history) >= min_lookback_days:
-            eligible_rebalance.append(date)
+    # Trading rows available up to each month-end label, in one vectorized lookup.
+    history_lengths = prices.index.searchsorted(monthly.index, side="right")
+    eligible_rebalance = list(monthly.index[history_lengths >= min_lookback_days])
 
     if len(eligible_rebalance) < months + 1:
         return {
@@ -92,63 +272,30 @@ def run_monthly_walkforward_backtest(spec, parameters: dict | None = None) -> di
         }
 
     rebalance_points = eligible_rebalance[-(months + 1) :]
-    period_returns = []
-    period_details = []
-
-    for i in range(len(rebalance_points) - 1):
-        as_of = rebalance_points[i]
-        next_as_of = rebalance_points[i + 1]
-
-        history = prices.loc[:as_of]
-        decision = spec.compute_weights(history, params)
-        if not isinstance(decision, dict):
-            return {"error": f"{spec.strategy_id} decision is invalid at {as_of.date()}", "missing_tickers": missing}
-        if "error" in decision:
-            return {
-                "error": f"{spec.strategy_id} failed at {as_of.date()}: {decision['error']}",
-                "missing_tickers": missing,
-            }
-
-        raw_weights = _clean_weights(decision.get("allocation_weights"))
-        if not raw_weights:
-            return {
-                "error": f"{spec.strategy_id} returned empty/invalid weights at {as_of.date()}",
-                "missing_tickers": missing,
-            }
-
-        start_prices = monthly.loc[as_of]
-        end_prices = monthly.loc[next_as_of]
-        valid_tickers = []
-        for ticker in raw_weights.keys():
-            if ticker not in monthly.columns:
-                continue
-            start_price = start_prices.get(ticker)
-            end_price = end_prices.get(ticker)
-            if pd.isna(start_price) or pd.isna(end_price) or float(start_price) <= 0:
-                continue
-            valid_tickers.append(ticker)
-
-        if not valid_tickers:
-            return {
-                "error": f"No valid price path for weighted assets at {as_of.date()}",
-                "missing_tickers": missing,
-            }
-
-        normalized = _clean_weights({ticker: raw_weights[ticker] for ticker in valid_tickers})
-        period_return = 0.0
-        for ticker, weight in normalized.items():
-            ticker_return = float(end_prices[ticker] / start_prices[ticker] - 1.0)
-            period_return += weight * ticker_return
-
-        period_returns.append(float(period_return))
-        period_details.append(
-            {
-                "as_of": as_of.strftime("%Y-%m-%d"),
-                "next_as_of": next_as_of.strftime("%Y-%m-%d"),
-                "period_return": round(float(period_return), 6),
-                "weights": {ticker: round(float(weight), 6) for ticker, weight in normalized.items()},
-            }
-        )
+    price_as_of = prices.index[-1]
+    reusable = _reusable_periods(spec, params, previous, monthly)
+
+    # Only periods that are not carried over from the previous snapshot are simulated.
+    pending = [
+        (as_of, next_as_of)
+        for as_of, next_as_of in zip(rebalance_points[:-1], rebalance_points[1:])
+        if _date_key(as_of) not in reusable or reusable[_date_key(as_of)]["next_as_of"] != _date_key(next_as_of)
+    ]
+    computed = _simulate_periods(spec, params, prices, monthly, pending, missing)
+    if "error" in computed:
+        return computed
+
+    periods_by_as_of = {**reusable, **computed["periods"]}
+    periods = [periods_by_as_of[_date_key(as_of)] for as_of in rebalance_points[:-1]]
+    period_returns = [float(period["period_return"]) for period in periods]
+    complete_dates = _complete_period_dates(periods, price_as_of)
+    state = {
+        "price_as_of": _date_key(price_as_of),
+        "data_fingerprint": _data_fingerprint(monthly, complete_dates),
+        "periods_reused": len(periods) - len(pending),
+        "periods_computed": len(pending),
+        "periods": periods,
+    }
 
     if not period_returns:
         return {"error": "No backtest periods were produced", "missing_tickers": missing}
@@ -201,4 +348,4 @@ def run_monthly_walkforward_backtest(spec, parameters: dict | None = None) -> di
         metrics["max_drawdown_1y"] = metrics["max_drawdown_period"]
         metrics["volatility_annual"] = metrics["volatility_annualized"]
 
-    return {"metrics": metrics, "parameters": params}
+    return {"metrics": metrics, "parameters": params, "state": state}
@@ -0,0 +1,259 @@
+"""
+Scaling benchmark for the walk-forward backtest engine on synthetic universes.
+
+    python -m performance.benchmark                         # quick grid, both specs
+    python -m performance.benchmark --preset full --save bench.json
+    python -m performance.benchmark --compare bench.json    # exit 1 on regressions
+    python -m performance.benchmark --strategy vaa --tickers 500 --years 30 --months 360
+
+Each scenario runs one spec over N synthetic tickers (seeded GBM, see
+`market_data.SyntheticProvider`) and times these stages:
+
+- download: `download_backtest_prices` for the backtest window (price cache cleared)
+- compute_weights: one `compute_weights` call on `years` of history
+- compute_weights_batch: the spec's decisions for every rebalance date
+- backtest: `run_backtest_on_prices` (download + backtest = `run_monthly_walkforward_backtest`)
+
+Wall times are the best of --repeat runs; peak memory is measured with tracemalloc in a
+separate pass so it does not slow the timed runs.
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+import pandas as pd
+
+from market_data import SyntheticProvider, get_price_provider, price_cache_clear, set_price_provider
+from market_data.trading_calendar import trading_days_window
+
+from .backtest import _monthly_prices, download_backtest_prices, run_backtest_on_prices
+from .specs import get_performance_spec, list_performance_spec_ids
+
+PRESETS = {
+    "quick": {"tickers": [10, 50], "years": [1, 5], "months": [12, 60]},
+    "full": {"tickers": [10, 100, 500], "years": [1, 10, 30], "months": [12, 120, 360]},
+}
+STAGES = ("download", "compute_weights", "compute_weights_batch", "backtest")
+
+# Differences below these floors are treated as noise when comparing to a baseline.
+_MIN_REGRESSION_MS = 10.0
+_MIN_REGRESSION_MIB = 1.0
+
+
+def synthetic_parameters(spec, tickers: int) -> dict:
+    """Return spec parameters whose universe is `tickers` synthetic symbols."""
+    symbols = [f"S{index:04d}" for index in range(max(2, int(tickers)))]
+    if spec.strategy_id == "paa":
+        # IEF is the fallback asset and always part of the universe.
+        return spec.normalize_parameters({"etfs": symbols[:-1]})
+    if spec.strategy_id == "vaa":
+        half = max(1, len(symbols) // 2)
+        return spec.normalize_parameters({"offensive_assets": symbols[:half], "defensive_assets": symbols[half:]})
+    raise ValueError(f"No synthetic universe for strategy '{spec.strategy_id}'")
+
+
+def scenario_key(strategy_id: str, tickers: int, years: int, months: int) -> str:
+    return f"{strategy_id}|tickers={tickers}|years={years}|months={months}"
+
+
+def _history(provider: SyntheticProvider, universe: list[str], years: int) -> pd.DataFrame:
+    """Return `years` x 252 trading days of closes ending at the latest session."""
+    start, end = trading_days_window(max(1, years) * 252)
+    frame, _ = provider.fetch(universe, start, end)
+    return frame
+
+
+def _stages(spec, params: dict, universe: list[str], months: int, history: pd.DataFrame):
+    """Return (stage, callable) pairs in run order; `download` feeds the later stages."""
+    min_lookback_days = int(spec.min_lookback_days)
+    state = {}
+
+    def download():
+        price_cache_clear()
+        state["prices"], state["failed"] = download_backtest_prices(universe, months, min_lookback_days)
+
+    def compute_weights():
+        return spec.compute_weights(history, params)
+
+    def compute_weights_batch():
+        prices = state["prices"].sort_index().ffill()
+        rebalance_dates = list(_monthly_prices(prices).index[-(months + 1):-1])
+        return spec.compute_weights_batch(prices, rebalance_dates, params)
+
+    def backtest():
+        result = run_backtest_on_prices(spec, params, state["prices"], state["failed"], months, min_lookback_days)
+        if "error" in result:
+            raise RuntimeError(result["error"])
+        return result
+
+    return [
+        ("download", download),
+        ("compute_weights", compute_weights),
+        ("compute_weights_batch", compute_weights_batch),
+        ("backtest", backtest),
+    ]
+
+
+def run_scenario(strategy_id: str, tickers: int, years: int, months: int, repeat: int = 3, seed: int = 0) -> dict:
+    """Benchmark one spec/universe size; returns per-stage wall_ms and peak_mib."""
+    spec = get_performance_spec(strategy_id)
+    params = synthetic_parameters(spec, tickers)
+    universe = spec.universe(params)
+
+    # Enough synthetic history for the longest of the two windows plus the lookback year.
+    provider = SyntheticProvider(seed=seed, years=max(years, months / 12.0) + 2, gap_probability=0.0)
+    previous = get_price_provider()
+    set_price_provider(provider)
+    try:
+        started = time.perf_counter()
+        for ticker in universe:
+            provider.series(ticker)
+        generate_ms = (time.perf_counter() - started) * 1000.0
+        history = _history(provider, universe, years)
+
+        stages = _stages(spec, params, universe, months, history)
+        wall_ms = {name: float("inf") for name, _ in stages}
+        for _ in range(max(1, repeat)):
+            for name, stage in stages:
+                started = time.perf_counter()
+                stage()
+                wall_ms[name] = min(wall_ms[name], (time.perf_counter() - started) * 1000.0)
+
+        peak_mib = {}
+        for name, stage in stages:
+            tracemalloc.start()
+            try:
+                stage()
+                peak_mib[name] = tracemalloc.get_traced_memory()[1] / (1024.0 * 1024.0)
+            finally:
+                tracemalloc.stop()
+    finally:
+        set_price_provider(previous)
+
+    return {
+        "key": scenario_key(strategy_id, tickers, years, months),
+        "strategy_id": strategy_id,
+        "tickers": len(universe),
+        "years": years,
+        "months": months,
+        "generate_ms": round(generate_ms, 2),
+        "stages": {
+            name: {"wall_ms": round(wall_ms[name], 3), "peak_mib": round(peak_mib[name], 3)}
+            for name in STAGES
+        },
+        "walkforward_ms": round(wall_ms["download"] + wall_ms["backtest"], 3),
+    }
+
+
+def run_benchmark(strategy_ids, tickers, years, months, repeat: int = 3, seed: int = 0) -> dict:
+    """Run every (strategy, tickers, years, months) combination; failures are reported per scenario."""
+    results = []
+    for strategy_id, n_tickers, n_years, n_months in itertools.product(strategy_ids, tickers, years, months):
+        try:
+            results.append(run_scenario(strategy_id, n_tickers, n_years, n_months, repeat=repeat, seed=seed))
+        except Exception as e:
+            results.append({"key": scenario_key(strategy_id, n_tickers, n_years, n_months), "error": str(e)})
+    return {
+        "created_at": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "repeat": repeat,
+        "seed": seed,
+        "results": results,
+    }
+
+
+def compare_to_baseline(report: dict, baseline: dict, tolerance: float = 0.25) -> list[dict]:
+    """Return stage measurements that are more than `tolerance` above the baseline."""
+    previous = {row["key"]: row for row in baseline.get("results", []) if "stages" in row}
+    regressions = []
+    for row in report.get("results", []):
+        before = previous.get(row.get("key"))
+        if before is None or "stages" not in row:
+            continue
+        for stage, measured in row["stages"].items():
+            reference = before["stages"].get(stage)
+            if not reference:
+                continue
+            for metric, floor in (("wall_ms", _MIN_REGRESSION_MS), ("peak_mib", _MIN_REGRESSION_MIB)):
+                old, new = float(reference[metric]), float(measured[metric])
+                if new > old * (1.0 + tolerance) and new - old > floor:
+                    regressions.append({
+                        "key": row["key"],
+                        "stage": stage,
+                        "metric": metric,
+                        "baseline": old,
+                        "current": new,
+                        "ratio": round(new / old, 2) if old else None,
+                    })
+    return regressions
+
+
+def _print_report(report: dict):
+    print(f"{'scenario':<44} " + " ".join(f"{stage:>22}" for stage in STAGES))
+    print(f"{'':<44} " + " ".join(f"{'ms / peak MiB':>22}" for _ in STAGES))
+    for row in report["results"]:
+        if "error" in row:
+            print(f"{row['key']:<44} ERROR: {row['error']}")
+            continue
+        cells = [f"{row['stages'][s]['wall_ms']:>11.1f} / {row['stages'][s]['peak_mib']:>8.1f}" for s in STAGES]
+        print(f"{row['key']:<44} " + " ".join(cells))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the backtest engine on synthetic universes.")
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="quick")
+    parser.add_argument("--strategy", action="append", default=[], help="spec id (repeatable, default: all)")
+    parser.add_argument("--tickers", type=int, action="append", default=[], help="universe size (repeatable)")
+    parser.add_argument("--years", type=int, action="append", default=[], help="compute_weights history (repeatable)")
+    parser.add_argument("--months", type=int, action="append", default=[], help="backtest months (repeatable)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--save", metavar="PATH", help="write the report as a JSON baseline")
+    parser.add_argument("--compare", metavar="PATH", help="compare against a saved baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown vs baseline (0.25 = 25%%)")
+    parser.add_argument("--json", action="store_true", help="print the full report as JSON")
+    args = parser.parse_args(argv)
+
+    preset = PRESETS[args.preset]
+    report = run_benchmark(
+        args.strategy or list_performance_spec_ids(),
+        args.tickers or preset["tickers"],
+        args.years or preset["years"],
+        args.months or preset["months"],
+        repeat=args.repeat,
+        seed=args.seed,
+    )
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        _print_report(report)
+
+    failures = [row for row in report["results"] if "error" in row]
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            regressions = compare_to_baseline(report, json.load(f), args.tolerance)
+        for item in regressions:
+            print(
+                f"REGRESSION: {item['key']} {item['stage']} {item['metric']} "
+                f"{item['baseline']:.1f} -> {item['current']:.1f} (x{item['ratio']})"
+            )
+        failures.extend(regressions)
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,13 @@
 import os
 
+from cache.config import BACKEND_NAMES, cache_backend_name
+
+
+def performance_backend_name() -> str:
+    """Return the performance store backend (PERFORMANCE_BACKEND, else CACHE_BACKEND)."""
+    value = os.getenv("PERFORMANCE_BACKEND", "").strip().lower()
+    return value if value in BACKEND_NAMES else cache_backend_name()
+
 
 def performance_enabled() -> bool:
     """Return whether performance snapshot features should run."""
@@ -8,7 +16,7 @@ def performance_enabled() -> bool:
         return True
     if value in {"0", "false", "no", "off"}:
         return False
-    return bool(os.getenv("AWS_LAMBDA_FUNCTION_NAME"))
+    return performance_backend_name() != "dynamodb" or bool(os.getenv("AWS_LAMBDA_FUNCTION_NAME"))
 
 
 def performance_table_name() -> str:
@@ -38,3 +46,33 @@ def performance_backtest_months() -> int:
         return int(os.getenv("PERFORMANCE_BACKTEST_MONTHS", "12"))
     except ValueError:
         return 12
+
+
+def performance_engine_mode() -> str:
+    """Return 'vectorized' (batch spec signals when supported) or 'loop' (one call per month)."""
+    value = os.getenv("PERFORMANCE_ENGINE", "vectorized").strip().lower()
+    return value if value in {"vectorized", "loop"} else "vectorized"
+
+
+def performance_sweep_workers() -> int:
+    """Return worker processes for parameter sweeps (1 = run in-process)."""
+    try:
+        return max(1, int(os.getenv("PERFORMANCE_SWEEP_WORKERS", str(os.cpu_count() or 1))))
+    except ValueError:
+        return max(1, os.cpu_count() or 1)
+
+
+def performance_refresh_workers() -> int:
+    """Return how many strategy specs are backtested concurrently during a refresh."""
+    try:
+        return max(1, int(os.getenv("PERFORMANCE_REFRESH_WORKERS", "2")))
+    except ValueError:
+        return 2
+
+
+def performance_deadline_margin_seconds() -> float:
+    """Return the Lambda time reserve below which no new strategy is started."""
+    try:
+        return max(0.0, float(os.getenv("PERFORMANCE_DEADLINE_MARGIN_SECONDS", "30")))
+    except ValueError:
+        return 30.0
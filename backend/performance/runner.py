@@ -1,9 +1,48 @@
-from .backtest import run_monthly_walkforward_backtest
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+
+from deadline import remaining_seconds
+
+from .backtest import (
+    backtest_window,
+    download_backtest_prices,
+    run_backtest_on_prices,
+    run_monthly_walkforward_backtest,
+)
+from .config import performance_deadline_margin_seconds, performance_refresh_workers
 from .specs import get_performance_spec, list_performance_spec_ids
-from .store import performance_set_metrics
+from .store import performance_get_metrics, performance_set_metrics
+
+# Backtest state (per-period weights and returns) is stored next to the public metrics
+# snapshot under its own key, so `/api/performance` never returns it.
+STATE_BUCKET = "state"
+
+
+def _previous_state(strategy_id: str) -> dict | None:
+    """Return the stored backtest state of the last snapshot, shaped for incremental runs."""
+    state = performance_get_metrics(strategy_id, STATE_BUCKET)
+    if isinstance(state, dict):
+        return state
+    # Snapshots written before the state had its own key embed it in the metrics payload.
+    payload = performance_get_metrics(strategy_id)
+    if not isinstance(payload, dict) or not isinstance(payload.get("backtest_state"), dict):
+        return None
+    return {
+        **payload["backtest_state"],
+        "strategy_version": payload.get("strategy_version"),
+        "parameters": payload.get("parameters"),
+    }
+
 
+def compute_and_store_for_strategy(strategy_id: str, prefetched=None, full: bool = False) -> dict:
+    """
+    Backtest a strategy's default parameters and persist the snapshot.
 
-def compute_and_store_for_strategy(strategy_id: str) -> dict:
+    `prefetched` is an optional (prices, failed) panel shared by a refresh run; without
+    it the strategy downloads its own universe. Unless `full` is set, periods from the
+    previous snapshot are reused and only newly completed months are simulated.
+    """
     spec = get_performance_spec(strategy_id)
     if not spec:
         return {
@@ -12,7 +51,14 @@ def compute_and_store_for_strategy(strategy_id: str) -> dict:
             "error": f"No performance spec registered for strategy '{strategy_id}'",
         }
 
-    result = run_monthly_walkforward_backtest(spec, spec.default_parameters())
+    previous = None if full else _previous_state(strategy_id)
+    if prefetched is not None:
+        prices, failed = prefetched
+        params = spec.normalize_parameters(spec.default_parameters())
+        months, min_lookback_days = backtest_window(spec, parameters=params)
+        result = run_backtest_on_prices(spec, params, prices, failed, months, min_lookback_days, previous)
+    else:
+        result = run_monthly_walkforward_backtest(spec, spec.default_parameters(), previous)
     if not isinstance(result, dict):
         return {"strategy_id": strategy_id, "ok": False, "error": "Backtest returned invalid result"}
     if "error" in result:
@@ -30,6 +76,13 @@ def compute_and_store_for_strategy(strategy_id: str) -> dict:
         "parameters": result.get("parameters", {}),
         "metrics": result.get("metrics", {}),
     }
+    state = result.get("state", {})
+    # Best-effort: without it the next run simulates every period again.
+    performance_set_metrics(
+        strategy_id,
+        {**state, "strategy_version": spec.strategy_version, "parameters": payload["parameters"]},
+        STATE_BUCKET,
+    )
     saved = performance_set_metrics(strategy_id, payload)
     if not saved:
         return {
@@ -37,26 +90,87 @@ def compute_and_store_for_strategy(strategy_id: str) -> dict:
             "ok": False,
             "error": "Failed to persist performance metrics (check DynamoDB table/IAM/env)",
         }
-    return {"strategy_id": strategy_id, "ok": True, "metrics": payload.get("metrics", {})}
+    return {
+        "strategy_id": strategy_id,
+        "ok": True,
+        "metrics": payload.get("metrics", {}),
+        "periods_reused": state.get("periods_reused", 0),
+        "periods_computed": state.get("periods_computed", 0),
+    }
+
+
+def _prefetch_panel(strategy_ids: list) -> tuple | None:
+    """Download the union of all spec universes once, sized for the longest window."""
+    universe = set()
+    months = 0
+    min_lookback_days = 0
+    for strategy_id in strategy_ids:
+        spec = get_performance_spec(strategy_id)
+        if not spec:
+            continue
+        universe.update(spec.universe(spec.default_parameters()))
+        spec_months, spec_lookback = backtest_window(spec)
+        months = max(months, spec_months)
+        min_lookback_days = max(min_lookback_days, spec_lookback)
+
+    if not universe:
+        return None
+    return download_backtest_prices(sorted(universe), months, min_lookback_days)
+
+
+def run_monthly_performance_refresh(context=None, strategy_ids=None) -> dict:
+    """
+    Refresh performance snapshots for every registered spec (or `strategy_ids`).
+
+    Specs run concurrently on one shared price panel. With a Lambda `context`, no new
+    spec is started once less than the deadline margin remains; in-flight specs are
+    allowed to finish and the rest are reported as `skipped` so a follow-up invocation
+    can pass them back in as `strategy_ids`.
+    """
+    known = list_performance_spec_ids()
+    targets = [sid for sid in (strategy_ids or known) if sid in known]
+    unknown = [sid for sid in (strategy_ids or []) if sid not in known]
+    margin = performance_deadline_margin_seconds()
+
+    remaining = remaining_seconds(context)
+    if remaining is not None and remaining < margin:
+        targets, skipped = [], list(targets)
+    else:
+        skipped = []
+
+    prefetched = _prefetch_panel(targets) if targets else None
+    results = [
+        {"strategy_id": sid, "ok": False, "error": f"No performance spec registered for strategy '{sid}'"}
+        for sid in unknown
+    ]
 
+    def run_one(strategy_id: str):
+        remaining = remaining_seconds(context)
+        if remaining is not None and remaining < margin:
+            return None
+        return compute_and_store_for_strategy(strategy_id, prefetched)
 
-def run_monthly_performance_refresh() -> dict:
-    results = []
-    for strategy_id in list_performance_spec_ids():
-        results.append(compute_and_store_for_strategy(strategy_id))
+    workers = min(performance_refresh_workers(), max(1, len(targets)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for strategy_id, result in zip(targets, pool.map(run_one, targets)):
+            if result is None:
+                skipped.append(strategy_id)
+            else:
+                results.append(result)
 
     ok_count = sum(1 for r in results if r.get("ok"))
     return {
-        "ok": ok_count == len(results),
-        "total": len(results),
+        "ok": ok_count == len(results) and not skipped,
+        "total": len(targets) + len(skipped) + len(unknown),
         "updated": ok_count,
+        "skipped": skipped,
         "results": results,
     }
 
 
-def run_daily_performance_refresh() -> dict:
+def run_daily_performance_refresh(context=None, strategy_ids=None) -> dict:
     """
     Backward-compatible alias used by existing Lambda schedule wiring.
     Internally this now runs the monthly walk-forward refresh logic.
     """
-    return run_monthly_performance_refresh()
+    return run_monthly_performance_refresh(context, strategy_ids)
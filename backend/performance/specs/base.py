@@ -29,6 +29,10 @@ class StrategyPerformanceSpec:
     def universe(self, parameters: dict) -> list[str]:
         raise NotImplementedError
 
+    def lookback_days(self, parameters: dict) -> int:
+        """Trading days of history one decision needs with `parameters` (normalized)."""
+        return int(self.min_lookback_days)
+
     def compute_weights(self, history, parameters: dict) -> dict:
         """
         Compute allocation weights as of the latest date in `history`.
@@ -45,3 +49,19 @@ class StrategyPerformanceSpec:
         """
         raise NotImplementedError
 
+    def compute_weights_batch(self, prices, rebalance_dates, parameters: dict):
+        """
+        Optional vectorized variant of `compute_weights` for many rebalance dates.
+
+        Args:
+          prices: pandas DataFrame of close prices for the whole backtest window
+          rebalance_dates: ordered index values of `prices` to decide at
+          parameters: normalized strategy parameters
+
+        Returns:
+          list of decisions (same shape as `compute_weights`), one per rebalance date,
+          computed from history up to that date only; or None when the spec has no
+          batch implementation, in which case the engine calls `compute_weights`
+          once per date.
+        """
+        return None
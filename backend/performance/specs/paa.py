@@ -1,5 +1,9 @@
 from __future__ import annotations
 
+import pandas as pd
+
+from signals import sma_momentum
+
 from .base import StrategyPerformanceSpec
 
 
@@ -59,6 +63,10 @@ class PAAPerformanceSpec(StrategyPerformanceSpec):
             etfs = list(etfs) + [self.fallback_asset]
         return sorted(dict.fromkeys(etfs))
 
+    def lookback_days(self, parameters: dict) -> int:
+        # `lookback_months` of ~21 trading days each; the default 12 months is 252 days.
+        return 21 * int(parameters.get("lookback_months", 12))
+
     @staticmethod
     def _calculate_ief_ratio(num_negative_momentum: int) -> float:
         lookup = {
@@ -72,21 +80,10 @@ class PAAPerformanceSpec(StrategyPerformanceSpec):
         }
         return float(lookup.get(num_negative_momentum, 1.0))
 
-    def compute_weights(self, history, parameters: dict) -> dict:
-        params = self.normalize_parameters(parameters)
+    def _weights_from_momentum(self, momentum, params: dict) -> dict:
         etfs = params.get("etfs") or []
         top_n = int(params.get("top_n", 6))
 
-        if history is None or history.empty:
-            return {"error": "No historical data"}
-
-        # Use a 12M moving average (252 trading days), same as runtime strategy logic.
-        if len(history) < 252:
-            return {"error": f"Insufficient data: need at least 252 days, got {len(history)}"}
-
-        rolling_avg = history.rolling(window=252).mean().iloc[-1]
-        current_price = history.iloc[-1]
-        momentum = (current_price / rolling_avg) - 1.0
         momentum = momentum.dropna()
         if momentum.empty:
             return {"error": "Unable to calculate momentum"}
@@ -120,3 +117,39 @@ class PAAPerformanceSpec(StrategyPerformanceSpec):
 
         return {"allocation_weights": normalized}
 
+    def compute_weights(self, history, parameters: dict) -> dict:
+        params = self.normalize_parameters(parameters)
+
+        if history is None or history.empty:
+            return {"error": "No historical data"}
+
+        # Moving average over `lookback_months` (252 trading days for 12M), same as runtime strategy logic.
+        window = self.lookback_days(params)
+        if len(history) < window:
+            return {"error": f"Insufficient data: need at least {window} days, got {len(history)}"}
+
+        momentum = pd.Series(sma_momentum(history, window), index=history.columns)
+        return self._weights_from_momentum(momentum, params)
+
+    def compute_weights_batch(self, prices, rebalance_dates, parameters: dict):
+        params = self.normalize_parameters(parameters)
+        if prices is None or prices.empty:
+            return [{"error": "No historical data"} for _ in rebalance_dates]
+
+        # Last trading row at or before each (possibly non-trading) month-end label.
+        positions = prices.index.searchsorted(rebalance_dates, side="right") - 1
+        # The moving average only looks backwards, so evaluating it at each position of the
+        # full matrix gives the same momentum as `compute_weights` on each history slice (up to
+        # float rounding of the prefix sums in `sma_momentum`).
+        window = self.lookback_days(params)
+        momentum_matrix = sma_momentum(prices, window, positions)
+
+        decisions = []
+        for position, row in zip(positions, momentum_matrix):
+            if position < 0:
+                decisions.append({"error": "No historical data"})
+            elif position + 1 < window:
+                decisions.append({"error": f"Insufficient data: need at least {window} days, got {position + 1}"})
+            else:
+                decisions.append(self._weights_from_momentum(pd.Series(row, index=prices.columns), params))
+        return decisions
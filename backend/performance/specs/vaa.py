@@ -1,5 +1,9 @@
 from __future__ import annotations
 
+import math
+
+from signals import weighted_momentum_score
+
 from .base import StrategyPerformanceSpec
 
 
@@ -20,7 +24,7 @@ class VAAPerformanceSpec(StrategyPerformanceSpec):
             strategy_name="VAA Aggressive (Vigilant Asset Allocation)",
             strategy_version="1",
             rebalance_frequency="monthly",
-            min_lookback_days=252,
+            min_lookback_days=253,  # the 252-day return needs 253 closes
         )
         self.default_offensive = ["SPY", "EFA", "EEM", "AGG"]
         self.default_defensive = ["LQD", "IEF", "SHY"]
@@ -30,6 +34,13 @@ class VAAPerformanceSpec(StrategyPerformanceSpec):
             "R6": 126,
             "R12": 252,
         }
+        # score = 12*R1 + 4*R3 + 2*R6 + 1*R12
+        self.score_lookbacks = [
+            (self.lookbacks["R1"], 12),
+            (self.lookbacks["R3"], 4),
+            (self.lookbacks["R6"], 2),
+            (self.lookbacks["R12"], 1),
+        ]
 
     def default_parameters(self) -> dict:
         return {
@@ -53,36 +64,11 @@ class VAAPerformanceSpec(StrategyPerformanceSpec):
         out = list(params.get("offensive_assets", [])) + list(params.get("defensive_assets", []))
         return sorted(dict.fromkeys(out))
 
-    @staticmethod
-    def _series_return(close, trading_days: int):
-        close = close.dropna()
-        if len(close) <= trading_days:
-            return None
-        return float(close.iloc[-1] / close.iloc[-(trading_days + 1)] - 1.0)
-
-    def compute_weights(self, history, parameters: dict) -> dict:
-        params = self.normalize_parameters(parameters)
+    def _weights_from_scores(self, scores: dict, params: dict) -> dict:
         offensive = params.get("offensive_assets") or []
         defensive = params.get("defensive_assets") or []
         required = list(dict.fromkeys(offensive + defensive))
 
-        if history is None or history.empty:
-            return {"error": "No historical data"}
-
-        scores = {}
-        for ticker in required:
-            if ticker not in history.columns:
-                continue
-            series = history[ticker]
-            r1 = self._series_return(series, self.lookbacks["R1"])
-            r3 = self._series_return(series, self.lookbacks["R3"])
-            r6 = self._series_return(series, self.lookbacks["R6"])
-            r12 = self._series_return(series, self.lookbacks["R12"])
-            if any(value is None for value in (r1, r3, r6, r12)):
-                continue
-            score = 12 * r1 + 4 * r3 + 2 * r6 + r12
-            scores[ticker] = float(score)
-
         if not set(required).issubset(scores.keys()):
             return {"error": "Insufficient data to score all required assets"}
 
@@ -94,3 +80,39 @@ class VAAPerformanceSpec(StrategyPerformanceSpec):
 
         return {"allocation_weights": {chosen: 1.0}}
 
+    def compute_weights(self, history, parameters: dict) -> dict:
+        params = self.normalize_parameters(parameters)
+        offensive = params.get("offensive_assets") or []
+        defensive = params.get("defensive_assets") or []
+        required = list(dict.fromkeys(offensive + defensive))
+
+        if history is None or history.empty:
+            return {"error": "No historical data"}
+
+        columns = [ticker for ticker in required if ticker in history.columns]
+        values = weighted_momentum_score(history[columns], self.score_lookbacks)
+        scores = {ticker: float(value) for ticker, value in zip(columns, values) if not math.isnan(value)}
+
+        return self._weights_from_scores(scores, params)
+
+    def compute_weights_batch(self, prices, rebalance_dates, parameters: dict):
+        params = self.normalize_parameters(parameters)
+        offensive = params.get("offensive_assets") or []
+        defensive = params.get("defensive_assets") or []
+
+        if prices is None or prices.empty:
+            return [{"error": "No historical data"} for _ in rebalance_dates]
+
+        required = [ticker for ticker in dict.fromkeys(offensive + defensive) if ticker in prices.columns]
+        # Last trading row at or before each (possibly non-trading) month-end label.
+        positions = prices.index.searchsorted(rebalance_dates, side="right") - 1
+        score_matrix = weighted_momentum_score(prices[required], self.score_lookbacks, positions)
+
+        decisions = []
+        for position, row in zip(positions, score_matrix):
+            if position < 0:
+                decisions.append({"error": "No historical data"})
+                continue
+            scores = {ticker: float(value) for ticker, value in zip(required, row) if not math.isnan(value)}
+            decisions.append(self._weights_from_scores(scores, params))
+        return decisions
@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from .backtest import backtest_window, download_backtest_prices, run_backtest_on_prices
+from .config import performance_sweep_workers
+from .specs import get_performance_spec
+
+# Metric -> True when larger is better. Drawdowns are negative, so larger is better too.
+RANKABLE_METRICS = {
+    "cagr_annualized": True,
+    "cumulative_return_period": True,
+    "max_drawdown_period": True,
+    "volatility_annualized": False,
+    "win_rate_monthly": True,
+}
+
+# Set once per worker process by `_init_worker` so tasks only carry their parameters.
+_WORKER_STATE: dict = {}
+
+
+def expand_grid(grid: dict) -> list[dict]:
+    """Expand {"top_n": [4, 6], "lookback_months": [6, 12]} into every combination."""
+    if not grid:
+        return [{}]
+    names = list(grid.keys())
+    values = [value if isinstance(value, (list, tuple)) else [value] for value in grid.values()]
+    return [dict(zip(names, combo)) for combo in itertools.product(*values)]
+
+
+def _init_worker(strategy_id, prices, failed, months, min_lookback_days):
+    _WORKER_STATE.update(
+        spec=get_performance_spec(strategy_id),
+        prices=prices,
+        failed=failed,
+        months=months,
+        min_lookback_days=min_lookback_days,
+    )
+
+
+def _run_combo(params: dict) -> dict:
+    state = _WORKER_STATE
+    result = run_backtest_on_prices(
+        state["spec"],
+        params,
+        state["prices"],
+        state["failed"],
+        state["months"],
+        state["min_lookback_days"],
+    )
+    if "error" in result:
+        return {"parameters": params, "error": result["error"]}
+    metrics = result.get("metrics", {})
+    row = {"parameters": params}
+    for key in ("months_tested", "as_of", *RANKABLE_METRICS.keys(), "best_month_return", "worst_month_return"):
+        row[key] = metrics.get(key)
+    return row
+
+
+def run_parameter_sweep(
+    strategy_id: str,
+    grid: dict,
+    base_parameters: dict | None = None,
+    rank_by: str = "cagr_annualized",
+    months: int | None = None,
+    max_workers: int | None = None,
+) -> dict:
+    """
+    Backtest every combination of `grid` over a strategy's parameters and rank them.
+
+    The union universe is downloaded once. Worker processes receive the price matrix
+    once at start-up (inherited without pickling under fork) rather than per task.
+    """
+    spec = get_performance_spec(strategy_id)
+    if not spec:
+        return {"ok": False, "error": f"No performance spec registered for strategy '{strategy_id}'"}
+    if rank_by not in RANKABLE_METRICS:
+        return {"ok": False, "error": f"rank_by must be one of {sorted(RANKABLE_METRICS)}"}
+
+    combos = []
+    seen = set()
+    for combo in expand_grid(grid):
+        params = spec.normalize_parameters({**(base_parameters or spec.default_parameters()), **combo})
+        key = json.dumps(params, sort_keys=True)
+        if key not in seen:
+            seen.add(key)
+            combos.append(params)
+
+    universe = sorted({ticker for params in combos for ticker in spec.universe(params)})
+    if not universe:
+        return {"ok": False, "error": "Strategy universe is empty"}
+
+    # Every combination is tested on the same rebalance dates: the longest lookback's.
+    windows = [backtest_window(spec, months, params) for params in combos]
+    months, min_lookback_days = windows[0][0], max(lookback for _, lookback in windows)
+    prices, failed = download_backtest_prices(universe, months, min_lookback_days)
+    init_args = (strategy_id, prices, failed, months, min_lookback_days)
+
+    workers = min(max_workers or performance_sweep_workers(), len(combos))
+    rows = None
+    if workers > 1:
+        try:
+            context = multiprocessing.get_context("fork") if "fork" in multiprocessing.get_all_start_methods() else None
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=context,
+                initializer=_init_worker,
+                initargs=init_args,
+            ) as pool:
+                rows = list(pool.map(_run_combo, combos))
+        except (OSError, NotImplementedError):
+            # No process support (e.g. AWS Lambda lacks /dev/shm): run in-process instead.
+            rows = None
+    if rows is None:
+        _init_worker(*init_args)
+        rows = [_run_combo(params) for params in combos]
+
+    larger_is_better = RANKABLE_METRICS[rank_by]
+    ranked = sorted(
+        (row for row in rows if row.get(rank_by) is not None),
+        key=lambda row: row[rank_by],
+        reverse=larger_is_better,
+    )
+    for rank, row in enumerate(ranked, start=1):
+        row["rank"] = rank
+
+    return {
+        "ok": bool(ranked),
+        "strategy_id": strategy_id,
+        "rank_by": rank_by,
+        "combinations": len(combos),
+        "universe": universe,
+        "missing_tickers": sorted(set(failed)),
+        "results": ranked,
+        "errors": [row for row in rows if row.get(rank_by) is None],
+    }
+
+
+def _parse_grid_value(raw: str):
+    if "," in raw:
+        return [part.strip().upper() for part in raw.split(",") if part.strip()]
+    try:
+        number = float(raw)
+        return int(number) if number.is_integer() else number
+    except ValueError:
+        return raw
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rank backtests over a grid of strategy parameters.")
+    parser.add_argument("strategy_id")
+    parser.add_argument(
+        "--grid",
+        action="append",
+        default=[],
+        metavar="NAME=V1|V2",
+        help="parameter values separated by '|'; ticker lists use commas, e.g. etfs=SPY,QQQ|SPY,IWM",
+    )
+    parser.add_argument("--rank-by", default="cagr_annualized", choices=sorted(RANKABLE_METRICS))
+    parser.add_argument("--months", type=int, default=None)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    grid = {}
+    for entry in args.grid:
+        name, _, values = entry.partition("=")
+        grid[name.strip()] = [_parse_grid_value(value) for value in values.split("|") if value.strip()]
+
+    result = run_parameter_sweep(
+        args.strategy_id,
+        grid,
+        rank_by=args.rank_by,
+        months=args.months,
+        max_workers=args.workers,
+    )
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from cache import cache_get_plan, cache_key, cache_set_plan, popular_parameter_sets
+from cache.config import plan_prewarm_deadline_margin_seconds, plan_prewarm_top_n
+from cache.keys import cache_key_parameters
+from deadline import remaining_seconds
+from strategies import get_strategy, list_strategy_ids
+
+
+def default_parameters(strategy) -> dict:
+    """Return the parameters the UI submits when the user keeps every default."""
+    return {param["name"]: param["default"] for param in strategy.get_parameters() if "default" in param}
+
+
+def _prewarm_keys(strategy_id: str, strategy, top_n: int) -> list:
+    """Return cache keys for the defaults followed by the most requested parameter sets."""
+    keys = []
+    for parameters in [default_parameters(strategy)] + popular_parameter_sets(strategy_id, top_n):
+        ck = cache_key(strategy_id, parameters)
+        if ck and ck not in keys:
+            keys.append(ck)
+    return keys
+
+
+def run_plan_prewarm(context=None, strategy_ids=None, top_n: int | None = None) -> dict:
+    """
+    Compute and cache today's plans for default and popular parameter sets.
+
+    Meant to run on a schedule shortly after the latest session's bars are published,
+    when cache keys have just rotated. Plans already cached for the current session are
+    left alone. With a Lambda `context`, keys not started before the deadline margin are
+    reported as `skipped`.
+    """
+    known = list_strategy_ids()
+    targets = [sid for sid in (strategy_ids or known) if sid in known]
+    top_n = plan_prewarm_top_n() if top_n is None else max(0, int(top_n))
+    margin = plan_prewarm_deadline_margin_seconds()
+
+    warmed, cached, failed, skipped = [], [], [], []
+    for strategy_id in targets:
+        strategy = get_strategy(strategy_id)
+        for ck in _prewarm_keys(strategy_id, strategy, top_n):
+            remaining = remaining_seconds(context)
+            if remaining is not None and remaining < margin:
+                skipped.append(ck)
+                continue
+            if cache_get_plan(ck):
+                cached.append(ck)
+                continue
+
+            _, parameters = cache_key_parameters(ck)
+            try:
+                plan = strategy.calculate_plan(**parameters)
+            except Exception as e:
+                failed.append({"cache_key": ck, "error": str(e)})
+                continue
+            if not isinstance(plan, dict) or "error" in plan:
+                error = plan.get("error") if isinstance(plan, dict) else "Strategy returned invalid plan"
+                failed.append({"cache_key": ck, "error": error})
+                continue
+            cache_set_plan(ck, plan)
+            warmed.append(ck)
+
+    return {
+        "ok": not failed and not skipped,
+        "warmed": len(warmed),
+        "already_cached": len(cached),
+        "failed": failed,
+        "skipped": skipped,
+    }
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import numpy as np
+
+# Momentum kernels shared by the live strategies (`strategies/`) and the backtest specs
+# (`performance/specs/`), so both compute bit-identical signals.
+#
+# Inputs are close-price matrices (rows = trading days, columns = tickers; a DataFrame
+# works too). `positions` selects the rows to evaluate "as of": None means the last
+# row and returns one value per ticker, an array of K row positions returns a (K, N)
+# matrix; negative positions yield NaN. Missing inputs give NaN instead of raising.
+
+
+def _as_matrix(values) -> np.ndarray:
+    matrix = np.asarray(values, dtype="float64")
+    return matrix.reshape(-1, 1) if matrix.ndim == 1 else matrix
+
+
+def _positions(matrix: np.ndarray, positions):
+    if positions is None:
+        return np.array([matrix.shape[0] - 1]), True
+    return np.asarray(positions, dtype="int64").reshape(-1), False
+
+
+def sma_momentum(values, window: int, positions=None) -> np.ndarray:
+    """
+    Return price / simple moving average - 1 over `window` rows.
+
+    Same as pandas `rolling(window).mean()`: the average is NaN unless all `window`
+    rows ending at the position have a price.
+    """
+    matrix = _as_matrix(values)
+    rows, single = _positions(matrix, positions)
+    out = np.full((len(rows), matrix.shape[1]), np.nan)
+
+    ready = (rows >= window - 1) & (rows < matrix.shape[0])
+    if window >= 1 and ready.any():
+        # Window sums as differences of one prefix sum over the rows the windows cover:
+        # O(T x N) memory instead of a (K, N, window) copy of the windows. Missing prices
+        # are summed as 0 and counted.
+        first = int(rows[ready].min()) - window + 1
+        covered = matrix[first : int(rows[ready].max()) + 1]
+        ends = rows[ready] - first
+        missing = np.isnan(covered)
+        sums = np.zeros((covered.shape[0] + 1, covered.shape[1]))
+        sums[1:] = covered
+        sums[1:][missing] = 0.0
+        np.cumsum(sums, axis=0, out=sums)
+        average = (sums[ends + 1] - sums[ends + 1 - window]) / window
+        momentum = covered[ends] / average - 1.0
+        if missing.any():
+            gaps = np.zeros(sums.shape, dtype="int32")
+            np.cumsum(missing, axis=0, out=gaps[1:])
+            momentum[gaps[ends + 1] != gaps[ends + 1 - window]] = np.nan
+        out[ready] = momentum
+    return out[0] if single else out
+
+
+def trailing_returns(values, lookbacks, positions=None) -> np.ndarray:
+    """
+    Return total returns over each lookback (in observations) as an (H, ...) array.
+
+    Each ticker is measured on its own valid prices, like `series.dropna()`: the
+    latest price at or before the position against the one `days` observations
+    earlier. Tickers with too few observations get NaN.
+    """
+    matrix = _as_matrix(values)
+    rows, single = _positions(matrix, positions)
+    if matrix.shape[0] == 0:
+        out = np.full((len(lookbacks), len(rows), matrix.shape[1]), np.nan)
+        return out[:, 0] if single else out
+
+    valid = ~np.isnan(matrix)
+    # Stable sort moves each column's valid prices to the top in date order, so the k-th
+    # valid observation of a column is compact[k - 1].
+    order = np.argsort(~valid, axis=0, kind="stable")
+    compact = np.take_along_axis(matrix, order, axis=0)
+    counts = np.cumsum(valid, axis=0)
+
+    in_range = (rows >= 0) & (rows < matrix.shape[0])
+    latest = np.where(in_range[:, None], counts[np.clip(rows, 0, matrix.shape[0] - 1)], 0) - 1
+    current = np.take_along_axis(compact, np.clip(latest, 0, None), axis=0)
+
+    out = np.full((len(lookbacks), len(rows), matrix.shape[1]), np.nan)
+    for index, days in enumerate(lookbacks):
+        earlier = latest - int(days)
+        base = np.take_along_axis(compact, np.clip(earlier, 0, None), axis=0)
+        out[index] = np.where(earlier >= 0, current / base - 1.0, np.nan)
+    return out[:, 0] if single else out
+
+
+def weighted_momentum_score(values, weighted_lookbacks, positions=None) -> np.ndarray:
+    """
+    Return sum(weight * trailing return) over (lookback, weight) pairs, e.g. the VAA
+    score 12*R1 + 4*R3 + 2*R6 + R12; NaN where any horizon is unavailable.
+    """
+    lookbacks = [days for days, _ in weighted_lookbacks]
+    returns = trailing_returns(values, lookbacks, positions)
+    score = 0.0
+    for (_, weight), horizon in zip(weighted_lookbacks, returns):
+        score = score + weight * horizon
+    return score
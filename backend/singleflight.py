@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import threading
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+
+class _Call:
+    def __init__(self):
+        self._done = threading.Event()
+        self._result: Any = None
+        self._error: BaseException | None = None
+
+    def wait(self):
+        self._done.wait()
+        if self._error is not None:
+            raise self._error
+        return self._result
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls that share a key into one in-flight computation.
+
+    The first caller for a key (the leader) runs the work; callers arriving while
+    it is running wait and receive the same result (or exception). Nothing is
+    cached once the leader finishes, so the next call after that runs again.
+
+    Only relevant under a threaded server (Flask dev server, gunicorn threads);
+    a single-threaded Lambda invocation always leads.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+
+    def claim(self, key: Hashable) -> Tuple[_Call, bool]:
+        """Return (call, is_leader); the leader must eventually call `finish()`."""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                return call, False
+            call = _Call()
+            self._calls[key] = call
+            return call, True
+
+    def finish(self, key: Hashable, call: _Call, result: Any = None, error: BaseException | None = None):
+        """Publish the leader's result to every waiter and release the key."""
+        with self._lock:
+            if self._calls.get(key) is call:
+                del self._calls[key]
+        call._result = result
+        call._error = error
+        call._done.set()
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """Run `fn` once per concurrent key; return (result, shared) where shared means we waited."""
+        call, leader = self.claim(key)
+        if not leader:
+            return call.wait(), True
+
+        try:
+            result = fn()
+        except BaseException as error:
+            self.finish(key, call, error=error)
+            raise
+        self.finish(key, call, result=result)
+        return result, False
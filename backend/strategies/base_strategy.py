@@ -1,5 +1,20 @@
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import market_data
+from market_data.trading_calendar import trading_days_window
+from tracing import span
+
+
+@dataclass(frozen=True)
+class DataRequirement:
+    """Prices a plan needs: close series for `tickers` with at least `min_trading_days` rows."""
+
+    tickers: List[str]
+    min_trading_days: int
+
 
 class BaseStrategy(ABC):
     """Base class for all investment strategies"""
@@ -8,11 +23,35 @@ class BaseStrategy(ABC):
         self.name = name
         self.description = description
 
-    @abstractmethod
+    def data_requirement(self, **kwargs) -> Optional[DataRequirement]:
+        """
+        Declare the prices `compute_plan(**kwargs)` consumes.
+
+        Strategies that do not use market data return None (the default).
+        """
+        return None
+
+    def compute_plan(self, prices, failed: Optional[List[str]] = None, **kwargs) -> Dict[str, Any]:
+        """
+        Calculate the allocation plan from already downloaded prices (no I/O).
+
+        Args:
+            prices: DataFrame of daily closes (columns are tickers) covering `price_window()`
+            failed: tickers that could not be downloaded
+            **kwargs: Strategy-specific parameters
+
+        Returns:
+            Same shape as `calculate_plan()`.
+        """
+        raise NotImplementedError
+
     def calculate_plan(self, **kwargs) -> Dict[str, Any]:
         """
         Calculate the allocation plan independent of investment amount.
 
+        The default implementation downloads `price_window(**kwargs)` and hands the
+        prices to `compute_plan()`; strategies without market data override it.
+
         Args:
             **kwargs: Strategy-specific parameters
 
@@ -22,7 +61,19 @@ class BaseStrategy(ABC):
 
             Additional strategy metadata (scores, selected assets, etc.) can also be included.
         """
-        raise NotImplementedError
+        window = self.price_window(**kwargs)
+        if window is None:
+            with span('compute'):
+                return self.compute_plan(None, **kwargs)
+
+        tickers, start_date, end_date = window
+        try:
+            with span('prices'):
+                prices, failed = market_data.download_close_prices(tickers, start_date, end_date)
+        except Exception as e:
+            return {'error': f'Failed to download data: {str(e)}'}
+        with span('compute'):
+            return self.compute_plan(prices, failed=failed, **kwargs)
 
     @abstractmethod
     def get_parameters(self) -> List[Dict]:
@@ -34,6 +85,20 @@ class BaseStrategy(ABC):
         """
         pass
 
+    def price_window(self, **kwargs) -> Optional[Tuple[List[str], datetime, datetime]]:
+        """
+        Return (tickers, start_date, end_date) that `calculate_plan(**kwargs)` downloads.
+
+        The default is the shortest calendar range holding `data_requirement()`'s
+        trading days on the exchange calendar; the batch endpoint uses it to fetch the
+        union of many plans' prices once. Strategies without market data return None.
+        """
+        requirement = self.data_requirement(**kwargs)
+        if requirement is None:
+            return None
+        start_date, end_date = trading_days_window(requirement.min_trading_days)
+        return requirement.tickers, start_date, end_date
+
     def calculate_allocation(self, total_money: float, **kwargs) -> Dict[str, Any]:
         """
         Calculate a dollar allocation for a given investment amount.
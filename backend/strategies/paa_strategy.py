@@ -1,8 +1,6 @@
-import pandas as pd
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import Dict
-from .base_strategy import BaseStrategy
-from market_data import download_close_prices
+from .base_strategy import BaseStrategy, DataRequirement
 
 class PAAStrategy(BaseStrategy):
     """Protective Asset Allocation Strategy"""
@@ -31,46 +29,58 @@ class PAAStrategy(BaseStrategy):
         }
         return lookup.get(num_negative_momentum, 1.0)
 
-    def calculate_plan(self, **kwargs) -> Dict:
+    @staticmethod
+    def lookback_days(**kwargs) -> int:
+        """Moving-average window: `lookback_months` of 21 trading days (252 for the default 12)."""
+        try:
+            lookback_months = int(float(kwargs.get('lookback_months', 12)))
+        except (TypeError, ValueError):
+            lookback_months = 12
+        return 21 * max(1, lookback_months)
+
+    def data_requirement(self, **kwargs) -> DataRequirement:
+        """Candidate ETFs plus the fallback asset, with a `lookback_months` moving-average history."""
+        etfs = kwargs.get('etfs', self.default_etfs)
+        return DataRequirement(tickers=etfs + [self.fallback_asset], min_trading_days=self.lookback_days(**kwargs))
+
+    def compute_plan(self, prices, failed=None, **kwargs) -> Dict:
         """
         Calculate PAA allocation weights (independent of investment amount).
 
         Args:
+            prices: Daily closes for `data_requirement()` tickers
+            failed: Tickers that could not be downloaded
             etfs: List of ETF tickers (optional)
             top_n: Number of top ETFs to select (default: 6)
-            lookback_months: Lookback period in months (default: 12)
+            lookback_months: Moving-average period in months of 21 trading days (default: 12)
 
         Returns:
             Dictionary with allocation plan details (weights + metadata)
         """
+        # Data libraries load on first calculation, not when the registry is imported.
+        import pandas as pd
+        from signals import sma_momentum
+
         etfs = kwargs.get('etfs', self.default_etfs)
         top_n = kwargs.get('top_n', 6)
-        lookback_months = kwargs.get('lookback_months', 12)
-
-        all_tickers = etfs + [self.fallback_asset]
-        end_date = datetime.today()
-        start_date = end_date - timedelta(days=lookback_months * 30 + 30)
-
-        try:
-            price_data, failed_tickers = download_close_prices(all_tickers, start_date, end_date)
+        failed_tickers = failed or []
+        min_days = self.data_requirement(**kwargs).min_trading_days
 
-            # Drop columns with all NaN values
-            price_data = price_data.dropna(axis=1, how='all')
+        if prices is None:
+            return {'error': 'No valid price data after cleaning'}
 
-            # Check if we have enough data
-            if price_data.empty:
-                return {'error': 'No valid price data after cleaning'}
+        # Drop columns with all NaN values
+        price_data = prices.dropna(axis=1, how='all')
 
-            if len(price_data) < 252:
-                return {'error': f'Insufficient data: need at least 252 days, got {len(price_data)} days'}
+        # Check if we have enough data
+        if price_data.empty:
+            return {'error': 'No valid price data after cleaning'}
 
-        except Exception as e:
-            return {'error': f'Failed to download data: {str(e)}'}
+        if len(price_data) < min_days:
+            return {'error': f'Insufficient data: need at least {min_days} days, got {len(price_data)} days'}
 
-        # Calculate 12-month simple moving average
-        rolling_avg = price_data.rolling(window=252).mean().iloc[-1]
-        current_price = price_data.iloc[-1]
-        momentum = (current_price / rolling_avg) - 1
+        # Momentum against the `lookback_months` simple moving average
+        momentum = pd.Series(sma_momentum(price_data, min_days), index=price_data.columns)
         momentum = momentum.dropna()
 
         if momentum.empty:
@@ -122,7 +132,7 @@ class PAAStrategy(BaseStrategy):
             'best_etf': best_etf,
             'worst_etf': worst_etf
         }
-        if 'failed_tickers' in locals() and failed_tickers:
+        if failed_tickers:
             result['missing_tickers'] = failed_tickers
         return result
 
@@ -1,9 +1,8 @@
-import pandas as pd
-from datetime import datetime, timedelta
+import math
+from datetime import datetime
 from typing import Dict, List, Union
 
-from .base_strategy import BaseStrategy
-from market_data import download_close_prices
+from .base_strategy import BaseStrategy, DataRequirement
 
 
 class VAAStrategy(BaseStrategy):
@@ -35,6 +34,13 @@ class VAAStrategy(BaseStrategy):
             "R6": 126,
             "R12": 252,
         }
+        # score = 12*R1 + 4*R3 + 2*R6 + 1*R12
+        self.score_lookbacks = [
+            (self.lookbacks["R1"], 12),
+            (self.lookbacks["R3"], 4),
+            (self.lookbacks["R6"], 2),
+            (self.lookbacks["R12"], 1),
+        ]
 
     def get_parameters(self) -> List[Dict]:
         return [{
@@ -71,75 +77,68 @@ class VAAStrategy(BaseStrategy):
             if str(item).strip()
         ]
 
-    def calculate_plan(self, **kwargs) -> Dict:
+    def data_requirement(self, **kwargs) -> DataRequirement:
+        """Offensive and defensive assets with enough history for the 12-month return."""
+        offensive = self._normalize_ticker_list(kwargs.get("offensive_assets", self.offensive_assets))
+        defensive = self._normalize_ticker_list(kwargs.get("defensive_assets", self.defensive_assets))
+        tickers = list(dict.fromkeys(offensive + defensive))  # Remove duplicates while preserving order
+        return DataRequirement(tickers=tickers, min_trading_days=max(self.lookbacks.values()) + 1)
+
+    def compute_plan(self, prices, failed=None, **kwargs) -> Dict:
+        # NumPy loads on first calculation, not when the registry is imported.
+        from signals import weighted_momentum_score
+
         offensive_raw = kwargs.get("offensive_assets", self.offensive_assets)
         defensive_raw = kwargs.get("defensive_assets", self.defensive_assets)
 
         offensive = self._normalize_ticker_list(offensive_raw)
         defensive = self._normalize_ticker_list(defensive_raw)
 
-        tickers = list(dict.fromkeys(offensive + defensive))  # Remove duplicates while preserving order
+        tickers = self.data_requirement(**kwargs).tickers
+        failed = list(failed or [])
 
-        end_date = datetime.today()
-        start_date = end_date - timedelta(days=420)  
+        if prices is None:
+            return {"error": "No price data available", "missing_tickers": failed}
 
-        price_data, failed = download_close_prices(tickers, start_date, end_date)
-        price_data = price_data.dropna(axis=1, how="all")
+        price_data = prices.dropna(axis=1, how="all")
 
         if price_data.empty:
             return {"error": "No price data available", "missing_tickers": failed}
             
         
-        def series_return(close: pd.Series, trading_days: int) -> float | None:
-            close = close.dropna()
-            # We need at least (trading_days + 1) points because we look back using -(trading_days + 1).
-            if len(close) <= trading_days:
-                return None
-            
-            # total return over N trading days
-            return float(close.iloc[-1] / close.iloc[-(trading_days + 1)] - 1.0)
-        
-        scores: Dict[str, float] = {}
-        missing_for_calc: List[str] = []
-
-        for t in tickers:
-            if t not in price_data.columns: 
+        columns = [t for t in tickers if t in price_data.columns]
+        values = weighted_momentum_score(price_data[columns], self.score_lookbacks)
+
+        # Decisions use the full-precision scores (identical to the backtest); the
+        # response reports them rounded.
+        raw_scores: Dict[str, float] = {}
+        missing_for_calc: List[str] = [t for t in tickers if t not in price_data.columns]
+        for t, value in zip(columns, values):
+            if math.isnan(value):
                 missing_for_calc.append(t)
-                continue
-            
-            s = price_data[t]
-
-            r1 = series_return(s, self.lookbacks["R1"] )
-            r3 = series_return(s, self.lookbacks["R3"] )
-            r6 = series_return(s, self.lookbacks["R6"] )
-            r12 = series_return(s, self.lookbacks["R12"] )
-
-            if any(v is None for v in [r1, r3, r6, r12]):
-                missing_for_calc.append(t)
-                continue
-
-            score = 12*r1 + 4*r3 + 2*r6 + 1*r12
-            scores[t] = round(float(score), 6)
+            else:
+                raw_scores[t] = float(value)
+        scores = {t: round(value, 6) for t, value in raw_scores.items()}
 
         required = set(offensive + defensive)
-        if not required.issubset(scores.keys()):
+        if not required.issubset(raw_scores.keys()):
             return {
                 "error": "Insufficient data to score all required assets",
                 "missing_tickers": sorted(set(failed + missing_for_calc)),
                 "available_scores": scores,
             }
         
-        risk_on = all(scores[t] >= 0 for t in offensive)
+        risk_on = all(raw_scores[t] >= 0 for t in offensive)
 
         if risk_on: 
-            chosen = max(offensive, key=lambda t: scores[t]) 
+            chosen = max(offensive, key=lambda t: raw_scores[t]) 
             mode = "offensive"
         else:
-            chosen = max(defensive, key=lambda t: scores[t]) 
+            chosen = max(defensive, key=lambda t: raw_scores[t]) 
             mode = "defensive"
         
         return {
-            "date": end_date.strftime("%Y-%m-%d"),
+            "date": datetime.today().strftime("%Y-%m-%d"),
             "allocation_weights": {chosen: 1.0},
             "mode": mode,
             "selected_asset": chosen,
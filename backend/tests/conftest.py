@@ -0,0 +1,56 @@
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from market_data import PriceProvider, price_cache_clear, set_price_provider  # noqa: E402
+
+
+class StaticProvider(PriceProvider):
+    """Serve fixed close series per ticker; tickers in `fail_once` are missing from the first fetch."""
+
+    def __init__(self, closes: dict, fail_once=()):
+        self.closes = closes
+        self.fail_once = set(fail_once)
+        self.calls = []
+
+    def fetch(self, tickers, start_date, end_date):
+        self.calls.append((list(tickers), start_date, end_date))
+        start, end = pd.Timestamp(start_date).normalize(), pd.Timestamp(end_date).normalize()
+        series_list, failed = [], []
+        for ticker in tickers:
+            series = self.closes.get(ticker)
+            if ticker in self.fail_once:
+                self.fail_once.discard(ticker)
+                series = None
+            if series is not None:
+                series = series[(series.index >= start) & (series.index <= end)]
+            if series is None or series.empty:
+                failed.append(ticker)
+            else:
+                series_list.append(series.rename(ticker))
+        # Plain concat, as the real sources do: unaligned calendars give an unsorted index.
+        return (pd.concat(series_list, axis=1) if series_list else pd.DataFrame()), failed
+
+
+def closes(dates, start=100.0):
+    index = pd.DatetimeIndex(pd.to_datetime(dates), name="Date")
+    return pd.Series([start + step for step in range(len(index))], index=index, dtype="float64")
+
+
+@pytest.fixture
+def provider_factory(monkeypatch):
+    monkeypatch.setenv("PRICE_STORE_ENABLED", "false")
+    monkeypatch.delenv("PRICE_CACHE_ENABLED", raising=False)
+
+    def install(closes_by_ticker, fail_once=()):
+        provider = StaticProvider(closes_by_ticker, fail_once)
+        set_price_provider(provider)
+        return provider
+
+    yield install
+    set_price_provider(None)
+    price_cache_clear()
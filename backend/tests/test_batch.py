@@ -0,0 +1,65 @@
+import pandas as pd
+import pytest
+
+from conftest import closes
+
+
+@pytest.fixture
+def client(monkeypatch, provider_factory):
+    monkeypatch.setenv("CACHE_ENABLED", "false")
+    monkeypatch.setenv("PRICE_CACHE_ENABLED", "false")
+    from app import app
+
+    return app.test_client()
+
+
+def test_batch_items_share_an_unaligned_union_panel(client, provider_factory, monkeypatch):
+    sessions = pd.bdate_range("2022-01-03", "2024-06-28")
+    # The first tickers miss early-2022 sessions that EWJ has, so the union panel built
+    # from their concat ends with those dates and is not sorted.
+    sparse = sessions[(sessions >= "2022-03-01") | (sessions.dayofweek != 2)]
+    provider_factory({
+        "SPY": closes(sparse, start=100.0),
+        "QQQ": closes(sparse, start=200.0),
+        "IEF": closes(sparse, start=50.0),
+        "EWJ": closes(sessions, start=60.0),
+    })
+    # End the windows on a Sunday, a date none of the series contains.
+    monkeypatch.setattr(
+        "strategies.base_strategy.trading_days_window",
+        lambda days, **_: (pd.Timestamp("2022-01-03").to_pydatetime(), pd.Timestamp("2024-06-30").to_pydatetime()),
+    )
+
+    response = client.post("/api/calculate/batch", json={"items": [
+        {"strategy_id": "paa", "total_money": 1000, "parameters": {"etfs": ["SPY", "QQQ"], "top_n": 1}},
+        {"strategy_id": "paa", "total_money": 1000, "parameters": {"etfs": ["EWJ"], "top_n": 1}},
+    ]})
+
+    results = response.get_json()["results"]
+    assert [item["success"] for item in results] == [True, True], results
+
+
+def test_batch_item_matches_a_single_request_when_other_items_add_dates(client, provider_factory, monkeypatch):
+    sessions = pd.bdate_range("2022-01-03", "2024-06-27")
+    # EWJ alone has a bar on 2024-06-28, so the union panel has a row that is NaN for SPY/QQQ/IEF.
+    provider_factory({
+        "SPY": closes(sessions, start=100.0),
+        "QQQ": closes(sessions, start=200.0)[::-1].set_axis(sessions),
+        "IEF": closes(sessions, start=50.0),
+        "EWJ": closes(sessions.append(pd.DatetimeIndex(["2024-06-28"])), start=60.0),
+    })
+    monkeypatch.setattr(
+        "strategies.base_strategy.trading_days_window",
+        lambda days, **_: (pd.Timestamp("2022-01-03").to_pydatetime(), pd.Timestamp("2024-06-28").to_pydatetime()),
+    )
+    item = {"strategy_id": "paa", "total_money": 1000, "parameters": {"etfs": ["SPY", "QQQ"], "top_n": 1}}
+
+    single = client.post("/api/calculate", json=item).get_json()
+    batch = client.post("/api/calculate/batch", json={"items": [
+        item,
+        {"strategy_id": "paa", "total_money": 1000, "parameters": {"etfs": ["EWJ"], "top_n": 1}},
+    ]}).get_json()["results"]
+
+    assert single["success"], single
+    assert batch[0]["success"], batch[0]
+    assert batch[0]["result"]["allocation_weights"] == single["result"]["allocation_weights"]
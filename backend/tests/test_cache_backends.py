@@ -0,0 +1,81 @@
+import time
+
+import cache.backends as backends
+import cache.store as store
+from cache import cache_get_plans, cache_l1_clear, cache_set_plan
+from cache.backends import MemoryBackend, SQLiteBackend, reset_backends
+from cache.encoding import encode_value
+
+
+def test_memory_backend_evicts_expired_items_on_put(monkeypatch):
+    clock = [1_000_000]
+    monkeypatch.setattr(backends.time, "time", lambda: clock[0])
+    backend = MemoryBackend()
+    for index in range(100):
+        backend.put(f"2024-06-{index:02d}|paa|{{}}", {"expires_at": clock[0] + 10, "value": "{}"})
+    backend.put("popularity|paa", {"expires_at": clock[0] + 86400, "value": "{}"})
+    backend.put("legacy", {"value": "{}"})
+    assert len(backend) == 102
+
+    clock[0] += MemoryBackend.SWEEP_INTERVAL_SECONDS
+    backend.put("2024-07-01|paa|{}", {"expires_at": clock[0] + 10, "value": "{}"})
+
+    assert len(backend) == 3
+    assert backend.get("2024-06-00|paa|{}") is None
+    assert backend.get("popularity|paa") is not None
+    assert backend.get("legacy") is not None
+
+
+def test_sqlite_backend_round_trip_and_expired_row_cleanup(tmp_path, monkeypatch):
+    clock = [1_000_000]
+    monkeypatch.setattr(backends.time, "time", lambda: clock[0])
+    backend = SQLiteBackend(str(tmp_path / "cache" / "plans.sqlite3"), "plan_cache")
+
+    assert backend.put("plan", {"expires_at": clock[0] + 10, "value": b"JZ1\x00\xff"})
+    assert backend.put("latest|plan", {"expires_at": clock[0] + 10, "updated_at": clock[0], "value": "{}"})
+    assert backend.get("plan") == {"expires_at": clock[0] + 10, "value": b"JZ1\x00\xff"}
+    assert backend.get("latest|plan") == {"expires_at": clock[0] + 10, "updated_at": clock[0], "value": "{}"}
+    assert backend.get("missing") is None
+
+    # Expired rows are still returned (the plan store checks expires_at) until a put
+    # more than a day later removes them.
+    clock[0] += 3600
+    backend.put("legacy", {"value": "{}"})
+    assert backend.get("plan") is not None
+    clock[0] += 86400
+    backend.put("next", {"expires_at": clock[0] + 10, "value": "{}"})
+    assert backend.get("plan") is None
+    assert backend.get("latest|plan") is None
+    assert backend.get("legacy") is not None
+
+
+def test_sqlite_backend_get_many_spans_chunks(tmp_path):
+    backend = SQLiteBackend(str(tmp_path / "plans.sqlite3"), "plan_cache")
+    keys = [f"key-{index}" for index in range(1200)]
+    for index, key in enumerate(keys):
+        backend.put(key, {"expires_at": 2_000_000_000, "updated_at": index, "value": str(index)})
+
+    found = backend.get_many(keys + ["key-0", "missing"])
+
+    assert len(found) == 1200
+    assert found["key-1199"] == {"expires_at": 2_000_000_000, "updated_at": 1199, "value": "1199"}
+    assert "missing" not in found
+
+
+def test_plan_store_batch_read_on_sqlite(tmp_path, monkeypatch):
+    monkeypatch.setenv("CACHE_BACKEND", "sqlite")
+    monkeypatch.setenv("CACHE_ENABLED", "true")
+    monkeypatch.setenv("CACHE_SQLITE_PATH", str(tmp_path / "plans.sqlite3"))
+    reset_backends()
+    cache_l1_clear()
+    try:
+        cache_set_plan("fresh", {"allocation_weights": {"SPY": 1.0}})
+        store._backend().put("expired", {"expires_at": int(time.time()) - 1, "value": encode_value({"old": True})})
+        cache_l1_clear()
+
+        plans = cache_get_plans(["fresh", "expired", "missing", "fresh"])
+
+        assert plans == {"fresh": {"allocation_weights": {"SPY": 1.0}}}
+    finally:
+        reset_backends()
+        cache_l1_clear()
@@ -0,0 +1,57 @@
+import json
+
+import pytest
+
+from cache import encoding
+from cache.encoding import TAG_JSON_ZLIB, TAG_MSGPACK_ZLIB, decode_value, encode_value
+
+PLAN = {"allocation_weights": {"SPY": 0.5, "IEF": 0.5}, "note": "café", "shares": [1, 2]}
+
+
+def test_decode_legacy_plain_json_string():
+    assert decode_value(json.dumps(PLAN)) == PLAN
+    assert decode_value("") is None
+
+
+@pytest.mark.parametrize("name, tag", [("zlib", TAG_JSON_ZLIB), ("json", None)])
+def test_round_trip(monkeypatch, name, tag):
+    monkeypatch.setenv("CACHE_VALUE_ENCODING", name)
+    value = encode_value(PLAN)
+
+    if tag is None:
+        assert isinstance(value, str)
+    else:
+        assert value[:3] == tag
+    assert decode_value(value) == PLAN
+
+
+@pytest.mark.skipif(encoding.msgpack is None, reason="msgpack is not installed")
+def test_msgpack_round_trip(monkeypatch):
+    monkeypatch.setenv("CACHE_VALUE_ENCODING", "msgpack")
+    value = encode_value(PLAN)
+
+    assert value[:3] == TAG_MSGPACK_ZLIB
+    assert decode_value(value) == PLAN
+
+
+def test_msgpack_falls_back_to_zlib_without_the_dependency(monkeypatch):
+    monkeypatch.setenv("CACHE_VALUE_ENCODING", "msgpack")
+    monkeypatch.setattr(encoding, "msgpack", None)
+    value = encode_value(PLAN)
+
+    assert value[:3] == TAG_JSON_ZLIB
+    assert decode_value(value) == PLAN
+
+
+def test_decode_wrapped_binary_and_unreadable_values(monkeypatch):
+    monkeypatch.setenv("CACHE_VALUE_ENCODING", "zlib")
+
+    class Binary:  # stands in for boto3.dynamodb.types.Binary
+        def __init__(self, value):
+            self.value = value
+
+    assert decode_value(Binary(encode_value(PLAN))) == PLAN
+    assert decode_value(memoryview(encode_value(PLAN))) == PLAN
+    assert decode_value(b"XX1" + b"payload") is None
+    assert decode_value(TAG_JSON_ZLIB + b"not zlib") is None
+    assert decode_value("{not json") is None
@@ -0,0 +1,54 @@
+from datetime import date
+
+import pytest
+
+from market_data import SyntheticProvider, set_price_provider
+from performance.backtest import backtest_window, download_backtest_prices, run_backtest_on_prices
+from performance.specs import get_performance_spec
+
+
+@pytest.fixture
+def paa_prices(monkeypatch):
+    monkeypatch.setenv("PRICE_STORE_ENABLED", "false")
+    monkeypatch.setattr("performance.backtest.latest_session_date", lambda: date(2024, 6, 28))
+    set_price_provider(SyntheticProvider(seed=7, years=6, end=date(2024, 6, 28)))
+    spec = get_performance_spec("paa")
+    params = spec.normalize_parameters({"etfs": ["SPY", "QQQ", "IWM", "VGK", "EWJ", "EEM"], "top_n": 3})
+    months, lookback = backtest_window(spec, 24, {**params, "lookback_months": 18})
+    prices, failed = download_backtest_prices(spec.universe(params), months, lookback)
+    yield spec, params, prices, failed, months, lookback
+    set_price_provider(None)
+
+
+def test_paa_lookback_months_changes_the_backtest(paa_prices):
+    spec, params, prices, failed, months, lookback = paa_prices
+    assert spec.lookback_days(params) == 252
+
+    metrics = {}
+    for lookback_months in (3, 12, 18):
+        result = run_backtest_on_prices(spec, {**params, "lookback_months": lookback_months}, prices, failed, months, lookback)
+        assert "error" not in result, result
+        metrics[lookback_months] = result["metrics"]["cumulative_return_period"]
+
+    assert len(set(metrics.values())) == 3, metrics
+
+
+def test_performance_endpoint_keeps_backtest_state_private(monkeypatch):
+    monkeypatch.setenv("PRICE_STORE_ENABLED", "false")
+    monkeypatch.setenv("PERFORMANCE_BACKEND", "memory")
+    monkeypatch.setenv("PERFORMANCE_BACKTEST_MONTHS", "12")
+    set_price_provider(SyntheticProvider(seed=3, years=4))
+    try:
+        from app import app
+        from performance import compute_and_store_for_strategy
+
+        response = app.test_client().get("/api/performance?strategy_id=paa&refresh=1")
+        body = response.get_json()
+        assert body["success"], body
+        assert "backtest_state" not in body["performance"]
+        assert body["performance"]["metrics"]["months_tested"] == 12
+
+        # The state is still stored for incremental refreshes (an open last period is recomputed).
+        assert compute_and_store_for_strategy("paa")["periods_reused"] >= 11
+    finally:
+        set_price_provider(None)
@@ -0,0 +1,135 @@
+import threading
+import time
+from datetime import datetime, timezone
+
+import pandas as pd
+import pytest
+
+import cache.store as store
+from cache import cache_set_plan
+from cache.backends import reset_backends
+from cache.encoding import encode_value
+from cache.keys import cache_key, stale_cache_key
+from conftest import closes
+from market_data import get_price_provider
+from market_data.trading_calendar import next_session_rotation_utc
+from strategies import get_strategy
+
+PAA_ITEM = {"strategy_id": "paa", "total_money": 1000, "parameters": {"etfs": ["SPY", "QQQ"], "top_n": 1}}
+
+
+class RecordingBackend:
+    def __init__(self):
+        self.items = {}
+
+    def put(self, key, item):
+        self.items[key] = item
+        return True
+
+
+def test_next_rotation_skips_the_weekend(monkeypatch):
+    monkeypatch.setenv("MARKET_DATA_PUBLISH_DELAY_MINUTES", "90")
+    friday_night = datetime(2024, 6, 28, 23, 0, tzinfo=timezone.utc)
+    # Monday's 4pm New York close (20:00 UTC in summer) plus the publish delay.
+    assert next_session_rotation_utc(friday_night) == datetime(2024, 7, 1, 21, 30, tzinfo=timezone.utc)
+    friday_morning = datetime(2024, 6, 28, 14, 0, tzinfo=timezone.utc)
+    assert next_session_rotation_utc(friday_morning) == datetime(2024, 6, 28, 21, 30, tzinfo=timezone.utc)
+
+
+def test_plans_are_kept_until_the_key_rotates(monkeypatch):
+    monkeypatch.setenv("CACHE_BACKEND", "memory")
+    monkeypatch.setenv("CACHE_ENABLED", "true")
+    monkeypatch.setenv("CACHE_STALE_WHILE_REVALIDATE", "true")
+    now = 1_719_615_600  # Friday 2024-06-28 23:00 UTC
+    rotation_at = int(datetime(2024, 7, 1, 21, 30, tzinfo=timezone.utc).timestamp())
+    monkeypatch.setattr(store.time, "time", lambda: now)
+    monkeypatch.setattr(store, "cache_key_rotation_at", lambda: rotation_at)
+    backend = RecordingBackend()
+    monkeypatch.setattr(store, "_backend", lambda: backend)
+
+    key = cache_key("paa", {"etfs": ["SPY"], "top_n": 1})
+    cache_set_plan(key, {"allocation_weights": {"SPY": 1.0}})
+
+    assert backend.items[key]["expires_at"] == rotation_at
+    # The bucket-less stale copy keeps its own max-staleness expiry.
+    assert backend.items[stale_cache_key(key)]["expires_at"] == now + 259200
+    store.cache_l1_clear()
+
+
+@pytest.fixture
+def stale_client(monkeypatch, provider_factory):
+    monkeypatch.setenv("CACHE_BACKEND", "memory")
+    monkeypatch.setenv("CACHE_ENABLED", "true")
+    monkeypatch.setenv("CACHE_STALE_WHILE_REVALIDATE", "true")
+    monkeypatch.setenv("CACHE_MAX_STALE_SECONDS", "3600")
+    monkeypatch.setenv("CACHE_POPULARITY_ENABLED", "false")
+    monkeypatch.setenv("PRICE_CACHE_ENABLED", "false")
+    sessions = pd.bdate_range("2023-01-02", "2024-06-28")
+    provider_factory({
+        "SPY": closes(sessions, start=100.0),
+        "QQQ": closes(sessions, start=200.0),
+        "IEF": closes(sessions, start=50.0),
+    })
+    monkeypatch.setattr(
+        "strategies.base_strategy.trading_days_window",
+        lambda days, **_: (pd.Timestamp("2023-01-02").to_pydatetime(), pd.Timestamp("2024-06-28").to_pydatetime()),
+    )
+    reset_backends()
+    store.cache_l1_clear()
+    from app import app
+
+    yield app.test_client()
+    reset_backends()
+    store.cache_l1_clear()
+
+
+def _seed_stale_plan(age_seconds):
+    """Store a plan for PAA_ITEM only under its bucket-less key, as left by a previous session."""
+    key = cache_key(PAA_ITEM["strategy_id"], PAA_ITEM["parameters"])
+    plan = get_strategy("paa").calculate_plan(**PAA_ITEM["parameters"])
+    updated_at = int(time.time()) - age_seconds
+    store._backend().put(stale_cache_key(key), {
+        "expires_at": updated_at + 3600,
+        "updated_at": updated_at,
+        "value": encode_value(plan),
+    })
+    return key
+
+
+def _join_revalidations():
+    for thread in threading.enumerate():
+        if thread.name.startswith("revalidate-"):
+            thread.join(10)
+
+
+def test_stale_plan_is_served_and_recomputed_in_the_background(stale_client):
+    key = _seed_stale_plan(age_seconds=600)
+    provider = get_price_provider()
+    provider.calls.clear()
+
+    body = stale_client.post("/api/calculate", json=PAA_ITEM).get_json()
+
+    assert body["success"] and body["cached"]
+    assert body["cache_status"] == "stale"
+    assert 600 <= body["stale_age_seconds"] < 660
+    _join_revalidations()
+    assert len(provider.calls) == 1
+    # The recompute filled the current key and refreshed the bucket-less copy.
+    assert store._backend().get(key) is not None
+    assert store._backend().get(stale_cache_key(key))["updated_at"] >= int(time.time()) - 60
+
+    store.cache_l1_clear()
+    again = stale_client.post("/api/calculate", json=PAA_ITEM).get_json()
+    assert again["cache_status"] == "cached"
+    assert len(provider.calls) == 1
+
+
+def test_plan_older_than_the_max_staleness_is_not_served(stale_client):
+    key = _seed_stale_plan(age_seconds=3600 + 60)
+
+    assert store.cache_get_stale_plan(key) is None
+    body = stale_client.post("/api/calculate", json=PAA_ITEM).get_json()
+
+    assert body["success"]
+    assert body["cache_status"] == "fresh"
+    assert "stale_age_seconds" not in body
@@ -0,0 +1,35 @@
+import threading
+
+import cache.popularity as popularity
+from cache.keys import cache_key
+
+
+class FailingBackend:
+    def __init__(self):
+        self.calls = []
+        self.called = threading.Event()
+
+    def get(self, key):
+        self.calls.append((threading.current_thread().name, key))
+        self.called.set()
+        raise RuntimeError("backend unavailable")
+
+    def put(self, key, item):
+        raise RuntimeError("backend unavailable")
+
+
+def test_due_flush_runs_off_the_request_thread_and_never_raises(monkeypatch):
+    monkeypatch.setenv("CACHE_BACKEND", "memory")
+    monkeypatch.setenv("CACHE_ENABLED", "true")
+    monkeypatch.setenv("CACHE_POPULARITY_FLUSH_SECONDS", "0")
+    backend = FailingBackend()
+    monkeypatch.setattr(popularity, "_backend", lambda: backend)
+
+    popularity.record_plan_request(cache_key("paa", {"etfs": ["SPY", "QQQ"], "top_n": 1}))
+
+    assert backend.called.wait(5)
+    assert backend.calls[0][0] == "popularity-flush"
+    for thread in threading.enumerate():
+        if thread.name == "popularity-flush":
+            thread.join(5)
+    assert popularity._flush_running is False
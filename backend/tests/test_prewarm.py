@@ -0,0 +1,23 @@
+import prewarm
+
+
+class LambdaContext:
+    def __init__(self, remaining_ms):
+        self.remaining_ms = remaining_ms
+
+    def get_remaining_time_in_millis(self):
+        return self.remaining_ms
+
+
+def test_prewarm_deadline_margin_comes_from_the_environment(monkeypatch):
+    monkeypatch.setattr(prewarm, "popular_parameter_sets", lambda strategy_id, top_n: [])
+    monkeypatch.setattr(prewarm, "cache_get_plan", lambda ck: {"allocation_weights": {"SPY": 1.0}})
+    context = LambdaContext(20_000)
+
+    monkeypatch.setenv("PLAN_PREWARM_DEADLINE_MARGIN_SECONDS", "30")
+    result = prewarm.run_plan_prewarm(context, strategy_ids=["paa"])
+    assert result["already_cached"] == 0 and len(result["skipped"]) == 1
+
+    monkeypatch.setenv("PLAN_PREWARM_DEADLINE_MARGIN_SECONDS", "10")
+    result = prewarm.run_plan_prewarm(context, strategy_ids=["paa"])
+    assert result["already_cached"] == 1 and result["skipped"] == []
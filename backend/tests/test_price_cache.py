@@ -0,0 +1,40 @@
+from datetime import datetime
+
+import pandas as pd
+
+from conftest import closes
+from market_data import download_close_prices, price_cache_stats
+from market_data.memory import PriceCache
+
+
+def test_cache_hit_on_unaligned_calendars_with_non_trading_end(provider_factory):
+    # B's dates interleave with A's, so B's column in the concatenated frame is out of order.
+    provider_factory({
+        "A": closes(["2024-01-02", "2024-01-08"]),
+        "B": closes(["2024-01-04", "2024-01-08", "2024-01-09"]),
+    })
+    download_close_prices(["A", "B"], datetime(2024, 1, 1), datetime(2024, 1, 10))
+
+    # 2024-01-06 is a Saturday: not a label in either series.
+    prices, failed = download_close_prices(["A", "B"], datetime(2024, 1, 1), datetime(2024, 1, 6))
+
+    assert price_cache_stats()["hits"] == 2
+    assert failed == []
+    assert prices.index.is_monotonic_increasing
+    assert prices["A"].dropna().tolist() == [100.0]
+    assert prices["B"].dropna().tolist() == [100.0]
+
+
+def test_cached_series_is_refetched_once_a_newer_session_is_published():
+    cache = PriceCache()
+    friday, monday = pd.Timestamp("2024-06-28"), pd.Timestamp("2024-07-01")
+    start = pd.Timestamp("2024-06-24")
+    # Downloaded on Monday afternoon, before Monday's bar was published.
+    cache.put("SPY", closes(pd.bdate_range(start, friday)), start, monday, monday, friday)
+    assert list(cache.lookup(["SPY"], start, monday, monday, friday)[0]) == ["SPY"]
+
+    # Monday's bar is out: the series is behind even though the TTL has not passed.
+    found, missing = cache.lookup(["SPY"], start, monday, monday, monday)
+    assert (found, missing) == ({}, ["SPY"])
+    # Windows that end before the new session are still served.
+    assert list(cache.lookup(["SPY"], start, friday, monday, monday)[0]) == ["SPY"]
@@ -0,0 +1,69 @@
+from datetime import datetime
+
+import pandas as pd
+
+from conftest import closes
+from market_data import download_close_prices, price_cache_clear
+from market_data.download import _missing_ranges
+from market_data.store import StoredPrices
+
+
+def test_ticker_missing_from_a_group_download_is_fetched_again(provider_factory, monkeypatch, tmp_path):
+    monkeypatch.setenv("PRICE_STORE_ENABLED", "true")
+    monkeypatch.setenv("PRICE_STORE_DIR", str(tmp_path))
+    monkeypatch.setenv("PRICE_CACHE_ENABLED", "false")
+    sessions = pd.bdate_range("2024-01-02", "2024-01-31")
+    provider = provider_factory({"SPY": closes(sessions), "IEF": closes(sessions, start=50.0)}, fail_once=["IEF"])
+    provider.use_price_store = True
+    start, end = datetime(2024, 1, 2), datetime(2024, 1, 31)
+
+    prices, failed = download_close_prices(["SPY", "IEF"], start, end)
+    assert failed == ["IEF"]
+    assert list(prices.columns) == ["SPY"]
+
+    price_cache_clear()
+    prices, failed = download_close_prices(["SPY", "IEF"], start, end)
+    assert failed == []
+    assert prices["IEF"].iloc[0] == 50.0
+    # SPY is served from the store; only the failed ticker is requested again.
+    assert provider.calls[-1][0] == ["IEF"]
+
+
+def test_stored_ticker_checked_before_the_latest_session_is_rechecked():
+    friday, monday = pd.Timestamp("2024-06-28"), pd.Timestamp("2024-07-01")
+    published_at = 1_719_869_400  # Monday 2024-07-01 21:30 UTC
+    stored = StoredPrices(
+        closes=closes(pd.bdate_range("2024-06-24", friday)),
+        covered_start=pd.Timestamp("2024-06-24"),
+        covered_end=monday,
+        checked_at=published_at - 600,
+    )
+    now = published_at + 60  # well inside PRICE_STORE_REFRESH_SECONDS
+
+    assert _missing_ranges(stored, pd.Timestamp("2024-06-24"), monday, now, monday, published_at) == [(monday, monday)]
+    # Before Monday is published, or once a later check found no new bar, the interval applies.
+    assert _missing_ranges(stored, pd.Timestamp("2024-06-24"), monday, now, friday, published_at) == []
+    rechecked = StoredPrices(stored.closes, stored.covered_start, monday, published_at + 30)
+    assert _missing_ranges(rechecked, pd.Timestamp("2024-06-24"), monday, now, monday, published_at) == []
+
+
+def test_recheck_without_new_bars_waits_for_the_refresh_interval(provider_factory, monkeypatch, tmp_path):
+    monkeypatch.setenv("PRICE_STORE_ENABLED", "true")
+    monkeypatch.setenv("PRICE_STORE_DIR", str(tmp_path))
+    monkeypatch.setenv("PRICE_CACHE_ENABLED", "false")
+    monkeypatch.setenv("PRICE_STORE_REFRESH_SECONDS", "3600")
+    provider = provider_factory({"SPY": closes(pd.bdate_range("2024-01-02", "2024-02-02"))})
+    provider.use_price_store = True
+    clock = [1_800_000_000]
+    monkeypatch.setattr("market_data.download.time.time", lambda: clock[0])
+    # The window ends on a Saturday, so re-checking its covered end never finds a bar.
+    start, end = datetime(2024, 1, 2), datetime(2024, 2, 3)
+
+    download_close_prices(["SPY"], start, end)
+    clock[0] += 7200
+    download_close_prices(["SPY"], start, end)
+    assert len(provider.calls) == 2
+    clock[0] += 600
+    prices, failed = download_close_prices(["SPY"], start, end)
+    assert len(provider.calls) == 2
+    assert failed == [] and prices.index[-1] == pd.Timestamp("2024-02-02")
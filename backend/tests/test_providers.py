@@ -0,0 +1,33 @@
+import importlib.util
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from conftest import StaticProvider, closes
+from market_data import ReplayProvider
+
+
+def test_record_then_replay_csv_fixtures(tmp_path):
+    sessions = pd.bdate_range("2024-01-02", "2024-01-12")
+    upstream = StaticProvider({"SPY": closes(sessions), "IEF": closes(sessions, start=50.0)})
+    recorder = ReplayProvider(directory=str(tmp_path), record=True, upstream=upstream)
+    recorded, failed = recorder.fetch(["SPY", "IEF", "NOPE"], datetime(2024, 1, 2), datetime(2024, 1, 12))
+    assert failed == ["NOPE"]
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["IEF.csv", "SPY.csv"]
+
+    replayed, failed = ReplayProvider(directory=str(tmp_path), upstream=upstream).fetch(
+        ["SPY", "IEF"], datetime(2024, 1, 3), datetime(2024, 1, 14)
+    )
+    assert failed == []
+    assert len(upstream.calls) == 1
+    pd.testing.assert_frame_equal(replayed, recorded.loc["2024-01-03":], check_freq=False, check_names=False)
+
+
+@pytest.mark.skipif(
+    importlib.util.find_spec("pyarrow") is not None or importlib.util.find_spec("fastparquet") is not None,
+    reason="a Parquet engine is installed",
+)
+def test_parquet_fixtures_without_an_engine_fail_clearly(tmp_path):
+    with pytest.raises(RuntimeError, match="pyarrow"):
+        ReplayProvider(directory=str(tmp_path), file_format="parquet")
@@ -0,0 +1,15 @@
+import requests
+
+from market_data.session import PooledSession
+
+
+def test_pool_timeouts_are_only_a_default(monkeypatch):
+    seen = []
+    monkeypatch.setattr(requests.Session, "request", lambda self, method, url, **kwargs: seen.append(kwargs["timeout"]))
+    session = PooledSession(timeout=(1.0, 2.0))
+
+    session.get("https://example.invalid/a")
+    session.get("https://example.invalid/b", timeout=None)
+    session.get("https://example.invalid/c", timeout=7)
+
+    assert seen == [(1.0, 2.0), (1.0, 2.0), 7]
@@ -0,0 +1,21 @@
+import numpy as np
+import pandas as pd
+
+from signals import sma_momentum
+
+
+def test_sma_momentum_matches_pandas_rolling_mean_with_gaps():
+    rng = np.random.default_rng(0)
+    prices = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, (600, 5)), axis=0))
+    prices[rng.random(prices.shape) < 0.02] = np.nan
+    prices[:300, 2] = np.nan
+    frame = pd.DataFrame(prices)
+    expected = (frame / frame.rolling(60).mean() - 1.0).to_numpy()
+
+    positions = np.arange(-3, 603)
+    actual = sma_momentum(prices, 60, positions)
+
+    valid = (positions >= 0) & (positions < len(prices))
+    assert np.isnan(actual[~valid]).all()
+    np.testing.assert_allclose(actual[valid], expected, rtol=1e-12, atol=1e-12)
+    np.testing.assert_allclose(sma_momentum(frame, 60), expected[-1], rtol=1e-12, atol=1e-12)
@@ -0,0 +1,106 @@
+import threading
+
+import pandas as pd
+import pytest
+
+import singleflight
+from conftest import StaticProvider, closes
+from market_data import set_price_provider
+
+THREADS = 4
+PAA_ITEM = {"strategy_id": "paa", "total_money": 1000, "parameters": {"etfs": ["SPY", "QQQ"], "top_n": 1}}
+
+
+class GatedProvider(StaticProvider):
+    """StaticProvider whose fetch blocks until the test releases it."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.entered = threading.Event()
+        self.release = threading.Event()
+
+    def fetch(self, tickers, start_date, end_date):
+        self.entered.set()
+        assert self.release.wait(10)
+        return super().fetch(tickers, start_date, end_date)
+
+
+@pytest.fixture
+def waiters(monkeypatch):
+    """Count followers blocked on a single-flight leader."""
+    count = {"value": 0}
+    lock = threading.Lock()
+    original = singleflight._Call.wait
+
+    def counting_wait(call):
+        with lock:
+            count["value"] += 1
+        return original(call)
+
+    monkeypatch.setattr(singleflight._Call, "wait", counting_wait)
+    return count
+
+
+@pytest.fixture
+def gated(monkeypatch, provider_factory):
+    monkeypatch.setenv("CACHE_ENABLED", "false")
+    monkeypatch.setenv("PRICE_CACHE_ENABLED", "false")
+    sessions = pd.bdate_range("2023-01-02", "2024-06-28")
+    provider = GatedProvider({
+        "SPY": closes(sessions, start=100.0),
+        "QQQ": closes(sessions, start=200.0),
+        "IEF": closes(sessions, start=50.0),
+    })
+    set_price_provider(provider)
+    monkeypatch.setattr(
+        "strategies.base_strategy.trading_days_window",
+        lambda days, **_: (pd.Timestamp("2023-01-02").to_pydatetime(), pd.Timestamp("2024-06-28").to_pydatetime()),
+    )
+    return provider
+
+
+def _post_concurrently(provider, waiters):
+    from app import app
+
+    responses = [None] * THREADS
+
+    def post(index):
+        response = app.test_client().post("/api/calculate", json=PAA_ITEM)
+        responses[index] = (response.status_code, response.get_json())
+
+    threads = [threading.Thread(target=post, args=(index,)) for index in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    assert provider.entered.wait(10)
+    # Release the leader only once every other request is waiting on it.
+    for _ in range(1000):
+        if waiters["value"] >= THREADS - 1:
+            break
+        threading.Event().wait(0.01)
+    provider.release.set()
+    for thread in threads:
+        thread.join(10)
+    return responses
+
+
+def test_concurrent_identical_misses_compute_once(gated, waiters):
+    responses = _post_concurrently(gated, waiters)
+
+    assert waiters["value"] == THREADS - 1
+    assert len(gated.calls) == 1
+    assert all(status == 200 and body["success"] for status, body in responses), responses
+    assert len({str(body["result"]["allocation_weights"]) for _, body in responses}) == 1
+
+
+def test_leader_error_reaches_every_follower(gated, waiters, monkeypatch):
+    computed = []
+
+    def failing_compute_plan(self, prices, failed=None, **kwargs):
+        computed.append(1)
+        raise RuntimeError("compute exploded")
+
+    monkeypatch.setattr("strategies.paa_strategy.PAAStrategy.compute_plan", failing_compute_plan)
+    responses = _post_concurrently(gated, waiters)
+
+    assert len(gated.calls) == 1 and len(computed) == 1
+    assert [body for _, body in responses] == [{"success": False, "error": "compute exploded"}] * THREADS
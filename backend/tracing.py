@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import json
+import os
+import sys
+import time
+from contextlib import nullcontext
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+
+# Request-scoped stage timings. `app.py` starts a trace per request when tracing is enabled
+# and emits the collected spans as a `Server-Timing` header and/or one JSON log line.
+# Without an active trace, `span()` is a context-variable lookup returning a shared no-op.
+#
+# Spans with the same name are summed (e.g. several cache reads in one request). Threads
+# started during a request (price download workers, background revalidation) do not
+# inherit the trace; their time shows up in the span that waits for them.
+
+_NOOP = nullcontext()
+_current: ContextVar[Optional["Trace"]] = ContextVar("jay_asset_trace", default=None)
+
+
+def _env_flag(name: str) -> bool:
+    return os.getenv(name, "").strip().lower() in {"1", "true", "yes", "on"}
+
+
+def server_timing_enabled() -> bool:
+    """Return whether API responses carry a Server-Timing header (TRACING_ENABLED, default off)."""
+    return _env_flag("TRACING_ENABLED")
+
+
+def trace_log_enabled() -> bool:
+    """Return whether each traced request is logged as one JSON line on stdout (TRACING_LOG_JSON)."""
+    return _env_flag("TRACING_LOG_JSON")
+
+
+class _Span:
+    __slots__ = ("trace", "name", "started")
+
+    def __init__(self, trace: "Trace", name: str):
+        self.trace = trace
+        self.name = name
+        self.started = 0.0
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.trace.add(self.name, (time.perf_counter() - self.started) * 1000.0)
+        return False
+
+
+class Trace:
+    """Accumulated span durations (milliseconds) and counts for one request."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.spans: Dict[str, List[float]] = {}
+
+    def add(self, name: str, duration_ms: float):
+        entry = self.spans.get(name)
+        if entry is None:
+            self.spans[name] = [duration_ms, 1]
+        else:
+            entry[0] += duration_ms
+            entry[1] += 1
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000.0
+
+    def server_timing(self) -> str:
+        """Format spans as a Server-Timing header value, ending with the request total."""
+        parts = []
+        for name, (duration_ms, count) in self.spans.items():
+            part = f"{name};dur={duration_ms:.2f}"
+            if count > 1:
+                part += f';desc="x{count}"'
+            parts.append(part)
+        parts.append(f"total;dur={self.elapsed_ms():.2f}")
+        return ", ".join(parts)
+
+    def as_dict(self) -> dict:
+        return {
+            "total_ms": round(self.elapsed_ms(), 3),
+            "spans": {name: {"ms": round(duration_ms, 3), "count": count} for name, (duration_ms, count) in self.spans.items()},
+        }
+
+
+def span(name: str):
+    """Time a block as stage `name` of the current request's trace (no-op when not tracing)."""
+    trace = _current.get()
+    if trace is None:
+        return _NOOP
+    return _Span(trace, name)
+
+
+def start_trace():
+    """Begin a trace for the current request; returns a token for `finish_trace`."""
+    return _current.set(Trace())
+
+
+def current_trace() -> Optional[Trace]:
+    return _current.get()
+
+
+def finish_trace(token) -> Optional[Trace]:
+    """End the trace started with `token` and return it."""
+    trace = _current.get()
+    _current.reset(token)
+    return trace
+
+
+def log_trace(trace: Trace, **fields):
+    """Write one structured JSON line for a finished trace (picked up by CloudWatch Logs in Lambda)."""
+    record = {"type": "request_trace", **fields, **trace.as_dict()}
+    try:
+        sys.stdout.write(json.dumps(record, separators=(",", ":"), default=str) + "\n")
+        sys.stdout.flush()
+    except Exception:
+        pass